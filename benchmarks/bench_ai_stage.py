@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI Stage Benchmark
+
+Drives event analysis (analyze_all_events / AnalysisPipeline) and weekend
+suggestion generation against the local mock OpenAI server, so throughput,
+latency and retry behaviour can be measured without paid calls.
+
+For each event count and worker setting it reports:
+- Wall time and throughput (events/second)
+- p50/p95 per-event latency (including app-level retries)
+- LLM attempts, app-level retries (retry_with_backoff) and SDK-level
+  retries (extra HTTP requests made by the OpenAI client itself)
+- 429 and 500 responses served, events that hit an open circuit
+
+It first checks that recurring events reuse their stored labels (stamped
+timezone-aware, as the event_labels datetime column returns them) without
+calling the LLM.
+
+Usage:
+    python benchmarks/bench_ai_stage.py
+    python benchmarks/bench_ai_stage.py --events 20,100 --workers 0,1,3,6 \\
+        --latency-ms 500 --error-rate 0.05 --rate-limit-rate 0.05
+
+    Workers 0 = sequential analyze_all_events(); N = AnalysisPipeline with N workers.
+
+Requirements:
+    pip install -r server_code/requirements.txt   (openai, anvil-uplink)
+    No Anvil connection or API keys are needed.
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import mock_openai_server  # noqa: E402
+from server_code import ai_service, ai_session, api_helpers, config, event_classifier, resilience  # noqa: E402
+
+
+EVENT_TEMPLATES = [
+    ("Trivia Night", "Railgarten", "Weekly pub trivia with prizes and drink specials", "Free"),
+    ("Farmers Market", "Memphis Botanic Garden", "Local produce, crafts and live music outdoors", "Free"),
+    ("Jazz Brunch", "The Peabody", "Live jazz trio with a Southern brunch buffet", "$45"),
+    ("Grizzlies vs. Lakers", "FedExForum", "NBA regular season game", "$60-$250"),
+    ("Family Art Day", "Brooks Museum", "Hands-on art activities for kids and parents", "$10"),
+    ("Blues on Beale", "B.B. King's Blues Club", "Live blues band all night", "$15"),
+    ("Riverfront 5K", "Tom Lee Park", "Charity fun run along the Mississippi", "$35"),
+    ("Comedy Showcase", "Chuckle's", "Stand-up comedy with local headliners", "$20"),
+]
+
+
+def make_events(count, seed=7):
+    """
+    Build synthetic event dictionaries in the shape the analysis stage expects.
+
+    Args:
+        count: Number of events
+        seed: Random seed
+
+    Returns:
+        list: Event dictionaries
+    """
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        title, location, description, cost = rng.choice(EVENT_TEMPLATES)
+        events.append({
+            "event_id": f"bench_{i}",
+            "title": f"{title} #{i}",
+            "description": f"{description}. Edition {i}.",
+            "location": location,
+            "cost_raw": cost
+        })
+    return events
+
+
+def make_suggestion_inputs(count=15):
+    """
+    Build weather and serialized events for the suggestions prompt.
+
+    Returns:
+        tuple: (weather_data, events)
+    """
+    weather = [
+        {"day_name": day, "temp_high": 78, "temp_low": 61, "conditions": "Clear", "precipitation_chance": 10}
+        for day in ["Friday", "Saturday", "Sunday"]
+    ]
+    events = []
+    for i, (title, location, _, _) in enumerate((EVENT_TEMPLATES * 3)[:count]):
+        events.append({
+            "title": title, "location": location, "day_name": weather[i % 3]["day_name"],
+            "start_time": "07:00 PM", "cost_level": "$", "is_outdoor": i % 2 == 0,
+            "is_indoor": i % 2 == 1, "weather_temp": 72, "weather_precip": 10,
+            "weather_conditions": "Clear", "weather_is_hourly": True
+        })
+    return weather, events
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: List of numbers
+        pct: Percentile (0-100)
+
+    Returns:
+        float: Percentile value (0 for an empty list)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class StageProbe:
+    """
+    Wraps ai_service.analyze_event (counts LLM attempts) and
+    ai_service.analyze_event_with_fallbacks (per-event latency and route)
+    for the duration of a run.
+    """
+
+    def __enter__(self):
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.latencies = []
+        self.routes = {}
+        self._analyze_event = ai_service.analyze_event
+        self._with_fallbacks = ai_service.analyze_event_with_fallbacks
+
+        def counted_analyze_event(event):
+            with self._lock:
+                self.attempts += 1
+            return self._analyze_event(event)
+
+        def timed_with_fallbacks(*args, **kwargs):
+            started = time.perf_counter()
+            analysis, route = self._with_fallbacks(*args, **kwargs)
+            with self._lock:
+                self.latencies.append(time.perf_counter() - started)
+                self.routes[route] = self.routes.get(route, 0) + 1
+            return analysis, route
+
+        ai_service.analyze_event = counted_analyze_event
+        ai_service.analyze_event_with_fallbacks = timed_with_fallbacks
+        return self
+
+
+    def __exit__(self, *exc):
+        ai_service.analyze_event = self._analyze_event
+        ai_service.analyze_event_with_fallbacks = self._with_fallbacks
+        return False
+
+
+def run_analysis(server, events, workers, verbose=False):
+    """
+    Analyze events once and collect metrics.
+
+    Args:
+        server: Mock server (for its request counters)
+        events: Event dictionaries
+        workers: 0 for sequential analyze_all_events, N for an N-worker pipeline
+        verbose: Show the app's own progress output
+
+    Returns:
+        dict: Metrics for one result row
+    """
+    resilience.reset_all()
+    ai_session.get_session().reset_usage()
+    server.stats.reset()
+
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with output, StageProbe() as probe:
+        started = time.perf_counter()
+        if workers == 0:
+            ai_service.analyze_all_events(events)
+        else:
+            pipeline = ai_service.AnalysisPipeline(workers=workers)
+            for event in events:
+                pipeline.submit(event)
+            pipeline.finish()
+        wall = time.perf_counter() - started
+
+    http = server.stats.snapshot()
+    llm_events = probe.routes.get("llm", 0) + probe.routes.get("failed", 0)
+    return {
+        "mode": "sequential" if workers == 0 else f"pipeline x{workers}",
+        "events": len(events),
+        "wall": wall,
+        "throughput": len(events) / wall if wall else 0.0,
+        "p50": percentile(probe.latencies, 50),
+        "p95": percentile(probe.latencies, 95),
+        "attempts": probe.attempts,
+        "app_retries": probe.attempts - llm_events,
+        "sdk_retries": http["requests"] - probe.attempts,
+        "http_429": http["rate_limited"] + http["concurrency_limited"],
+        "http_500": http["errors"],
+        "circuit_open": probe.routes.get("circuit_open", 0),
+        "failed": probe.routes.get("failed", 0),
+        "peak_in_flight": http["peak_in_flight"]
+    }
+
+
+def check_label_reuse(server):
+    """
+    Analyze one recurrence of each template event with a signature store
+    holding labels from three days ago.
+
+    Args:
+        server: Mock server (for its request counter)
+
+    Returns:
+        tuple: (events reusing their label, events analyzed, HTTP requests made)
+    """
+    labeled_at = datetime.now(timezone.utc) - timedelta(days=3)
+    labels = []
+    events = []
+    for i, (title, location, description, cost) in enumerate(EVENT_TEMPLATES):
+        labels.append({
+            "signature": event_classifier.normalize_signature(title, location),
+            "description": description, "is_indoor": True, "is_outdoor": False,
+            "audience_type": "all-ages", "categories": ["Other"], "cost_level": "$",
+            "confidence": 1.0, "labeled_at": labeled_at
+        })
+        events.append({
+            "event_id": f"recurring_{i}", "title": title, "description": description,
+            "location": location, "cost_raw": cost
+        })
+
+    signatures = event_classifier.SignatureStore(labels)
+    resilience.reset_all()
+    server.stats.reset()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ai_service.analyze_all_events(events, signatures=signatures)
+    return signatures.stats["reused"], len(events), server.stats.snapshot()["requests"]
+
+
+def run_suggestions(server, runs):
+    """
+    Time suggestion generation, non-streaming and streaming.
+
+    Args:
+        server: Mock server
+        runs: Number of runs of each
+
+    Returns:
+        dict: p50/p95 total latency and streaming time-to-first-text
+    """
+    weather, events = make_suggestion_inputs()
+    resilience.reset_all()
+    server.stats.reset()
+
+    def with_retries(call):
+        # The client makes no retries of its own (as in the app)
+        return api_helpers.retry_with_backoff(
+            call, max_retries=config.OPENAI_MAX_RETRIES, initial_delay=config.OPENAI_RETRY_DELAY
+        )
+
+    def stream_once(started):
+        first = None
+        for _ in ai_service.stream_weather_aware_suggestions(weather, events):
+            if first is None:
+                first = time.perf_counter() - started
+        return first
+
+    blocking, streamed, first_text = [], [], []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(runs):
+            started = time.perf_counter()
+            with_retries(lambda: ai_service.generate_weather_aware_suggestions(weather, events))
+            blocking.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            first = with_retries(lambda: stream_once(started))
+            streamed.append(time.perf_counter() - started)
+            first_text.append(first or 0.0)
+
+    return {
+        "blocking_p50": percentile(blocking, 50), "blocking_p95": percentile(blocking, 95),
+        "stream_p50": percentile(streamed, 50), "stream_p95": percentile(streamed, 95),
+        "first_text_p50": percentile(first_text, 50), "first_text_p95": percentile(first_text, 95),
+        "requests": server.stats.snapshot()["requests"]
+    }
+
+
+def print_analysis_table(rows):
+    """Print the analysis results as a table."""
+    header = (f"{'mode':<14}{'events':>7}{'wall s':>9}{'ev/s':>8}{'p50 s':>8}{'p95 s':>8}"
+              f"{'tries':>7}{'app rt':>8}{'sdk rt':>8}{'429':>6}{'500':>6}{'open':>6}{'fail':>6}{'peak':>6}")
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['mode']:<14}{r['events']:>7}{r['wall']:>9.2f}{r['throughput']:>8.2f}"
+              f"{r['p50']:>8.2f}{r['p95']:>8.2f}{r['attempts']:>7}{r['app_retries']:>8}"
+              f"{r['sdk_retries']:>8}{r['http_429']:>6}{r['http_500']:>6}{r['circuit_open']:>6}"
+              f"{r['failed']:>6}{r['peak_in_flight']:>6}")
+
+
+def parse_int_list(text):
+    """Parse "10,50,100" into [10, 50, 100]."""
+    return [int(v) for v in text.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the AI stage against a mock OpenAI server")
+    parser.add_argument("--events", type=parse_int_list, default=[10, 50], help="Comma-separated event counts")
+    parser.add_argument("--workers", type=parse_int_list, default=[0, 1, 3, 6],
+                        help="Comma-separated worker counts (0 = sequential analyze_all_events)")
+    parser.add_argument("--rate-limit-delay", type=float, default=None,
+                        help=f"Override OPENAI_RATE_LIMIT_DELAY (app default {config.OPENAI_RATE_LIMIT_DELAY}s)")
+    parser.add_argument("--retry-delay", type=float, default=None,
+                        help=f"Override OPENAI_RETRY_DELAY (app default {config.OPENAI_RETRY_DELAY}s)")
+    parser.add_argument("--suggestion-runs", type=int, default=5, help="Suggestion generations to time (0 to skip)")
+    parser.add_argument("--verbose", action="store_true", help="Show the app's own log output")
+    mock_openai_server.add_settings_arguments(parser)
+    args = parser.parse_args()
+
+    if args.rate_limit_delay is not None:
+        config.OPENAI_RATE_LIMIT_DELAY = args.rate_limit_delay
+    if args.retry_delay is not None:
+        config.OPENAI_RETRY_DELAY = args.retry_delay
+
+    server, base_url = mock_openai_server.start_server(mock_openai_server.settings_from_args(args))
+    ai_session.get_session().configure(api_key="mock", base_url=base_url)
+
+    print("=" * 70)
+    print("AI STAGE BENCHMARK")
+    print("=" * 70)
+    print(f"Mock server: {base_url}")
+    print(f"Latency: {args.latency_ms:.0f}ms mean ({args.latency_dist}), errors {args.error_rate:.0%}, "
+          f"429s {args.rate_limit_rate:.0%}, max concurrent {args.max_concurrent or 'unlimited'}")
+    print(f"App settings: rate-limit delay {config.OPENAI_RATE_LIMIT_DELAY}s, "
+          f"retry delay {config.OPENAI_RETRY_DELAY}s, max retries {config.OPENAI_MAX_RETRIES}, "
+          f"openai bulkhead {config.CIRCUIT_BREAKERS['openai']['max_concurrent']}\n")
+
+    reused, total, requests = check_label_reuse(server)
+    print(f"  {'✓' if reused == total and not requests else '❌'} Recurring labels reused: "
+          f"{reused}/{total} ({requests} LLM requests)")
+
+    rows = []
+    for count in args.events:
+        events = make_events(count)
+        for workers in args.workers:
+            rows.append(run_analysis(server, events, workers, verbose=args.verbose))
+            print(f"  ✓ {rows[-1]['mode']} / {count} events: {rows[-1]['wall']:.2f}s")
+
+    print("\nEVENT ANALYSIS")
+    print_analysis_table(rows)
+
+    if args.suggestion_runs:
+        s = run_suggestions(server, args.suggestion_runs)
+        print(f"\nWEEKEND SUGGESTIONS ({args.suggestion_runs} runs each, {s['requests']} HTTP requests)")
+        print(f"  Blocking:   p50 {s['blocking_p50']:.2f}s  p95 {s['blocking_p95']:.2f}s")
+        print(f"  Streaming:  p50 {s['stream_p50']:.2f}s  p95 {s['stream_p95']:.2f}s  "
+              f"(first text p50 {s['first_text_p50']:.2f}s  p95 {s['first_text_p95']:.2f}s)")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scoring Engine Benchmark
+
+Compares per-event scoring with the vectorized batch engine:
+
+- Scalar: for each event, event-window weather lookup + calculate_weather_score +
+  calculate_recommendation_score (the per-event reference functions)
+- Vectorized: scoring_engine.extract_features + compute_weather_scores +
+  compute_recommendation_scores over the whole set
+
+Every event's weather and recommendation score is checked to be identical
+in both paths.
+
+Usage:
+    python benchmarks/bench_scoring_engine.py --events 10000,100000
+
+Requirements:
+    The server modules must be importable: numpy, anvil-uplink plus
+    anvil.http, which ships with the Anvil app server
+    (pip install anvil-app-server). No Anvil connection is needed.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_weather_lookup import make_forecasts  # noqa: E402
+from server_code import data_processor, scoring_engine, weather_service  # noqa: E402
+
+
+# Scraped start times in the formats seen on the site (including ones the
+# parsers disagree on or can't read)
+START_TIMES = [
+    "7:30 PM", "7:00 PM", "12:00 PM", "12:00 AM", "10:00 AM", "2:15 PM", "5:00 PM",
+    "9:00 PM", "11:30 PM", "6 PM", "10 a.m.", "1 p.m.", "TBD", "", None, "noon"
+]
+
+# End times, including missing ones (category default duration) and ones
+# past midnight
+END_TIMES = [None, None, None, "10:00 PM", "11:30 PM", "4:00 PM", "1:00 AM", "9 PM", "TBD"]
+CATEGORY_SETS = [["Music"], ["Nightlife", "Music"], ["Arts"], ["Sports"], [], None]
+
+
+def make_events(rows, count, seed=5):
+    """
+    Build event dictionaries shaped like events rows. Some fall on a day
+    with no forecast so the neutral-score path is exercised.
+
+    Returns:
+        list: Event dictionaries
+    """
+    rng = random.Random(seed)
+    dates = [row["forecast_date"] for row in rows]
+    dates.append(dates[-1] + timedelta(days=1))
+    flags = [(True, False), (False, True), (True, True), (False, False), (None, None), (True, None)]
+
+    events = []
+    for _ in range(count):
+        is_outdoor, is_indoor = rng.choice(flags)
+        events.append({
+            "date": rng.choice(dates),
+            "start_time": rng.choice(START_TIMES),
+            "end_time": rng.choice(END_TIMES),
+            "categories": rng.choice(CATEGORY_SETS),
+            "location": None,
+            "is_outdoor": is_outdoor,
+            "is_indoor": is_indoor,
+            "weather_score": None,
+            "recommendation_score": None
+        })
+    return events
+
+
+def make_varied_forecasts():
+    """
+    Forecast rows whose hourly values straddle every scoring threshold.
+
+    Returns:
+        list: Forecast row dictionaries
+    """
+    rng = random.Random(9)
+    rows = make_forecasts(first_hour=9)
+    for row in rows:
+        for hour_data in row["hourly_data"]:
+            hour_data["feels_like"] = rng.randint(25, 105)
+            hour_data["wind_speed"] = rng.randint(0, 30)
+        row["hourly_packed"] = weather_service.pack_hourly(row["hourly_data"])
+    return rows
+
+
+def score_scalar(events, index):
+    """
+    Score events one at a time with the reference functions.
+
+    Returns:
+        tuple: (weather scores, recommendation scores) lists
+    """
+    weather_scores = []
+    recommendation_scores = []
+    for event in events:
+        weather_data = index.get_event_weather(event)
+        if weather_data:
+            weather_score = weather_service.calculate_weather_score(event, weather_data)
+        else:
+            weather_score = 50
+        scored = dict(event, weather_score=weather_score)
+        weather_scores.append(weather_score)
+        recommendation_scores.append(data_processor.calculate_recommendation_score(scored))
+    return weather_scores, recommendation_scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch event scoring")
+    parser.add_argument("--events", default="10000,100000",
+                        help="Comma-separated event counts")
+    args = parser.parse_args()
+
+    rows = make_varied_forecasts()
+    index = weather_service.WeatherIndex(rows)
+
+    print("=" * 78)
+    print("EVENT SCORING: SCALAR vs VECTORIZED")
+    print("=" * 78)
+    print(f"{'Events':>8} {'Scalar':>10} {'Features':>10} {'Compute':>10} {'Vector':>10} "
+          f"{'Speedup':>8} {'Mismatch':>9}")
+
+    for count in [int(n) for n in args.events.split(",")]:
+        events = make_events(rows, count)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            scalar_weather, scalar_recommendation = score_scalar(events, index)
+            scalar_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            features = scoring_engine.extract_features(events, index)
+            features_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            weather_scores = scoring_engine.compute_weather_scores(features)
+            recommendation_scores = scoring_engine.compute_recommendation_scores(features, weather_scores)
+            compute_seconds = time.perf_counter() - started
+
+        mismatches = sum(
+            1 for i in range(count)
+            if scalar_weather[i] != weather_scores[i] or scalar_recommendation[i] != recommendation_scores[i]
+        )
+        vector_seconds = features_seconds + compute_seconds
+
+        print(f"{count:>8} {scalar_seconds * 1000:>8.1f}ms {features_seconds * 1000:>8.1f}ms "
+              f"{compute_seconds * 1000:>8.1f}ms {vector_seconds * 1000:>8.1f}ms "
+              f"{scalar_seconds / vector_seconds:>7.1f}x {mismatches:>9}")
+
+    print("\nVector = Features (per-event extraction, slot lookups memoized) + Compute (NumPy).")
+
+
+if __name__ == "__main__":
+    main()
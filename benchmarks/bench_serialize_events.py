@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Event Serialization Benchmark
+
+Counts database queries and weather lookups per serialized event:
+
+- Before: each event's weather is resolved twice - once for the weather
+  fields and again inside get_weather_warning - and each resolution
+  without a shared index loads the forecast (generation pointer read +
+  forecast query) before looking up the event's window weather
+- After: serialize_events loads one WeatherIndex for the whole list and
+  resolves each event's weather once, passing it to get_weather_warning
+
+Queries are counted by serving weather_forecast and app_state from
+in-memory tables that count their calls, so no Anvil connection is needed.
+Both paths are checked to produce the same warnings.
+
+Usage:
+    python benchmarks/bench_serialize_events.py --events 200
+
+Requirements:
+    The server modules must be importable: numpy, anvil-uplink plus
+    anvil.http, which ships with the Anvil app server
+    (pip install anvil-app-server).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_scoring_engine import make_events, make_varied_forecasts  # noqa: E402
+from server_code import data_processor, state_store, weather_service  # noqa: E402
+
+
+class CountingTable:
+    """In-memory stand-in for a Data Table that counts queries."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def search(self, *args, **kwargs):
+        self.queries += 1
+        return list(self.rows)
+
+    def get(self, **kwargs):
+        self.queries += 1
+        return None
+
+
+class CountingTables:
+    """In-memory app_tables with a counting weather_forecast and app_state."""
+
+    def __init__(self, forecast_rows):
+        self.weather_forecast = CountingTable(forecast_rows)
+        self.app_state = CountingTable([])
+
+    @property
+    def queries(self):
+        return self.weather_forecast.queries + self.app_state.queries
+
+
+class EventRow(dict):
+    """Event dictionary with the Row methods serialize_events uses."""
+
+    def get_id(self):
+        return self["event_id"]
+
+
+def make_event_rows(forecast_rows, count):
+    """
+    Build event rows with every column serialize_events reads.
+
+    Returns:
+        list: EventRow objects
+    """
+    events = []
+    for i, event in enumerate(make_events(forecast_rows, count)):
+        event.update({
+            "event_id": f"evt_{i}", "title": f"Event {i}", "description": "",
+            "location": None, "cost_raw": "", "cost_level": "$", "audience_type": "all-ages",
+            "weather_score": 60, "recommendation_score": 70
+        })
+        events.append(EventRow(event))
+    return events
+
+
+def serialize_before(events):
+    """
+    The previous per-event path: weather resolved for the fields, then
+    again for the warning, each time without a shared index.
+
+    Returns:
+        list: Warning strings in event order
+    """
+    band_table = weather_service.get_band_table()
+    warnings = []
+    for event in events:
+        if event["date"] and event["start_time"]:
+            weather_service.load_weather_index().get_event_weather(event)
+        weather_data = None
+        if event["is_outdoor"] and event["date"]:
+            weather_data = weather_service.load_weather_index().get_event_weather(event)
+        warnings.append(data_processor.get_weather_warning(event, weather_data, band_table))
+    return warnings
+
+
+def count_lookups():
+    """
+    Wrap WeatherIndex.get_event_weather with a call counter.
+
+    Returns:
+        list: One-element list holding the running count
+    """
+    calls = [0]
+    lookup = weather_service.WeatherIndex.get_event_weather
+
+    def counted(self, *args, **kwargs):
+        calls[0] += 1
+        return lookup(self, *args, **kwargs)
+
+    weather_service.WeatherIndex.get_event_weather = counted
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count queries per serialized event")
+    parser.add_argument("--events", type=int, default=200)
+    args = parser.parse_args()
+
+    forecast_rows = make_varied_forecasts()
+    events = make_event_rows(forecast_rows, args.events)
+
+    tables = CountingTables(forecast_rows)
+    weather_service.app_tables = tables
+    state_store.app_tables = tables
+    lookups = count_lookups()
+
+    results = {}
+    for name, serialize in [
+        ("Before", serialize_before),
+        ("After", lambda rows: [e["weather_warning"] for e in data_processor.serialize_events(rows)])
+    ]:
+        queries_before, lookups_before = tables.queries, lookups[0]
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            warnings = serialize(events)
+            seconds = time.perf_counter() - started
+        results[name] = (tables.queries - queries_before, lookups[0] - lookups_before, seconds, warnings)
+
+    print("=" * 66)
+    print("EVENT SERIALIZATION: QUERIES AND WEATHER LOOKUPS")
+    print("=" * 66)
+    print(f"Events: {len(events)}")
+    print(f"{'':8} {'Queries':>9} {'Per event':>10} {'Lookups':>9} {'Per event':>10} {'Time':>10}")
+    for name, (queries, lookup_count, seconds, _) in results.items():
+        print(f"{name:8} {queries:>9} {queries / len(events):>10.2f} {lookup_count:>9} "
+              f"{lookup_count / len(events):>10.2f} {seconds * 1000:>8.1f}ms")
+
+    mismatches = sum(1 for old, new in zip(results["Before"][3], results["After"][3]) if old != new)
+    print(f"Mismatched warnings: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
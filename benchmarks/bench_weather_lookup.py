@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Weather Lookup Benchmark
+
+Measures the per-lookup cost of matching an event time to an hourly
+forecast:
+
+- Before: find_closest_hourly_forecast() (the former weather_service
+  lookup, kept here as the baseline) scans the day's hourly list on each call
+- After: WeatherIndex.get_weather_for_datetime() reads the precomputed
+  24-slot nearest-hour array for the date
+
+Both paths are checked to return the same forecast hour for every lookup.
+
+Usage:
+    python benchmarks/bench_weather_lookup.py --lookups 20000
+
+Requirements:
+    The server modules must be importable: anvil-uplink plus anvil.http,
+    which ships with the Anvil app server (pip install anvil-app-server).
+    No Anvil connection is needed.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from server_code import weather_service  # noqa: E402
+
+
+def make_forecasts(first_hour=9):
+    """
+    Build three days of forecast rows shaped like weather_forecast rows
+    (hourly_data keeps the unpacked list for the linear-scan baseline).
+    The first day starts at first_hour (the API's 48-hour window rarely
+    covers the whole weekend), so nearest-hour fallbacks are exercised.
+
+    Returns:
+        list: Forecast row dictionaries
+    """
+    rng = random.Random(3)
+    start = date(2026, 10, 23)
+    rows = []
+    for offset in range(3):
+        day = start + timedelta(days=offset)
+        hours = range(first_hour if offset == 0 else 0, 24 if offset < 2 else 12)
+        hourly = [{
+            "hour": h,
+            "epoch": int(datetime.combine(day, datetime.min.time()).replace(hour=h).timestamp()),
+            "temp": rng.randint(55, 85), "feels_like": rng.randint(55, 88),
+            "precipitation_chance": rng.randint(0, 100), "conditions": "clear sky",
+            "wind_speed": rng.randint(0, 25), "humidity": 60, "uvi": 3.0
+        } for h in hours]
+        rows.append({
+            "forecast_date": day, "day_name": day.strftime("%A"), "temp_high": 80, "temp_low": 60,
+            "conditions": "clear sky", "precipitation_chance": 20, "wind_speed": 8,
+            "hourly_data": hourly, "hourly_packed": weather_service.pack_hourly(hourly),
+            "fetched_at": datetime.now(), "grid_cell": None
+        })
+    return rows
+
+
+def find_closest_hourly_forecast(event_time, hourly_data_list):
+    """
+    Find the hourly forecast closest to the event time by scanning the list.
+
+    Args:
+        event_time: Time string (e.g., "7:30 PM")
+        hourly_data_list: List of hourly forecast dictionaries
+
+    Returns:
+        dict: Closest hourly forecast, or None if not found
+    """
+    event_hour = weather_service.parse_time_to_hour(event_time)
+    if event_hour is None or not hourly_data_list:
+        return None
+
+    closest_forecast = None
+    min_diff = float("inf")
+    for hour_data in hourly_data_list:
+        diff = abs(hour_data["hour"] - event_hour)
+        if diff < min_diff:
+            min_diff = diff
+            closest_forecast = hour_data
+    return closest_forecast
+
+
+def make_lookups(rows, count):
+    """
+    Build (date, time string) lookups at random event times.
+
+    Returns:
+        list: (date, time) tuples
+    """
+    rng = random.Random(11)
+    lookups = []
+    for _ in range(count):
+        hour = rng.randint(0, 23)
+        minute = rng.choice([0, 0, 30, 15])
+        suffix = "PM" if hour >= 12 else "AM"
+        display_hour = hour % 12 or 12
+        lookups.append((rng.choice(rows)["forecast_date"], f"{display_hour}:{minute:02d} {suffix}"))
+    return lookups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark event-time weather lookups")
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+
+    rows = make_forecasts()
+    by_date = {row["forecast_date"]: row["hourly_data"] for row in rows}
+    lookups = make_lookups(rows, args.lookups)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        index = weather_service.WeatherIndex(rows)
+        build_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        before = [find_closest_hourly_forecast(t, by_date[d]) for d, t in lookups]
+        before_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        after = [index.get_weather_for_datetime(d, t) for d, t in lookups]
+        after_seconds = time.perf_counter() - started
+
+    mismatches = sum(
+        1 for old, new in zip(before, after)
+        if (old or {}).get("hour") != (new.get("hourly") or {}).get("hour")
+    )
+
+    print("=" * 60)
+    print("EVENT-TIME WEATHER LOOKUP")
+    print("=" * 60)
+    print(f"Lookups: {len(lookups)}  (index build: {build_seconds * 1000:.2f} ms)")
+    print(f"Before (linear scan):           {before_seconds / len(lookups) * 1e6:8.2f} µs/lookup")
+    print(f"After  (24-slot array):         {after_seconds / len(lookups) * 1e6:8.2f} µs/lookup")
+    print(f"Speedup: {before_seconds / after_seconds:.1f}x")
+    print(f"Mismatched forecast hours: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
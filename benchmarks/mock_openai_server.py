@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mock OpenAI-Compatible Server
+
+A local stand-in for the OpenAI Chat Completions API, so the AI stage can be
+benchmarked without paid calls. Only the standard library is used.
+
+Serves POST /v1/chat/completions (normal and streaming) with:
+- Configurable latency (fixed, uniform, exponential or lognormal)
+- Random 500 errors and 429 rate-limit responses
+- 429s when more than --max-concurrent requests are in flight
+- Canned event-analysis JSON for response_format=json_object requests,
+  canned suggestion text otherwise
+
+GET /stats returns request counters as JSON.
+
+Usage:
+    python benchmarks/mock_openai_server.py --port 8765 --latency-ms 400 --error-rate 0.05
+
+Then point the app at it:
+    ai_session.get_session().configure(api_key="mock", base_url="http://127.0.0.1:8765/v1")
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+CATEGORIES = ["music", "food", "arts", "sports", "family", "nightlife", "outdoor", "education"]
+AUDIENCE_TYPES = ["adults", "family-friendly", "all-ages"]
+COST_LEVELS = ["Free", "$", "$$", "$$$"]
+
+SUGGESTION_TEXT = (
+    "Looking at Saturday's forecast, the riverfront market at 10 AM is perfect - "
+    "it'll be 72°F and sunny right when it opens. If rain rolls in Sunday afternoon, "
+    "head indoors for the jazz brunch downtown. Friday night's clear skies make the "
+    "outdoor concert at the shell an easy pick."
+)
+
+
+class MockSettings:
+    """Behaviour of the mock server."""
+
+    def __init__(self, latency_ms=300, latency_dist="lognormal", latency_sigma=0.5,
+                 error_rate=0.0, rate_limit_rate=0.0, retry_after=1, max_concurrent=0,
+                 stream_chunk_ms=20, seed=None):
+        self.latency_ms = latency_ms
+        self.latency_dist = latency_dist
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.max_concurrent = max_concurrent
+        self.stream_chunk_ms = stream_chunk_ms
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+
+
+    def sample_latency(self):
+        """
+        Draw one response latency.
+
+        Returns:
+            float: Seconds (mean is latency_ms for every distribution)
+        """
+        mean = self.latency_ms / 1000
+        with self.rng_lock:
+            if self.latency_dist == "fixed":
+                return mean
+            if self.latency_dist == "uniform":
+                return self.rng.uniform(0, 2 * mean)
+            if self.latency_dist == "exponential":
+                return self.rng.expovariate(1 / mean) if mean > 0 else 0
+            if mean <= 0:
+                return 0
+            # lognormal with the requested mean
+            mu = math.log(mean) - self.latency_sigma ** 2 / 2
+            return self.rng.lognormvariate(mu, self.latency_sigma)
+
+
+    def roll(self):
+        """
+        Decide the outcome of one request.
+
+        Returns:
+            str: "ok", "error" or "rate_limited"
+        """
+        with self.rng_lock:
+            r = self.rng.random()
+        if r < self.rate_limit_rate:
+            return "rate_limited"
+        if r < self.rate_limit_rate + self.error_rate:
+            return "error"
+        return "ok"
+
+
+class MockStats:
+    """Thread-safe request counters."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+
+    def reset(self):
+        """Zero all counters."""
+        with self.lock:
+            self.requests = 0
+            self.ok = 0
+            self.errors = 0
+            self.rate_limited = 0
+            self.concurrency_limited = 0
+            self.in_flight = 0
+            self.peak_in_flight = 0
+
+
+    def snapshot(self):
+        """Return the counters as a dict."""
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "ok": self.ok,
+                "errors": self.errors,
+                "rate_limited": self.rate_limited,
+                "concurrency_limited": self.concurrency_limited,
+                "peak_in_flight": self.peak_in_flight
+            }
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    """Request handler; settings and stats live on the server object."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/stats"):
+            self._send_json(200, self.server.stats.snapshot())
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+
+        settings = self.server.settings
+        stats = self.server.stats
+
+        with stats.lock:
+            stats.requests += 1
+            stats.in_flight += 1
+            stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+            over_limit = settings.max_concurrent and stats.in_flight > settings.max_concurrent
+
+        try:
+            outcome = "concurrency_limited" if over_limit else settings.roll()
+
+            if outcome in ("rate_limited", "concurrency_limited"):
+                with stats.lock:
+                    if outcome == "rate_limited":
+                        stats.rate_limited += 1
+                    else:
+                        stats.concurrency_limited += 1
+                self._send_json(429, {"error": {
+                    "message": "Rate limit reached (mock)", "type": "requests", "code": "rate_limit_exceeded"
+                }}, headers={"Retry-After": str(settings.retry_after)})
+                return
+
+            time.sleep(settings.sample_latency())
+
+            if outcome == "error":
+                with stats.lock:
+                    stats.errors += 1
+                self._send_json(500, {"error": {"message": "Internal server error (mock)", "type": "server_error"}})
+                return
+
+            content = self._build_content(body)
+            if body.get("stream"):
+                self._send_stream(body, content)
+            else:
+                self._send_json(200, self._build_completion(body, content))
+
+            with stats.lock:
+                stats.ok += 1
+        finally:
+            with stats.lock:
+                stats.in_flight -= 1
+
+
+    def _build_content(self, body):
+        """Canned analysis JSON for JSON-mode requests, suggestion text otherwise."""
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            rng = random.Random(json.dumps(body.get("messages", [])))
+            is_outdoor = rng.random() < 0.4
+            return json.dumps({
+                "is_indoor": not is_outdoor,
+                "is_outdoor": is_outdoor,
+                "audience_type": rng.choice(AUDIENCE_TYPES),
+                "categories": rng.sample(CATEGORIES, 2),
+                "cost_level": rng.choice(COST_LEVELS)
+            })
+        return SUGGESTION_TEXT
+
+
+    def _usage(self, body, content):
+        """Rough token counts (4 characters per token)."""
+        prompt_chars = sum(len(m.get("content") or "") for m in body.get("messages", []))
+        prompt_tokens = max(1, prompt_chars // 4)
+        completion_tokens = max(1, len(content) // 4)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+
+
+    def _build_completion(self, body, content):
+        return {
+            "id": f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": self._usage(body, content)
+        }
+
+
+    def _send_stream(self, body, content):
+        """Send the content as server-sent events, a few words per chunk."""
+        completion_id = f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        model = body.get("model", "mock")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def chunk(delta, finish_reason=None, usage=None):
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [] if usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+            if usage:
+                payload["usage"] = usage
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        chunk({"role": "assistant", "content": ""})
+        words = content.split(" ")
+        for i in range(0, len(words), 3):
+            piece = " ".join(words[i:i + 3]) + (" " if i + 3 < len(words) else "")
+            chunk({"content": piece})
+            time.sleep(self.server.settings.stream_chunk_ms / 1000)
+        chunk({}, finish_reason="stop")
+
+        if (body.get("stream_options") or {}).get("include_usage"):
+            chunk(None, usage=self._usage(body, content))
+
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_server(settings=None, host="127.0.0.1", port=0):
+    """
+    Start the mock server on a background thread.
+
+    Args:
+        settings: MockSettings (defaults if None)
+        host: Interface to bind
+        port: Port to bind (0 = any free port)
+
+    Returns:
+        tuple: (server, base_url) - call server.shutdown() to stop it;
+               server.settings and server.stats can be changed/read live
+    """
+    server = ThreadingHTTPServer((host, port), MockOpenAIHandler)
+    server.daemon_threads = True
+    server.settings = settings or MockSettings()
+    server.stats = MockStats()
+
+    thread = threading.Thread(target=server.serve_forever, name="mock-openai", daemon=True)
+    thread.start()
+
+    base_url = f"http://{host}:{server.server_address[1]}/v1"
+    return server, base_url
+
+
+def add_settings_arguments(parser):
+    """Add the MockSettings options to an argparse parser (shared with the benchmark)."""
+    parser.add_argument("--latency-ms", type=float, default=300, help="Mean response latency (ms)")
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "exponential", "lognormal"],
+                        default="lognormal", help="Latency distribution")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal sigma (tail weight)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429 responses")
+    parser.add_argument("--max-concurrent", type=int, default=0,
+                        help="429 when more requests than this are in flight (0 = unlimited)")
+    parser.add_argument("--stream-chunk-ms", type=float, default=20, help="Delay between streamed chunks (ms)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+
+
+def settings_from_args(args):
+    """Build MockSettings from parsed arguments."""
+    return MockSettings(
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        max_concurrent=args.max_concurrent,
+        stream_chunk_ms=args.stream_chunk_ms,
+        seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_settings_arguments(parser)
+    args = parser.parse_args()
+
+    server, base_url = start_server(settings_from_args(args), args.host, args.port)
+    print(f"🧪 Mock OpenAI server listening on {base_url}")
+    print(f"   latency {args.latency_ms:.0f}ms ({args.latency_dist}), "
+          f"errors {args.error_rate:.0%}, 429s {args.rate_limit_rate:.0%}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\nStopping...")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
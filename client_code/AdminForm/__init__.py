@@ -253,7 +253,7 @@ class AdminForm(AdminFormTemplate):
             self.status_output.text += "Fetching Memphis weather forecast...\n"
             
             # Call server-side test function
-            result = anvil.server.call('test_openweather_api')
+            result = anvil.server.call('test_openweather_api', force=True)
             
             weather_data = result.get('weather_data', {})
             
@@ -562,6 +562,20 @@ class AdminForm(AdminFormTemplate):
                 report += f"Events Analyzed: {refresh_status.get('events_analyzed', 0)}\n"
                 report += f"Duration: {refresh_status.get('duration_seconds', 0):.1f} seconds\n"
                 
+                if refresh_status.get('ai_calls'):
+                    report += f"AI Calls: {refresh_status['ai_calls']} "
+                    report += f"({refresh_status.get('prompt_tokens') or 0} prompt + {refresh_status.get('completion_tokens') or 0} completion tokens)\n"
+                    report += f"AI Latency: {refresh_status.get('ai_latency_seconds') or 0:.1f} seconds\n"
+                    report += f"AI Cost (est.): ${refresh_status.get('ai_cost_usd') or 0:.4f}\n"
+                
+                if refresh_status.get('signature_reused'):
+                    report += f"Recurring Event Labels Reused: {refresh_status['signature_reused']}\n"
+                
+                if refresh_status.get('local_classified') is not None:
+                    report += f"Local Classifier Bypasses: {refresh_status['local_classified']}\n"
+                    if refresh_status.get('local_agreement') is not None:
+                        report += f"Local/LLM Agreement: {refresh_status['local_agreement']:.0%}\n"
+                
                 if refresh_status.get('error_message'):
                     report += f"\n❌ Error: {refresh_status['error_message']}\n"
             else:
@@ -580,7 +594,10 @@ class AdminForm(AdminFormTemplate):
                     report += f"{status_icon} {log['run_date'].strftime('%Y-%m-%d %H:%M')}\n"
                     report += f"   Status: {log['status']}\n"
                     report += f"   Events: {log['events_found']}\n"
-                    report += f"   Duration: {log['duration']:.1f}s\n\n"
+                    report += f"   Duration: {log['duration']:.1f}s\n"
+                    if log.get('ai_cost_usd'):
+                        report += f"   AI Cost: ${log['ai_cost_usd']:.4f}\n"
+                    report += "\n"
             
             self.status_output.text = report
             
@@ -597,7 +614,8 @@ class AdminForm(AdminFormTemplate):
             "This will DELETE ALL DATA from:\n"
             "• Events table\n"
             "• Weather forecast table\n"
-            "• Scrape log table\n\n"
+            "• Scrape log table\n"
+            "• Cached app state (suggestions)\n\n"
             "This action CANNOT be undone!\n\n"
             "Are you ABSOLUTELY SURE?"
         )
@@ -11,6 +11,23 @@ from ..EventCard import EventCard
 from ..AdminForm import AdminForm
 
 
+# Server responses kept for the browser session (survives re-opening the form):
+# key -> {'version': token from the server, 'data': response data}
+# Calls send the cached version, and the server answers "not_modified" when
+# nothing changed, so unchanged data isn't transferred again.
+_server_cache = {}
+
+
+def call_versioned(function_name, cache_key, field, **kwargs):
+    """Call a versioned server function, reusing the cached data if not modified"""
+    cached = _server_cache.get(cache_key)
+    result = anvil.server.call(function_name, known_version=cached['version'] if cached else "", **kwargs)
+    if result.get('not_modified') and cached:
+        return cached['data']
+    _server_cache[cache_key] = {'version': result['version'], 'data': result[field]}
+    return result[field]
+
+
 class MainApp(MainAppTemplate):
     """
     Main user-facing application form for This Weekend
@@ -69,7 +86,7 @@ class MainApp(MainAppTemplate):
     def load_weather_forecast(self):
         """Load and display 3-day weather forecast"""
         try:
-            weather_data = anvil.server.call('get_weather_data')
+            weather_data = call_versioned('get_weather_data', 'weather', 'forecasts')
             
             if weather_data:
                 # Sort by date
@@ -106,37 +123,106 @@ class MainApp(MainAppTemplate):
     
     
     def load_weekend_suggestions(self):
-        """Load AI-generated weekend suggestions"""
+        """Load AI-generated weekend suggestions (streamed if generated live)"""
         try:
-            # Set loading state
-            if hasattr(self, 'suggestions_text'):
+            cached = _server_cache.get('suggestions')
+            
+            # Set loading state (or show the text we already have)
+            if cached:
+                self.show_suggestions(cached['data'])
+            elif hasattr(self, 'suggestions_text'):
                 self.suggestions_text.text = "Generating personalized suggestions..."
                 self.suggestions_text.italic = True
             
-            # Get suggestions from server
-            suggestions = anvil.server.call('get_weekend_suggestions')
+            # Get suggestions from server - cached text, or a streaming task
+            result = anvil.server.call('start_weekend_suggestions',
+                                       known_version=cached['version'] if cached else "")
+            
+            if result.get('not_modified') and cached:
+                return
             
-            if suggestions:
-                self.suggestions_text.text = suggestions
-                self.suggestions_text.italic = False
+            if result.get('task'):
+                # Show any previous suggestions while the new ones stream in
+                if result.get('text'):
+                    self.show_suggestions(result['text'])
+                self.start_suggestions_polling(result['task'])
+            elif result.get('text'):
+                if result.get('version'):
+                    _server_cache['suggestions'] = {'version': result['version'], 'data': result['text']}
+                self.show_suggestions(result['text'])
             else:
-                # Hide the section if no suggestions
-                if hasattr(self, 'suggestions_section'):
-                    self.suggestions_section.visible = False
+                self.hide_suggestions()
                 
         except Exception as e:
             print(f"Error loading suggestions: {e}")
-            # Show a friendly fallback message
-            if hasattr(self, 'suggestions_text'):
-                self.suggestions_text.text = "Explore the events below to find your perfect weekend activities!"
-                self.suggestions_text.italic = False
+            self.show_suggestions_fallback()
+    
+    
+    def show_suggestions(self, text):
+        """Display suggestions text"""
+        if hasattr(self, 'suggestions_text'):
+            self.suggestions_text.text = text
+            self.suggestions_text.italic = False
+    
+    
+    def hide_suggestions(self):
+        """Hide the suggestions section"""
+        if hasattr(self, 'suggestions_section'):
+            self.suggestions_section.visible = False
+    
+    
+    def show_suggestions_fallback(self):
+        """Show a friendly fallback message instead of suggestions"""
+        if hasattr(self, 'suggestions_text'):
+            self.suggestions_text.text = "Explore the events below to find your perfect weekend activities!"
+            self.suggestions_text.italic = False
+    
+    
+    def start_suggestions_polling(self, task):
+        """Poll a streaming suggestions task and render text as it arrives"""
+        self.suggestions_task = task
+        self.suggestions_streamed = False
+        self.suggestions_timer = Timer(interval=0.3)
+        self.suggestions_timer.set_event_handler('tick', self.suggestions_timer_tick)
+        self.add_component(self.suggestions_timer)
+    
+    
+    def stop_suggestions_polling(self):
+        """Stop polling the suggestions task"""
+        self.suggestions_timer.interval = 0
+        self.suggestions_timer.remove_from_parent()
+    
+    
+    def suggestions_timer_tick(self, **event_args):
+        """Render the latest partial suggestions text"""
+        try:
+            state = self.suggestions_task.get_state() or {}
+            text = state.get('text')
+            if text:
+                self.show_suggestions(text)
+                self.suggestions_streamed = True
+            
+            if self.suggestions_task.is_completed():
+                self.stop_suggestions_polling()
+                final_text = self.suggestions_task.get_return_value()
+                if final_text:
+                    self.show_suggestions(final_text)
+                elif not self.suggestions_streamed:
+                    self.hide_suggestions()
+        
+        except Exception as e:
+            print(f"Error streaming suggestions: {e}")
+            self.stop_suggestions_polling()
+            if not self.suggestions_streamed:
+                self.show_suggestions_fallback()
     
     
     def load_events(self):
         """Load events from server"""
         try:
             # Get all events with current sort order
-            self.all_events = anvil.server.call('get_all_events', sort_by=self.current_sort)
+            self.all_events = call_versioned('get_all_events', f"events:{self.current_sort}", 'events',
+                                             sort_by=self.current_sort)
             
             # Apply current filters
             self.apply_filters()
@@ -151,8 +151,11 @@ def get_system_info():
     # Get event count
     try:
         from anvil.tables import app_tables
+        from . import weather_service
         info['event_count'] = len(list(app_tables.events.search()))
-        info['weather_forecast_count'] = len(list(app_tables.weather_forecast.search()))
+        info['weather_forecast_count'] = len(list(app_tables.weather_forecast.search(
+            **weather_service.active_generation_filter()
+        )))
     except Exception as e:
         info['count_error'] = str(e)
     
@@ -184,7 +187,7 @@ def scheduled_clear_all_data():
     
     # Clear events
     try:
-        print("[1/3] Clearing events table...")
+        print("[1/4] Clearing events table...")
         count = 0
         for row in app_tables.events.search():
             row.delete()
@@ -197,7 +200,7 @@ def scheduled_clear_all_data():
     
     # Clear weather_forecast
     try:
-        print("[2/3] Clearing weather_forecast table...")
+        print("[2/4] Clearing weather_forecast table...")
         count = 0
         for row in app_tables.weather_forecast.search():
             row.delete()
@@ -210,7 +213,7 @@ def scheduled_clear_all_data():
     
     # Clear scrape_log
     try:
-        print("[3/3] Clearing scrape_log table...")
+        print("[3/4] Clearing scrape_log table...")
         count = 0
         for row in app_tables.scrape_log.search():
             row.delete()
@@ -221,6 +224,26 @@ def scheduled_clear_all_data():
         result['deleted']['scrape_log'] = f"Error: {str(e)}"
         print(f"  ✗ Error: {str(e)}")
     
+    # Clear app_state (cached suggestions etc. refer to the deleted data)
+    # The data version is kept and advanced, so visitors' copies from
+    # before the clear can never match a later version
+    try:
+        from . import state_store
+        
+        print("[4/4] Clearing app_state table...")
+        count = 0
+        for row in app_tables.app_state.search():
+            if row["key"] == state_store.DATA_VERSION_KEY:
+                continue
+            row.delete()
+            count += 1
+        state_store.bump_data_version()
+        result['deleted']['app_state'] = count
+        print(f"  ✓ Deleted {count} state entries")
+    except Exception as e:
+        result['deleted']['app_state'] = f"Error: {str(e)}"
+        print(f"  ✗ Error: {str(e)}")
+    
     total_deleted = sum(v for v in result['deleted'].values() if isinstance(v, int))
     
     print("\n" + "=" * 60)
@@ -384,7 +407,33 @@ def run_quick_health_check():
             'status': 'error',
             'error': str(e)
         }
-    
+
+    # Check 4: Circuit breakers for external providers
+    try:
+        from . import resilience
+        breakers = resilience.get_all_status()
+
+        summary = []
+        for name, status in breakers.items():
+            entry = f"{name}: {status['state']}"
+            if status['state'] == resilience.OPEN and status.get('retry_in_seconds') is not None:
+                entry += f" (retry in {status['retry_in_seconds']}s)"
+            summary.append(entry)
+
+        tripped = [name for name, status in breakers.items() if status['state'] != resilience.CLOSED]
+        health['checks']['circuit_breakers'] = {
+            'status': 'warning' if tripped else 'ok',
+            'message': ', '.join(summary),
+            'details': breakers
+        }
+        if tripped:
+            issues.append(f"Circuit not closed for: {', '.join(tripped)}")
+    except Exception as e:
+        health['checks']['circuit_breakers'] = {
+            'status': 'error',
+            'error': str(e)
+        }
+
     # Determine overall status
     statuses = [check.get('status', 'unknown') for check in health['checks'].values()]
     if 'error' in statuses:
@@ -401,9 +450,14 @@ def run_quick_health_check():
 
 
 @anvil.server.callable
-def test_openweather_api():
+def test_openweather_api(force=True):
     """
     Test OpenWeather API connection and data retrieval.
+    Calls the API by default, so a revoked key or an outage shows up even
+    while the response cache is fresh.
+    
+    Args:
+        force: If False, a fresh cached response may answer the test
     
     Returns:
         dict: Test results with weather data or error
@@ -417,7 +471,7 @@ def test_openweather_api():
     
     try:
         print("Testing OpenWeather API...")
-        weather_data = weather_service.fetch_weekend_weather()
+        weather_data = weather_service.fetch_weekend_weather(force=force)
         
         result['success'] = True
         result['days_count'] = len(weather_data)
@@ -13,15 +13,19 @@ Model Strategy:
 """
 
 import anvil.server
+import anvil.tables as tables
 from datetime import datetime
+import hashlib
 import json
+import queue
+import threading
 import time
 
 from . import config
 from . import api_helpers
-
-# Import OpenAI SDK (required dependency)
-from openai import OpenAI
+from . import ai_session
+from . import resilience
+from . import state_store
 
 
 def analyze_event(event):
@@ -38,17 +42,11 @@ def analyze_event(event):
     Returns:
         dict: Analysis results
     """
-    # Get API key
-    api_key = api_helpers.get_api_key("OPENAI_API_KEY")
-    
     # Build the prompt
     prompt = build_analysis_prompt(event)
     
-    # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
-    
-    # Make API call using GPT-4.1-mini for data analysis
-    response = client.chat.completions.create(
+    # Make API call using GPT-4.1-mini for data analysis (shared session)
+    response = ai_session.get_session().chat_completion(
         model=config.OPENAI_ANALYSIS_MODEL,
         messages=[
             {
@@ -123,7 +121,8 @@ def get_default_analysis():
         "is_outdoor": False,
         "audience_type": "all-ages",
         "categories": ["Other"],
-        "cost_level": "$$"
+        "cost_level": "$$",
+        "source": "default"
     }
 
 
@@ -168,12 +167,138 @@ def parse_ai_response(ai_response):
         return get_default_analysis()
 
 
-def analyze_all_events(events):
+def analyze_event_with_fallbacks(event_data, classifier=None, before_llm_call=None, signatures=None):
+    """
+    Analyze one event: reused label, then local classifier, then the LLM with retries.
+    Shared by analyze_all_events and AnalysisPipeline.
+    
+    - Recurring events with an unchanged description reuse their last label
+    - Confident local predictions are returned without calling the LLM
+    - While the OpenAI circuit is open, the default analysis is returned
+    - LLM results are compared with the local prediction when there is one
+    
+    Args:
+        event_data: Dictionary with title, description, location, cost_raw
+        classifier: Optional trained event_classifier.EventClassifier
+        before_llm_call: Optional callable run just before the LLM is called
+                         (used for rate limiting)
+        signatures: Optional event_classifier.SignatureStore
+        
+    Returns:
+        tuple: (analysis dict, route) where route is "reused", "local", "llm",
+               "circuit_open" or "failed"
+    """
+    # Recurring event seen before with a similar description
+    if signatures:
+        reused, _ = signatures.lookup(event_data)
+        if reused:
+            return reused, "reused"
+    
+    # Try the local classifier first
+    local_analysis = None
+    audited = False
+    if classifier:
+        local_analysis, confidence = classifier.predict(event_data)
+        bypass, audited = classifier.should_bypass(confidence)
+        if bypass:
+            local_analysis.update(source="local", confidence=round(confidence, 3))
+            return local_analysis, "local"
+    
+    # Fail fast while the OpenAI circuit is open
+    if not resilience.is_available("openai"):
+        return get_default_analysis(), "circuit_open"
+    
+    if before_llm_call:
+        before_llm_call()
+    
+    # Analyze with retry logic
+    try:
+        analysis = api_helpers.retry_with_backoff(
+            lambda: analyze_event(event_data),
+            max_retries=config.OPENAI_MAX_RETRIES,
+            initial_delay=config.OPENAI_RETRY_DELAY
+        )
+        
+        # Validate and parse response
+        analysis = parse_ai_response(analysis)
+        analysis.setdefault("source", "ai")
+        
+        if local_analysis and analysis["source"] == "ai":
+            classifier.record_comparison(local_analysis, analysis, audited=audited)
+        
+        return analysis, "llm"
+        
+    except resilience.CircuitOpenError:
+        return get_default_analysis(), "circuit_open"
+        
+    except Exception as e:
+        print(f"  ❌ Failed to analyze '{event_data['title']}': {str(e)}")
+        return get_default_analysis(), "failed"
+
+
+def get_event_data(event):
+    """
+    Extract the fields used for analysis from an event row or dictionary.
+    
+    Args:
+        event: Event row or dictionary
+        
+    Returns:
+        dict: title, description, location, cost_raw
+    """
+    return {
+        "title": event["title"],
+        "description": event["description"],
+        "location": event["location"],
+        "cost_raw": event["cost_raw"]
+    }
+
+
+def print_analysis_summary(routes, classifier=None, signatures=None):
+    """
+    Print the per-run analysis summary.
+    
+    Args:
+        routes: Dictionary of route name to event count
+        classifier: Optional classifier whose stats are printed
+        signatures: Optional signature store whose stats are printed
+    """
+    if signatures:
+        stats = signatures.stats
+        print(f"  Recurring events: {stats['reused']} reused labels, "
+              f"{stats['drifted']} drifted, {stats['expired']} expired, {stats['new']} new")
+    
+    if classifier:
+        stats = classifier.get_stats_summary()
+        agreement = f"{stats['agreement']:.0%}" if stats['agreement'] is not None else "n/a"
+        print(f"  Local classifier: {stats['bypassed']}/{stats['predicted']} bypassed "
+              f"({stats['bypass_rate']:.0%}), agreement with LLM {agreement}")
+    
+    if routes.get("circuit_open"):
+        print(f"  ⚡ OpenAI circuit open: {routes['circuit_open']} events got default analysis")
+    
+    total = sum(routes.values())
+    llm_calls = routes.get("llm", 0) + routes.get("failed", 0)
+    print(f"Completed AI analysis for {total} events ({llm_calls} LLM calls)")
+
+
+def analyze_all_events(events, classifier=None, signatures=None):
     """
     Analyze all events using AI with rate limiting.
     
+    When a signature store is given, recurring events whose description
+    hasn't drifted reuse their last AI label. When a trained local
+    classifier is given, events it classifies with high confidence skip
+    the LLM; the rest (plus a small audit sample) are sent to the LLM and
+    compared with the local prediction.
+    
+    While the OpenAI circuit is open, remaining events get the default
+    analysis immediately instead of waiting out retries.
+    
     Args:
         events: List of event rows from database
+        classifier: Optional trained event_classifier.EventClassifier
+        signatures: Optional event_classifier.SignatureStore
         
     Returns:
         dict: Event ID to analysis mapping
@@ -183,44 +308,179 @@ def analyze_all_events(events):
     
     analyses = {}
     milestones = [int(total * 0.25), int(total * 0.5), int(total * 0.75), total]
+    routes = {}
+    llm_calls = 0
+    
+    def rate_limit():
+        # Rate limiting delay between LLM calls
+        nonlocal llm_calls
+        if llm_calls > 0:
+            time.sleep(config.OPENAI_RATE_LIMIT_DELAY)
+        llm_calls += 1
     
     for i, event in enumerate(events):
-        event_id = event["event_id"]
-        
         # Show progress only at key milestones
         if (i + 1) in milestones:
             percent = int(((i + 1) / total) * 100)
             print(f"  ✓ {percent}% complete ({i+1}/{total})")
         
-        # Prepare event data for analysis
-        event_data = {
-            "title": event["title"],
-            "description": event["description"],
-            "location": event["location"],
-            "cost_raw": event["cost_raw"]
-        }
+        analysis, route = analyze_event_with_fallbacks(
+            get_event_data(event), classifier=classifier,
+            before_llm_call=rate_limit, signatures=signatures
+        )
+        analyses[event["event_id"]] = analysis
+        routes[route] = routes.get(route, 0) + 1
+    
+    print_analysis_summary(routes, classifier, signatures)
+    return analyses
+
+
+class AnalysisPipeline:
+    """
+    Producer/consumer stage that analyzes events while scraping continues.
+    
+    The scraper submits each accepted event as soon as it has been enriched;
+    worker threads take events off a bounded queue and analyze them, so
+    event page scraping and model latency overlap. When the queue is full,
+    submit() blocks, which keeps the scraper from running far ahead of
+    the workers.
+    
+    Usage:
+        pipeline = AnalysisPipeline(classifier)
+        scraper_service.parse_events_from_markdown(markdown, on_event=pipeline.submit)
+        analyses = pipeline.finish()
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, classifier=None, signatures=None, workers=None, queue_size=None):
+        """
+        Start the worker threads.
+        
+        Args:
+            classifier: Optional trained event_classifier.EventClassifier
+            signatures: Optional event_classifier.SignatureStore
+            workers: Number of worker threads (default config.ANALYSIS_PIPELINE_WORKERS)
+            queue_size: Queue capacity (default config.ANALYSIS_QUEUE_SIZE)
+        """
+        self.classifier = classifier
+        self.signatures = signatures
+        self.workers = workers or config.ANALYSIS_PIPELINE_WORKERS
+        self._queue = queue.Queue(maxsize=queue_size or config.ANALYSIS_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._analyses = {}
+        self._routes = {}
+        self._cancelled = False
+        self.submitted = 0
         
-        # Analyze with retry logic
+        # Resolve the API key and build the client on this thread; workers
+        # only make HTTP calls
         try:
-            analysis = api_helpers.retry_with_backoff(
-                lambda: analyze_event(event_data),
-                max_retries=config.OPENAI_MAX_RETRIES,
-                initial_delay=config.OPENAI_RETRY_DELAY
-            )
+            ai_session.get_session().client
+        except Exception as e:
+            print(f"  ⚠️ OpenAI client unavailable: {str(e)}")
+        
+        self._threads = [
+            threading.Thread(target=self._work, name=f"analysis-{n}", daemon=True)
+            for n in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    
+    def submit(self, event):
+        """
+        Queue an event for analysis (blocks while the queue is full).
+        
+        Args:
+            event: Event row or dictionary with event_id and the text fields
+        """
+        self._queue.put((event["event_id"], get_event_data(event)))
+        self.submitted += 1
+        
+        # Circuit state changes from the workers are written from this thread
+        resilience.publish_status_changes()
+    
+    
+    def finish(self):
+        """
+        Wait for all queued events to be analyzed and stop the workers.
+        
+        Returns:
+            dict: Event ID to analysis mapping
+        """
+        for _ in self._threads:
+            self._queue.put(self._STOP)
+        for thread in self._threads:
+            thread.join()
+        resilience.publish_status_changes()
+        
+        print_analysis_summary(self._routes, self.classifier, self.signatures)
+        return dict(self._analyses)
+    
+    
+    def cancel(self):
+        """Stop the workers without analyzing the events still queued."""
+        self._cancelled = True
+        for _ in self._threads:
+            self._queue.put(self._STOP)
+    
+    
+    def _work(self):
+        """Worker loop: analyze queued events until told to stop."""
+        # Workers only make HTTP calls - circuit changes are published by the owner
+        resilience.defer_publishing()
+        llm_calls = 0
+        
+        def rate_limit():
+            # Rate limiting delay between this worker's LLM calls
+            nonlocal llm_calls
+            if llm_calls > 0:
+                time.sleep(config.OPENAI_RATE_LIMIT_DELAY)
+            llm_calls += 1
+        
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            if self._cancelled:
+                continue
             
-            # Validate and parse response
-            analyses[event_id] = parse_ai_response(analysis)
+            event_id, event_data = item
+            try:
+                analysis, route = analyze_event_with_fallbacks(
+                    event_data, classifier=self.classifier,
+                    before_llm_call=rate_limit, signatures=self.signatures
+                )
+            except Exception as e:
+                # Keep the worker alive so the queue keeps draining
+                print(f"  ❌ Failed to analyze '{event_data['title']}': {str(e)}")
+                analysis, route = get_default_analysis(), "failed"
             
-        except Exception as e:
-            print(f"  ❌ Failed to analyze '{event['title']}': {str(e)}")
-            analyses[event_id] = get_default_analysis()
+            with self._lock:
+                self._analyses[event_id] = analysis
+                self._routes[route] = self._routes.get(route, 0) + 1
+
+
+def get_unanalyzed_events(exclude_ids=()):
+    """
+    Find stored future events without a real analysis: never analyzed, or
+    given the default analysis after a failed attempt (e.g. an earlier run
+    that hit an OpenAI outage).
+    
+    Args:
+        exclude_ids: Event IDs already analyzed in this run
         
-        # Rate limiting delay (except for last event)
-        if i < len(events) - 1:
-            time.sleep(config.OPENAI_RATE_LIMIT_DELAY)
+    Returns:
+        list: Event rows to analyze
+    """
+    from anvil.tables import app_tables
+    import anvil.tables.query as q
+    from . import date_utils
     
-    print(f"Completed AI analysis for {len(analyses)} events")
-    return analyses
+    events = list(app_tables.events.search(analysis_source=q.any_of(None, "default")))
+    events = date_utils.filter_future_events(events)
+    return [event for event in events if event["event_id"] not in exclude_ids]
 
 
 def update_events_with_analysis(analyses):
@@ -234,6 +494,7 @@ def update_events_with_analysis(analyses):
         int: Number of events updated
     """
     from anvil.tables import app_tables
+    from . import event_classifier
     
     print(f"Updating {len(analyses)} events with AI analysis...")
     
@@ -251,13 +512,21 @@ def update_events_with_analysis(analyses):
                 event["audience_type"] = analysis["audience_type"]
                 event["categories"] = analysis["categories"]
                 event["cost_level"] = analysis["cost_level"]
+                event["analysis_source"] = analysis.get("source", "ai")
+                event["analysis_confidence"] = analysis.get("confidence")
                 event["analyzed_at"] = datetime.now()
                 
+                # LLM results become training labels for the local classifier
+                if analysis.get("source", "ai") == "ai":
+                    event_classifier.record_label(event, analysis)
+                
                 updated_count += 1
             else:
                 print(f"Event not found in database: {event_id}")
         
         print(f"Successfully updated {updated_count} events with AI analysis")
+        if updated_count:
+            state_store.bump_data_version()
         return updated_count
         
     except Exception as e:
@@ -276,19 +545,52 @@ def generate_weather_aware_suggestions(weather_data, events):
     Returns:
         str: AI-generated suggestions text
     """
-    # Get API key
-    api_key = api_helpers.get_api_key("OPENAI_API_KEY")
+    # Make API call using GPT-4.1 for user-facing text generation (shared session)
+    response = ai_session.get_session().chat_completion(
+        **build_suggestions_request(weather_data, events)
+    )
     
-    # Build the prompt
-    prompt = build_suggestions_prompt(weather_data, events)
+    # Extract response
+    suggestions = response.choices[0].message.content.strip()
     
-    # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
+    return suggestions
+
+
+def stream_weather_aware_suggestions(weather_data, events):
+    """
+    Stream AI-powered suggestions, yielding the text generated so far.
     
-    # Make API call using GPT-4.1 for user-facing text generation
-    response = client.chat.completions.create(
-        model=config.OPENAI_TEXT_MODEL,
-        messages=[
+    Args:
+        weather_data: List of weather forecast dictionaries for the weekend
+        events: List of event dictionaries
+        
+    Yields:
+        str: Accumulated suggestions text after each streamed chunk
+    """
+    text = ""
+    for delta in ai_session.get_session().stream_chat_completion(
+        **build_suggestions_request(weather_data, events)
+    ):
+        text += delta
+        yield text
+
+
+def build_suggestions_request(weather_data, events):
+    """
+    Build the chat completion arguments for weekend suggestions.
+    
+    Args:
+        weather_data: List of weather forecast dictionaries
+        events: List of event dictionaries
+        
+    Returns:
+        dict: Keyword arguments for the chat completion call
+    """
+    prompt = build_suggestions_prompt(weather_data, events)
+    
+    return {
+        "model": config.OPENAI_TEXT_MODEL,
+        "messages": [
             {
                 "role": "system",
                 "content": "You are a friendly local events guide for Memphis, TN. Recommend specific events from the provided list based on weather conditions."
@@ -298,14 +600,9 @@ def generate_weather_aware_suggestions(weather_data, events):
                 "content": prompt
             }
         ],
-        temperature=0.7,  # More creative for suggestions
-        max_tokens=400  # Allow for specific event recommendations with explanations
-    )
-    
-    # Extract response
-    suggestions = response.choices[0].message.content.strip()
-    
-    return suggestions
+        "temperature": 0.7,  # More creative for suggestions
+        "max_tokens": 400  # Allow for specific event recommendations with explanations
+    }
 
 
 def build_suggestions_prompt(weather_data, events):
@@ -313,15 +610,17 @@ def build_suggestions_prompt(weather_data, events):
     Build the ChatGPT prompt for weather-aware suggestions.
     Uses event-specific hourly forecasts for precise recommendations.
     
+    The event-time weather comes from the fields serialize_events already
+    attached (weather_temp, weather_precip, weather_conditions,
+    weather_is_hourly), so building the prompt does no database I/O.
+    
     Args:
         weather_data: List of weather forecast dictionaries
-        events: List of event dictionaries (with weather_score)
+        events: List of serialized event dictionaries (with weather fields)
         
     Returns:
         str: Formatted prompt
     """
-    from . import weather_service
-    
     # Summarize weather
     weather_summary = []
     for day in weather_data[:3]:  # Fri, Sat, Sun
@@ -332,7 +631,7 @@ def build_suggestions_prompt(weather_data, events):
     
     # Build detailed event info with event-specific weather
     event_details = []
-    for event in events[:15]:  # Top 15 events by recommendation score
+    for event in events[:config.SUGGESTIONS_TOP_EVENTS]:  # Top events by recommendation score
         venue_type = []
         if event.get('is_outdoor'):
             venue_type.append("outdoor")
@@ -344,21 +643,16 @@ def build_suggestions_prompt(weather_data, events):
         time = event.get('start_time', 'TBD')
         location = event.get('location', 'TBD')
         
-        # Get event-specific weather conditions
+        # Event-specific weather conditions (attached during serialization)
         weather_context = ""
-        if event.get('date') and event.get('start_time'):
-            event_weather = weather_service.get_weather_for_datetime(
-                event['date'],
-                event['start_time']
-            )
-            
-            if event_weather and event_weather.get('hourly'):
-                # Use precise hourly forecast
-                h = event_weather['hourly']
-                weather_context = f" [Weather at {time}: {h['temp']}°F, {h['conditions']}, {h['precipitation_chance']}% rain]"
-            elif event_weather:
+        if event.get('weather_temp') is not None:
+            if event.get('weather_is_hourly'):
+                # Start-hour temperature and conditions; rain is the worst hour of the event
+                weather_context = (f" [Weather at {time}: {event['weather_temp']}°F, {event.get('weather_conditions')};"
+                                   f" up to {event.get('weather_precip')}% rain during the event]")
+            else:
                 # Use daily forecast as fallback
-                weather_context = f" [Weather: {event_weather.get('temp_high', '?')}°F high, {event_weather.get('precipitation_chance', '?')}% rain]"
+                weather_context = f" [Weather: {event['weather_temp']}°F high, {event.get('weather_precip', '?')}% rain]"
         
         event_details.append(
             f"- {event['title']} ({venue_str}, {event['day_name']} at {time}, {cost}){weather_context}"
@@ -391,35 +685,334 @@ Now write specific event recommendations for THIS weekend:"""
     return prompt
 
 
+SUGGESTIONS_STATE_KEY = "weekend_suggestions"
+
+
+def build_suggestions_cache_key(weather_fetched_at, events):
+    """
+    Build the cache key for weekend suggestions.
+    Combines the weather fetch time with a hash of the top events
+    (IDs and recommendation scores) that feed the prompt.
+    
+    Args:
+        weather_fetched_at: When the stored forecast was fetched
+        events: Event dictionaries sorted by recommendation score
+        
+    Returns:
+        str: Cache key
+    """
+    top_events = [
+        [event["event_id"], event.get("recommendation_score", 0)]
+        for event in events[:config.SUGGESTIONS_TOP_EVENTS]
+    ]
+    events_hash = hashlib.sha1(json.dumps(top_events).encode("utf-8")).hexdigest()[:16]
+    fetched_str = weather_fetched_at.isoformat() if weather_fetched_at else "none"
+    return f"{fetched_str}|{events_hash}"
+
+
+def get_suggestions_expiry(events):
+    """
+    Get when the cached suggestions stop being valid: the moment the first
+    of the top events starts (it then drops out of the event list).
+    
+    Args:
+        events: Event dictionaries sorted by recommendation score
+        
+    Returns:
+        float: Unix timestamp, or None if no top event has a parseable start time
+    """
+    from . import date_utils
+    
+    starts = []
+    for event in events[:config.SUGGESTIONS_TOP_EVENTS]:
+        start = date_utils.get_event_start_central(event.get("date"), event.get("start_time"))
+        if start:
+            starts.append(start.timestamp())
+    
+    return min(starts) if starts else None
+
+
+def suggestions_are_stale(state):
+    """
+    Check whether stored suggestions need regenerating.
+    Costs one weather_forecast lookup - events are not read.
+    
+    Args:
+        state: Stored suggestions state dictionary
+        
+    Returns:
+        bool: True if the suggestions should be regenerated
+    """
+    from . import weather_service
+    
+    if not state or not state.get("text"):
+        return True
+    
+    latest_fetch = weather_service.get_latest_fetch_time()
+    latest_str = latest_fetch.isoformat() if latest_fetch else "none"
+    if not state.get("key", "").startswith(latest_str + "|"):
+        return True
+    
+    expires_at = state.get("expires_at")
+    if expires_at and time.time() >= expires_at:
+        return True
+    
+    return False
+
+
+@tables.in_transaction
+def _claim_suggestions_generation():
+    """
+    Claim the right to generate suggestions (single flight).
+    Only one caller across all server processes holds the claim at a time;
+    a claim older than SUGGESTIONS_GENERATION_TIMEOUT is considered abandoned.
+    
+    Returns:
+        bool: True if this caller should generate
+    """
+    row = state_store.get_state_row(SUGGESTIONS_STATE_KEY, create=True)
+    state = dict(row["value"] or {})
+    
+    generating_since = state.get("generating_since")
+    if generating_since and time.time() - generating_since < config.SUGGESTIONS_GENERATION_TIMEOUT:
+        return False
+    
+    state["generating_since"] = time.time()
+    row.update(value=state, updated_at=datetime.now())
+    return True
+
+
+@tables.in_transaction
+def _store_suggestions(key, text, expires_at):
+    """
+    Store freshly generated suggestions and release the generation claim.
+    
+    Args:
+        key: Cache key the text was generated for
+        text: Suggestions text (None to just release the claim)
+        expires_at: Unix timestamp when the suggestions expire
+    """
+    row = state_store.get_state_row(SUGGESTIONS_STATE_KEY, create=True)
+    state = dict(row["value"] or {})
+    state.pop("generating_since", None)
+    state.pop("task_id", None)
+    
+    if text:
+        state.update({
+            "key": key,
+            "text": text,
+            "expires_at": expires_at,
+            "generated_at": time.time()
+        })
+    
+    row.update(value=state, updated_at=datetime.now())
+
+
+def _prepare_suggestions():
+    """
+    Load the inputs for suggestions generation and compute their cache key.
+    
+    Returns:
+        dict: weather_data, events, key and expires_at, or None if there is
+              no weather or no events to suggest from
+    """
+    from . import weather_service
+    from . import data_processor
+    
+    weather_data = weather_service.get_weather_data()
+    if not weather_data:
+        return None
+    
+    events = data_processor.get_all_events(sort_by='recommendation')
+    if not events:
+        return None
+    
+    return {
+        "weather_data": weather_data,
+        "events": events,
+        "key": build_suggestions_cache_key(weather_service.get_latest_fetch_time(), events),
+        "expires_at": get_suggestions_expiry(events)
+    }
+
+
+def refresh_weekend_suggestions(force=False):
+    """
+    Regenerate the stored weekend suggestions if their key is stale.
+    Called at the end of each refresh task; also used as the fallback
+    when a visitor finds the stored suggestions out of date.
+    
+    Args:
+        force: Regenerate even if the key hasn't changed
+        
+    Returns:
+        str: Current suggestions text, or None if unavailable
+    """
+    state = state_store.get_state(SUGGESTIONS_STATE_KEY, {})
+    
+    inputs = _prepare_suggestions()
+    if not inputs:
+        return state.get("text")
+    
+    if not force and state.get("key") == inputs["key"] and state.get("text"):
+        return state["text"]
+    
+    # Single flight: if someone else is generating, serve what we have
+    if not _claim_suggestions_generation():
+        print("Suggestions generation already in progress - serving stored text")
+        return state.get("text")
+    
+    text = None
+    try:
+        text = api_helpers.retry_with_backoff(
+            lambda: generate_weather_aware_suggestions(inputs["weather_data"], inputs["events"]),
+            max_retries=config.OPENAI_MAX_RETRIES,
+            initial_delay=config.OPENAI_RETRY_DELAY
+        )
+    finally:
+        _store_suggestions(inputs["key"], text, inputs["expires_at"])
+    
+    if text:
+        state_store.bump_data_version()
+    return text
+
+
+@anvil.server.background_task
+def stream_weekend_suggestions(weather_data, events, key, expires_at):
+    """
+    BACKGROUND TASK: Generate suggestions as a stream.
+    Partial text is published to task_state['text'] so the client can
+    render it while the completion is still running.
+    
+    Args:
+        weather_data: List of weather forecast dictionaries
+        events: Event dictionaries sorted by recommendation score
+        key: Cache key the suggestions are generated for
+        expires_at: Unix timestamp when the suggestions expire
+        
+    Returns:
+        str: Complete suggestions text
+    """
+    anvil.server.task_state["text"] = ""
+    anvil.server.task_state["done"] = False
+    
+    text = ""
+    completed_text = None
+    last_publish = 0
+    try:
+        for partial in stream_weather_aware_suggestions(weather_data, events):
+            text = partial
+            # Throttle task_state writes - the client polls, it doesn't need every token
+            now = time.monotonic()
+            if now - last_publish >= config.SUGGESTIONS_STREAM_PUBLISH_INTERVAL:
+                anvil.server.task_state["text"] = text
+                last_publish = now
+        
+        completed_text = text.strip() or None
+        anvil.server.task_state["text"] = completed_text or ""
+        anvil.server.task_state["done"] = True
+        return completed_text
+    finally:
+        # Only a finished stream is cached; a failed one just releases the claim
+        _store_suggestions(key, completed_text, expires_at)
+        if completed_text:
+            state_store.bump_data_version()
+
+
 @anvil.server.callable
-def get_weekend_suggestions():
+def start_weekend_suggestions(known_version=None):
     """
-    Get AI-generated weather-aware weekend suggestions.
+    Get weekend suggestions, streaming them if they must be generated live.
     Callable from client-side code.
     
+    Args:
+        known_version: Optional version token of the text the client shows
+    
     Returns:
-        str: Suggestion text, or None if generation fails
+        dict: {"text": str, "version": str} when stored suggestions are
+              current ({"version": str, "not_modified": True} instead if the
+              client already shows them), or {"task": Task, "text": str or None}
+              when a streaming generation is running - poll
+              task.get_state()['text'] for partial output
     """
+    state = {}
     try:
-        # Get weather data
-        from . import weather_service
-        weather_data = weather_service.get_weather_data()
+        version = str(state_store.get_data_version())
+        state = state_store.get_state(SUGGESTIONS_STATE_KEY, {})
+        
+        if not suggestions_are_stale(state):
+            return state_store.versioned_response(version, known_version, text=state["text"])
+        
+        inputs = _prepare_suggestions()
+        if not inputs:
+            return {"text": state.get("text")}
+        
+        if state.get("key") == inputs["key"] and state.get("text"):
+            return {"text": state["text"]}
         
-        if not weather_data:
-            return None
+        # Single flight: join the generation already in progress, if any
+        if not _claim_suggestions_generation():
+            task_id = state.get("task_id")
+            if task_id:
+                return {"task": anvil.server.get_background_task(task_id), "text": state.get("text")}
+            return {"text": state.get("text")}
         
-        # Get events
-        from . import data_processor
-        events = data_processor.get_all_events(sort_by='recommendation')
+        try:
+            task = anvil.server.launch_background_task(
+                'stream_weekend_suggestions',
+                inputs["weather_data"],
+                inputs["events"],
+                inputs["key"],
+                inputs["expires_at"]
+            )
+        except Exception:
+            _store_suggestions(inputs["key"], None, inputs["expires_at"])
+            raise
         
-        if not events:
-            return None
+        _record_suggestions_task(task.get_id())
+        return {"task": task, "text": state.get("text")}
+        
+    except Exception as e:
+        print(f"Error starting weekend suggestions: {str(e)}")
+        return {"text": state.get("text")}
+
+
+@tables.in_transaction
+def _record_suggestions_task(task_id):
+    """
+    Record the running generation task so concurrent visitors can join it.
+    
+    Args:
+        task_id: Background task ID
+    """
+    row = state_store.get_state_row(SUGGESTIONS_STATE_KEY, create=True)
+    state = dict(row["value"] or {})
+    if state.get("generating_since"):
+        state["task_id"] = task_id
+        row.update(value=state, updated_at=datetime.now())
+
+
+@anvil.server.callable
+def get_weekend_suggestions():
+    """
+    Get AI-generated weather-aware weekend suggestions.
+    Callable from client-side code.
+    
+    Suggestions are generated by the refresh tasks and served from the
+    app_state store; a GPT call is only made when the stored key is stale.
+    
+    Returns:
+        str: Suggestion text, or None if generation fails
+    """
+    state = {}
+    try:
+        state = state_store.get_state(SUGGESTIONS_STATE_KEY, {})
         
-        # Generate suggestions
-        suggestions = generate_weather_aware_suggestions(weather_data, events)
+        if not suggestions_are_stale(state):
+            return state["text"]
         
-        return suggestions
+        return refresh_weekend_suggestions()
         
     except Exception as e:
         print(f"Error generating weekend suggestions: {str(e)}")
-        return None
\ No newline at end of file
+        # Fall back to the last stored suggestions, if any
+        return state.get("text")
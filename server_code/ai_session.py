@@ -0,0 +1,250 @@
+"""
+AI session module for This Weekend app.
+Holds one process-level OpenAI client and accounts for every call made through it.
+
+The client is created once (with a pooled HTTP connection) and reused by
+event analysis and suggestion generation, so repeated calls skip the key
+lookup, client construction and TLS handshake. Each call records prompt
+tokens, completion tokens, latency and estimated cost; background tasks
+read the per-run totals and write them to scrape_log.
+"""
+
+import threading
+import time
+
+import httpx
+from openai import OpenAI
+
+from . import config
+from . import api_helpers
+from . import resilience
+
+
+class AISession:
+    """
+    Shared OpenAI client plus token/latency/cost accounting.
+
+    Usage totals are cumulative until reset_usage() is called, which
+    background tasks do at the start of each run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._client = None
+        self._api_key = None
+        self._base_url = config.OPENAI_BASE_URL
+        self.reset_usage()
+
+
+    def configure(self, api_key=None, base_url=None):
+        """
+        Override the API key and endpoint, e.g. to point the session at a
+        local OpenAI-compatible server (see benchmarks/mock_openai_server.py).
+        The current client is dropped and rebuilt on next use.
+
+        Args:
+            api_key: API key to use instead of the OPENAI_API_KEY secret
+            base_url: API base URL (None for the default OpenAI endpoint)
+        """
+        with self._lock:
+            self._api_key = api_key
+            self._base_url = base_url
+            self._client = None
+
+
+    @property
+    def client(self):
+        """OpenAI client, created on first use and reused afterwards."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    if not self._api_key:
+                        self._api_key = api_helpers.get_api_key("OPENAI_API_KEY")
+                    http_client = httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=config.OPENAI_MAX_CONNECTIONS,
+                            max_keepalive_connections=config.OPENAI_MAX_KEEPALIVE_CONNECTIONS
+                        ),
+                        timeout=config.OPENAI_TIMEOUT
+                    )
+                    # No SDK retries: retry_with_backoff retries each call, and
+                    # every attempt is recorded by the "openai" circuit breaker
+                    self._client = OpenAI(
+                        api_key=self._api_key,
+                        base_url=self._base_url,
+                        http_client=http_client,
+                        max_retries=0
+                    )
+        return self._client
+
+
+    def chat_completion(self, **kwargs):
+        """
+        Create a chat completion and record its usage.
+        Runs under the "openai" circuit breaker and bulkhead.
+
+        Args:
+            **kwargs: Arguments passed straight to client.chat.completions.create
+
+        Returns:
+            ChatCompletion response from the OpenAI SDK
+
+        Raises:
+            resilience.CircuitOpenError: If the OpenAI circuit is open
+        """
+        with resilience.protect("openai"):
+            started = time.monotonic()
+            response = self.client.chat.completions.create(**kwargs)
+            latency = time.monotonic() - started
+
+        self.record_usage(kwargs.get("model"), getattr(response, "usage", None), latency)
+        return response
+
+
+    def stream_chat_completion(self, **kwargs):
+        """
+        Stream a chat completion, yielding text as it arrives.
+        Usage is recorded once the stream finishes. The whole stream runs
+        under the "openai" circuit breaker and holds one bulkhead slot.
+
+        Args:
+            **kwargs: Arguments passed to client.chat.completions.create
+                      (stream options are added automatically)
+
+        Yields:
+            str: Text deltas in arrival order
+
+        Raises:
+            resilience.CircuitOpenError: If the OpenAI circuit is open
+        """
+        with resilience.protect("openai"):
+            started = time.monotonic()
+            usage = None
+
+            stream = self.client.chat.completions.create(
+                stream=True,
+                stream_options={"include_usage": True},
+                **kwargs
+            )
+
+            try:
+                for chunk in stream:
+                    if getattr(chunk, "usage", None):
+                        usage = chunk.usage
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            finally:
+                self.record_usage(kwargs.get("model"), usage, time.monotonic() - started)
+
+
+    def record_usage(self, model, usage, latency):
+        """
+        Add one call's usage to the running totals.
+
+        Args:
+            model: Model name used for the call
+            usage: Usage object from the API response (may be None)
+            latency: Wall-clock seconds spent on the call
+        """
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        cost = estimate_cost(model, prompt_tokens, completion_tokens)
+
+        with self._lock:
+            self._usage["calls"] += 1
+            self._usage["prompt_tokens"] += prompt_tokens
+            self._usage["completion_tokens"] += completion_tokens
+            self._usage["latency_seconds"] += latency
+            self._usage["cost_usd"] += cost
+
+            by_model = self._usage["by_model"].setdefault(model, {"calls": 0, "cost_usd": 0.0})
+            by_model["calls"] += 1
+            by_model["cost_usd"] += cost
+
+
+    def reset_usage(self):
+        """Clear the usage totals (start of a new run)."""
+        with self._lock:
+            self._usage = {
+                "calls": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "latency_seconds": 0.0,
+                "cost_usd": 0.0,
+                "by_model": {}
+            }
+
+
+    def get_usage_totals(self):
+        """
+        Get a snapshot of the usage totals since the last reset.
+
+        Returns:
+            dict: calls, prompt_tokens, completion_tokens, latency_seconds,
+                  cost_usd and a per-model breakdown
+        """
+        with self._lock:
+            totals = dict(self._usage)
+            totals["by_model"] = {k: dict(v) for k, v in self._usage["by_model"].items()}
+        return totals
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    """
+    Estimate the USD cost of a call from config.OPENAI_PRICING.
+
+    Args:
+        model: Model name
+        prompt_tokens: Number of input tokens
+        completion_tokens: Number of output tokens
+
+    Returns:
+        float: Estimated cost in USD (0 for unknown models)
+    """
+    pricing = config.OPENAI_PRICING.get(model)
+    if not pricing:
+        return 0.0
+
+    return (
+        prompt_tokens * pricing["prompt"] +
+        completion_tokens * pricing["completion"]
+    ) / 1_000_000
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Get the process-level AI session, creating it on first use.
+
+    Returns:
+        AISession: Shared session
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = AISession()
+    return _session
+
+
+def write_usage_to_log(log_entry, usage=None):
+    """
+    Write AI usage totals to a scrape_log row.
+
+    Args:
+        log_entry: scrape_log row
+        usage: Usage totals (defaults to the current session totals)
+    """
+    usage = usage or get_session().get_usage_totals()
+
+    log_entry["ai_calls"] = usage["calls"]
+    log_entry["prompt_tokens"] = usage["prompt_tokens"]
+    log_entry["completion_tokens"] = usage["completion_tokens"]
+    log_entry["ai_latency_seconds"] = round(usage["latency_seconds"], 2)
+    log_entry["ai_cost_usd"] = round(usage["cost_usd"], 4)
@@ -44,13 +44,19 @@ def retry_with_backoff(func, max_retries=3, initial_delay=1, backoff_factor=2):
         
     Raises:
         Exception: Last exception if all retries fail
+        CircuitOpenError / BulkheadFullError: Immediately, without retrying
     """
+    from . import resilience
+
     delay = initial_delay
     last_exception = None
     
     for attempt in range(max_retries):
         try:
             return func()
+        except (resilience.CircuitOpenError, resilience.BulkheadFullError):
+            # Retrying a rejected call only burns time - fail fast
+            raise
         except Exception as e:
             last_exception = e
             print(f"Attempt {attempt + 1} failed: {str(e)}")
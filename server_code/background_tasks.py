@@ -12,9 +12,13 @@ import re
 
 from . import config
 from . import weather_service
+from . import state_store
 from . import scraper_service
 from . import ai_service
+from . import ai_session
 from . import data_processor
+from . import scoring_engine
+from . import event_classifier
 from . import api_helpers
 from . import date_utils
 
@@ -29,12 +33,15 @@ def scheduled_refresh_all_data():
     1. Clean up old data
     2. Fetch weather forecast
     3. Scrape events
-    4. Parse events
+    4. Parse events (each future event is queued for AI analysis as soon
+       as its page has been scraped, so scraping and analysis overlap)
     5. Save events to database
-    6. Analyze events with AI
-    7. Match events with weather
-    8. Calculate recommendation scores
-    9. Log completion
+    6. Collect AI analysis results (and retry stored events whose earlier
+       analysis failed)
+    7. Fetch forecasts for the venues' weather grid cells
+    8. Score events (weather match + recommendation, in one batch)
+    9. Build the event feed and precompute weekend suggestions
+    10. Log completion
     """
     log_id = api_helpers.generate_unique_id("log")
     start_time = datetime.now()
@@ -56,6 +63,10 @@ def scheduled_refresh_all_data():
         duration_seconds=0
     )
     
+    # Start AI usage accounting for this run
+    ai_session.get_session().reset_usage()
+    pipeline = None
+    
     try:
         # Step 1: Clean up old data
         print("[1/10] Cleanup...")
@@ -76,10 +87,22 @@ def scheduled_refresh_all_data():
         print("[4/10] Scrape events...")
         markdown_content = scraper_service.scrape_weekend_events()
         
+        # Start the AI analysis workers before parsing so analysis overlaps
+        # with event page scraping
+        labeled = event_classifier.load_labeled_events()
+        signatures = event_classifier.SignatureStore(labeled)
+        classifier = event_classifier.load_trained_classifier(labeled)
+        pipeline = ai_service.AnalysisPipeline(classifier=classifier, signatures=signatures)
+        
+        def queue_for_analysis(event):
+            # Same rule as filter_future_events below
+            if event.get("date") and date_utils.is_event_in_future(event["date"], event.get("start_time")):
+                pipeline.submit(event)
+        
         # Step 5: Parse events from markdown
-        print("[5/10] Parse events...")
-        events = scraper_service.parse_events_from_markdown(markdown_content)
-        print(f"  ✓ Found {len(events)} events")
+        print("[5/10] Parse events (AI analysis running alongside)...")
+        events = scraper_service.parse_events_from_markdown(markdown_content, on_event=queue_for_analysis)
+        print(f"  ✓ Found {len(events)} events ({pipeline.submitted} queued for analysis)")
         
         # Step 5.5: Filter out past events
         print("[5.5/10] Filter past events...")
@@ -90,14 +113,29 @@ def scheduled_refresh_all_data():
         # Step 6: Save events to database
         print("[6/10] Save to DB...")
         saved_count = scraper_service.save_events_to_db(events)
+        if saved_count:
+            # The stored feed lists the old events - serve the table until step 9.5
+            drop_event_feed()
         
-        # Step 7: Analyze events with AI
+        # Step 7: Collect AI analysis (most of it ran during parsing)
         print("[7/10] AI analysis...")
-        db_events = list(app_tables.events.search())
-        # Filter to only future events for AI analysis
-        db_events = date_utils.filter_future_events(db_events)
-        print(f"  Analyzing {len(db_events)} future events...")
-        analyses = ai_service.analyze_all_events(db_events)
+        print(f"  Waiting for analysis of {pipeline.submitted} future events...")
+        analyses = pipeline.finish()
+        pipeline = None
+        
+        # Step 7.5: Stored events this run didn't scrape keep a failed analysis otherwise
+        print("[7.5/10] Retry unanalyzed events...")
+        retry_events = ai_service.get_unanalyzed_events(exclude_ids=analyses)
+        if retry_events:
+            analyses.update(ai_service.analyze_all_events(
+                retry_events, classifier=classifier, signatures=signatures
+            ))
+        print(f"  ✓ {len(retry_events)} events retried")
+        log_entry["signature_reused"] = signatures.stats["reused"]
+        if classifier:
+            classifier_stats = classifier.get_stats_summary()
+            log_entry["local_classified"] = classifier_stats["bypassed"]
+            log_entry["local_agreement"] = classifier_stats["agreement"]
         
         # Step 8: Update events with AI analysis
         print("[8/10] Update DB with AI results...")
@@ -105,36 +143,52 @@ def scheduled_refresh_all_data():
         log_entry["events_analyzed"] = analyzed_count
         print(f"  ✓ Analyzed {analyzed_count} events")
         
-        # Step 9: Match events with weather
-        print("[9/10] Match with weather...")
-        data_processor.match_events_with_weather()
-        print("  ✓ Done")
+        # Step 8.5: Local forecasts for the grid cells the new events' venues fall in
+        print("[8.5/10] Venue weather...")
+        cell_weather = weather_service.fetch_cell_weather()
+        if cell_weather:
+            weather_service.save_weather_to_db(weather_data, cell_weather)
+        print(f"  ✓ {len(cell_weather)} venue grid cells")
         
-        # Step 10: Calculate recommendation scores
-        print("[10/10] Calculate scores...")
-        data_processor.update_all_recommendation_scores()
+        # Step 9: Match with weather and calculate scores (one vectorized batch)
+        print("[9/10] Score events...")
+        scoring_engine.score_all_events()
         print("  ✓ Done")
         
+        # Step 9.5: Materialise the serialized event feed visitors are served
+        print("[9.5/10] Event feed...")
+        refresh_event_feed()
+        
+        # Step 10: Precompute weekend suggestions for visitors
+        print("[10/10] Weekend suggestions...")
+        refresh_suggestions()
+        
         # Calculate duration
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
         
         # Update log with success
+        ai_usage = ai_session.get_session().get_usage_totals()
         log_entry["status"] = "success"
         log_entry["duration_seconds"] = duration
+        ai_session.write_usage_to_log(log_entry, ai_usage)
         
         print("\n" + "=" * 60)
         print(f"Data refresh completed successfully!")
         print(f"Duration: {duration:.1f} seconds")
         print(f"Events found: {saved_count}")
         print(f"Events analyzed: {analyzed_count}")
+        print(f"AI usage: {ai_usage['calls']} calls, "
+              f"{ai_usage['prompt_tokens']}+{ai_usage['completion_tokens']} tokens, "
+              f"{ai_usage['latency_seconds']:.1f}s, ~${ai_usage['cost_usd']:.4f}")
         print("=" * 60)
         
         return {
             "status": "success",
             "events_found": saved_count,
             "events_analyzed": analyzed_count,
-            "duration_seconds": duration
+            "duration_seconds": duration,
+            "ai_cost_usd": round(ai_usage["cost_usd"], 4)
         }
         
     except Exception as e:
@@ -142,12 +196,19 @@ def scheduled_refresh_all_data():
         error_message = str(e)
         print(f"\n❌ ERROR during data refresh: {error_message}")
         
+        if pipeline:
+            pipeline.cancel()
+        
+        # Events or scores may already have changed - don't keep serving the old feed
+        drop_event_feed()
+        
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
         
         log_entry["status"] = "failed"
         log_entry["error_message"] = error_message
         log_entry["duration_seconds"] = duration
+        ai_session.write_usage_to_log(log_entry)
         
         print("=" * 60)
         print(f"Data refresh failed after {duration:.1f} seconds")
@@ -167,11 +228,11 @@ def scheduled_refresh_weather_and_scores():
     the cost of full data refresh.
     
     Steps:
-    1. Delete old weather data
-    2. Fetch fresh weather forecast
-    3. Save weather to database
-    4. Match events with updated weather
-    5. Recalculate recommendation scores
+    1. Fetch fresh weather forecast (city-wide plus one per venue grid cell)
+    2. Save weather to database (swaps in the new forecast atomically)
+    3. Diff the new forecast against the previous one
+    4. Rescore only events in forecast slots that crossed a threshold
+    5. Rebuild the event feed (weather fields and warnings)
     
     Duration: 10-30 seconds
     API Costs: Only OpenWeather (free tier)
@@ -187,33 +248,41 @@ def scheduled_refresh_weather_and_scores():
     print("=" * 60 + "\n")
     
     try:
-        # Step 1: Clear old weather data
-        print("[1/5] Clearing old weather data...")
-        weather_count = 0
-        for row in app_tables.weather_forecast.search():
-            row.delete()
-            weather_count += 1
-        print(f"  ✓ Deleted {weather_count} old weather forecasts")
-        
-        # Step 2: Fetch fresh weather forecast
-        print("[2/5] Fetching fresh weather forecast...")
+        # Step 1: Fetch fresh weather forecast
+        # (old forecasts are replaced by the generation swap in step 2, so
+        # visitors never see an empty weather table)
+        print("[1/5] Fetching fresh weather forecast...")
         weather_data = weather_service.fetch_weekend_weather()
-        print(f"  ✓ Retrieved {len(weather_data)} days of weather")
-        
-        # Step 3: Save weather to database
-        print("[3/5] Saving weather to database...")
-        weather_service.save_weather_to_db(weather_data)
-        print(f"  ✓ Saved {len(weather_data)} weather forecasts")
-        
-        # Step 4: Match events with updated weather
-        print("[4/5] Matching events with weather...")
-        matched_count = data_processor.match_events_with_weather()
-        print(f"  ✓ Matched {matched_count} events with weather")
-        
-        # Step 5: Recalculate recommendation scores
-        print("[5/5] Recalculating recommendation scores...")
-        updated_count = data_processor.update_all_recommendation_scores()
-        print(f"  ✓ Updated {updated_count} recommendation scores")
+        cell_weather = weather_service.fetch_cell_weather()
+        print(f"  ✓ Retrieved {len(weather_data)} days of weather ({len(cell_weather)} venue grid cells)")
+        
+        # Step 2: Save weather to database (keeping the previous forecast to diff against)
+        print("[2/5] Saving weather to database...")
+        previous_index = weather_service.load_weather_index()
+        if weather_service.save_weather_to_db(weather_data, cell_weather):
+            print(f"  ✓ Saved {len(weather_data)} weather forecasts")
+        else:
+            print("  ✓ Stored forecast is current")
+        
+        # Step 3: Find forecast slots whose scoring bands changed
+        print("[3/5] Detecting forecast changes...")
+        weather_index = weather_service.load_weather_index()
+        changed_slots = weather_service.find_changed_weather_slots(previous_index, weather_index)
+        changed_days = len({slot_date for slot_date, _ in changed_slots})
+        print(f"  ✓ {len(changed_slots)} slots changed across {changed_days} days")
+        
+        # Step 4: Rescore only the affected events
+        print("[4/5] Rescoring affected events...")
+        updated_count = data_processor.rescore_changed_events(changed_slots, weather_index)
+        print(f"  ✓ Rescored {updated_count} events")
+        
+        # Step 5: Rebuild the event feed (every event shows the new forecast)
+        print("[5/5] Event feed...")
+        refresh_event_feed()
+        
+        # Step 5.5: Precompute weekend suggestions for visitors
+        print("[5.5/5] Weekend suggestions...")
+        refresh_suggestions()
         
         # Calculate duration
         end_time = datetime.now()
@@ -229,7 +298,7 @@ def scheduled_refresh_weather_and_scores():
         return {
             "status": "success",
             "weather_forecasts": len(weather_data),
-            "events_matched": matched_count,
+            "changed_slots": len(changed_slots),
             "scores_updated": updated_count,
             "duration_seconds": duration
         }
@@ -238,6 +307,9 @@ def scheduled_refresh_weather_and_scores():
         error_message = str(e)
         print(f"\n❌ ERROR during weather refresh: {error_message}")
         
+        # Scores may already have changed - don't keep serving the old feed
+        drop_event_feed()
+        
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
         
@@ -249,6 +321,50 @@ def scheduled_refresh_weather_and_scores():
         raise
 
 
+def refresh_event_feed():
+    """
+    Rebuild the materialised event feed after a refresh.
+    Failures are logged but never fail the refresh itself: the old feed
+    is dropped so get_all_events reads the events table instead.
+    """
+    try:
+        count = data_processor.build_event_feed()
+        print(f"  ✓ {count} events")
+    except Exception as e:
+        print(f"  ⚠️ Event feed build failed: {str(e)}")
+        drop_event_feed()
+
+
+def drop_event_feed():
+    """
+    Remove the materialised event feed so visitors are served from the
+    events table, e.g. once a refresh has saved new events (until the feed
+    is rebuilt) or when it failed before the rebuild. Bumps the data
+    version so clients holding the old feed fetch again.
+    """
+    try:
+        state_store.delete_state(data_processor.EVENT_FEED_KEY)
+        state_store.bump_data_version()
+        print("  Event feed dropped - serving events from the table")
+    except Exception as e:
+        print(f"  ⚠️ Could not drop event feed: {str(e)}")
+
+
+def refresh_suggestions():
+    """
+    Regenerate the cached weekend suggestions after a refresh.
+    Failures are logged but never fail the refresh itself.
+    """
+    try:
+        suggestions = ai_service.refresh_weekend_suggestions()
+        if suggestions:
+            print("  ✓ Suggestions ready")
+        else:
+            print("  ⚠️ No suggestions generated")
+    except Exception as e:
+        print(f"  ⚠️ Suggestions generation failed: {str(e)}")
+
+
 @anvil.server.callable
 def trigger_data_refresh():
     """
@@ -339,13 +455,22 @@ def get_refresh_status():
         "events_analyzed": last_log["events_analyzed"],
         "duration_seconds": last_log["duration_seconds"],
         "error_message": last_log["error_message"],
+        "ai_calls": last_log["ai_calls"],
+        "prompt_tokens": last_log["prompt_tokens"],
+        "completion_tokens": last_log["completion_tokens"],
+        "ai_latency_seconds": last_log["ai_latency_seconds"],
+        "ai_cost_usd": last_log["ai_cost_usd"],
+        "local_classified": last_log["local_classified"],
+        "local_agreement": last_log["local_agreement"],
+        "signature_reused": last_log["signature_reused"],
         "events_count": events_count,
         "recent_logs": [
             {
                 "run_date": log["run_date"],
                 "status": log["status"],
                 "events_found": log["events_found"],
-                "duration": log["duration_seconds"]
+                "duration": log["duration_seconds"],
+                "ai_cost_usd": log["ai_cost_usd"]
             }
             for log in recent_logs
         ]
@@ -448,6 +573,9 @@ def cleanup_old_data():
         if deleted_logs > 0:
             print(f"Deleted {deleted_logs} old scrape logs")
         
+        if deleted_junk or deleted_events or deleted_weather:
+            state_store.bump_data_version()
+        
         print("Data cleanup completed")
         
     except Exception as e:
@@ -11,6 +11,8 @@ TARGET_WEBSITE_URL = "https://ilovememphisblog.com/weekend"
 # OpenWeather API Configuration
 OPENWEATHER_API_VERSION = "3.0"
 OPENWEATHER_BASE_URL = "https://api.openweathermap.org/data/3.0/onecall"
+OPENWEATHER_CACHE_TTL = 1800  # seconds a fetched response is reused (force=True bypasses)
+OPENWEATHER_MAX_STALE_AGE = 21600  # seconds an older response may still stand in when a fetch fails
 
 # OpenAI models and parameters
 OPENAI_ANALYSIS_MODEL = "gpt-4.1-mini"  # Fast, cost-effective for data analysis
@@ -18,6 +20,36 @@ OPENAI_TEXT_MODEL = "gpt-4.1"  # High quality for user-facing text
 OPENAI_MAX_TOKENS = 500
 OPENAI_TEMPERATURE = 0.3  # Low for consistent categorization
 
+# OpenAI connection pool (shared client in ai_session)
+OPENAI_MAX_CONNECTIONS = 10
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 5
+OPENAI_TIMEOUT = 60  # seconds
+OPENAI_BASE_URL = None  # None = api.openai.com; set for OpenAI-compatible servers
+
+# OpenAI pricing (USD per 1M tokens) for cost estimates in scrape_log
+OPENAI_PRICING = {
+    "gpt-4.1-mini": {"prompt": 0.40, "completion": 1.60},
+    "gpt-4.1": {"prompt": 2.00, "completion": 8.00}
+}
+
+# Local pre-classifier (skips the LLM for confidently classified events)
+LOCAL_CLASSIFIER_ENABLED = True
+LOCAL_CLASSIFIER_MIN_TRAINING = 50     # Labels needed before the classifier is used
+LOCAL_CLASSIFIER_MIN_CONFIDENCE = 0.85 # Predictions below this go to the LLM
+LOCAL_CLASSIFIER_AUDIT_RATE = 0.1      # Share of confident predictions still checked by the LLM
+LOCAL_CLASSIFIER_EPOCHS = 10
+LOCAL_CLASSIFIER_LEARNING_RATE = 0.5
+LOCAL_CLASSIFIER_L2 = 0.0001
+
+# Recurring Events (labels reused by normalized title + venue signature)
+RECURRING_EVENT_MIN_SIMILARITY = 0.8  # Description similarity needed to reuse a label
+RECURRING_EVENT_MAX_AGE_DAYS = 90     # Older labels are re-checked by the LLM
+
+# Weekend suggestions (cached in app_state, regenerated when stale)
+SUGGESTIONS_TOP_EVENTS = 15  # Events included in the suggestions prompt
+SUGGESTIONS_GENERATION_TIMEOUT = 120  # seconds before a generation claim is abandoned
+SUGGESTIONS_STREAM_PUBLISH_INTERVAL = 0.2  # seconds between partial-text updates to task state
+
 # Firecrawl Configuration
 FIRECRAWL_TIMEOUT = 60  # seconds
 FIRECRAWL_FORMATS = ["markdown"]
@@ -41,6 +73,25 @@ CATEGORIES = [
     "Shopping", "Educational", "Community Events", "Other"
 ]
 
+# Default event durations (hours) by category, used for the weather window
+# when an event has no end time; events with several categories use the longest
+EVENT_DURATION_HOURS = {
+    "Arts": 2,
+    "Music": 3,
+    "Sports": 3,
+    "Food & Drink": 3,
+    "Outdoor Activities": 3,
+    "Cultural Events": 3,
+    "Theater/Performance": 2,
+    "Family/Kids": 2,
+    "Nightlife": 4,
+    "Shopping": 3,
+    "Educational": 2,
+    "Community Events": 4,
+    "Other": 2
+}
+DEFAULT_EVENT_DURATION_HOURS = 2
+
 # Audience Types
 AUDIENCE_TYPES = ["adults", "family-friendly", "all-ages"]
 
@@ -75,6 +126,33 @@ WIND_THRESHOLDS = {
     "windy": 20         # > 20 mph
 }
 
+# Weather score penalties (points off 100 for outdoor events), by the
+# threshold they apply past; used by weather_service and scoring_engine
+PRECIP_PENALTIES = {
+    "high": 40,     # > high threshold
+    "medium": 20,   # > medium threshold
+    "low": 10       # > low threshold
+}
+TEMP_PENALTIES = {
+    "too_cold": 30,
+    "cold": 15,
+    "too_hot": 30,
+    "hot": 15
+}
+WIND_PENALTIES = {
+    "windy": 15,
+    "breezy": 5
+}
+
+# Weather warning thresholds (outdoor event warnings shown to visitors)
+WARNING_THRESHOLDS = {
+    "rain_high": 70,      # > 70% = "High chance of rain"
+    "rain_possible": 40,  # > 40% = "Possible rain"
+    "very_cold": 40,      # Feels like below 40°F
+    "very_hot": 95,       # Feels like above 95°F
+    "windy": 20           # > 20 mph
+}
+
 # Data Retention (days)
 DATA_RETENTION = {
     "events": 7,        # Keep events for 1 week
@@ -82,6 +160,16 @@ DATA_RETENTION = {
     "scrape_log": 30    # Keep logs for 30 days
 }
 
+# Weather storage: rows per add_rows call when saving a forecast generation
+WEATHER_WRITE_BATCH_SIZE = 100
+
+# Local weather: venues are geocoded (cached in venue_geocodes) and snapped
+# to a grid; one forecast is fetched per occupied cell besides the city-wide one
+GEOCODER = "gazetteer"          # Entry in geocoding.GEOCODERS (offline Memphis gazetteer)
+GEOCODE_MISS_RETRY_DAYS = 7     # Unplaced locations are geocoded again after this
+WEATHER_GRID_DEGREES = 0.1      # Cell size (~11 km north-south, ~9 km east-west)
+WEATHER_MAX_GRID_CELLS = 6      # Cap on extra forecasts per refresh (busiest cells first)
+
 # Background Task Configuration
 BACKGROUND_TASK_TIMEOUT = 600  # 10 minutes in seconds
 BACKGROUND_TASK_SCHEDULE = "Weekly on Monday at 6:00 AM"
@@ -91,6 +179,32 @@ OPENAI_RATE_LIMIT_DELAY = 0.5  # seconds between API calls
 OPENAI_MAX_RETRIES = 3
 OPENAI_RETRY_DELAY = 2  # seconds
 
+# Scrape → Analyse Pipeline
+# Events are analyzed by worker threads while the remaining event pages are
+# still being scraped. The rate-limit delay applies per worker.
+ANALYSIS_PIPELINE_WORKERS = 3
+ANALYSIS_QUEUE_SIZE = 20  # Scraper waits when this many events are queued
+
+# Circuit Breakers and Bulkheads (per external provider)
+# A circuit opens when failure_rate of the last `window` calls have failed
+# (once at least min_calls were made), rejects calls for open_seconds, then
+# lets one trial call through. max_concurrent caps simultaneous calls;
+# bulkhead_wait is how long a call waits for a free slot.
+CIRCUIT_BREAKERS = {
+    "openai": {
+        "failure_rate": 0.5, "window": 10, "min_calls": 4, "open_seconds": 60,
+        "max_concurrent": 4, "bulkhead_wait": 30
+    },
+    "firecrawl": {
+        "failure_rate": 0.5, "window": 10, "min_calls": 3, "open_seconds": 120,
+        "max_concurrent": 2, "bulkhead_wait": 60
+    },
+    "openweather": {
+        "failure_rate": 0.5, "window": 6, "min_calls": 2, "open_seconds": 120,
+        "max_concurrent": 2, "bulkhead_wait": 30
+    }
+}
+
 # Logging Configuration
 LOG_LEVEL = "INFO"
 
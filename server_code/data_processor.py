@@ -4,65 +4,83 @@ Handles event-weather matching and recommendation scoring.
 """
 
 import anvil.server
+import anvil.tables.query as q
 from anvil.tables import app_tables
-from datetime import datetime
+from datetime import date, datetime
+import time
 
 from . import config
 from . import weather_service
+from . import state_store
 
 
-def match_events_with_weather():
+# app_state key of the materialised event feed (see build_event_feed)
+EVENT_FEED_KEY = "event_feed"
+
+# Sort orders the feed is materialised for (get_all_events sort_by values)
+FEED_SORT_ORDERS = ("recommendation", "time", "cost")
+
+
+def rescore_changed_events(changed_slots, weather_index):
     """
-    Match all events with their corresponding weather forecasts
-    and calculate weather scores.
+    Recompute weather and recommendation scores only for events whose
+    time window covers a forecast slot that changed.
     
+    Args:
+        changed_slots: Set of (date, hour) from weather_service.find_changed_weather_slots
+        weather_index: WeatherIndex of the new forecast
+        
     Returns:
-        int: Number of events processed
+        int: Number of events rescored
     """
-    print("Matching events with weather data...")
+    changed_dates = {slot_date for slot_date, _ in changed_slots}
+    if not changed_dates:
+        print("No forecast slots changed - no events to rescore")
+        return 0
+    
+    print(f"Rescoring events in {len(changed_slots)} changed forecast slots...")
     
-    processed_count = 0
+    rescored_count = 0
+    band_table = weather_service.get_band_table()
     
     try:
-        # Get all events from database
-        events = app_tables.events.search()
-        
-        for event in events:
-            # Get weather for event date
-            weather_data = weather_service.get_weather_for_datetime(
-                event["date"],
-                event["start_time"]
-            )
+        for event in app_tables.events.search(date=q.any_of(*changed_dates)):
+            start_time = event["start_time"]
+            event_hour = None
+            if start_time and start_time != "TBD":
+                event_hour = weather_index.event_hour(start_time)
+            end_hour = weather_index.event_end_hour(event_hour, event["end_time"], event["categories"])
+            
+            # Window scores only move when one of the window's hours changed band
+            window_hours = [None] if event_hour is None else range(event_hour, end_hour)
+            if not any((event["date"], hour) in changed_slots for hour in window_hours):
+                continue
             
+            event_index = weather_index.for_location(event["location"])
+            weather_data = event_index.get_weather_for_window(event["date"], event_hour, end_hour)
             if weather_data:
-                # Calculate weather score
                 event_data = {
                     "is_outdoor": event["is_outdoor"],
                     "is_indoor": event["is_indoor"],
                     "date": event["date"],
-                    "start_time": event["start_time"]
+                    "start_time": start_time
                 }
-                
-                weather_score = weather_service.calculate_weather_score(
-                    event_data,
-                    weather_data
-                )
-                
-                # Update event with weather score
-                event["weather_score"] = weather_score
-                
-                processed_count += 1
+                weather_score = weather_service.calculate_weather_score(event_data, weather_data, band_table)
             else:
-                print(f"No weather data found for event: {event['title']} on {event['date']}")
-                # Assign neutral score if no weather data
-                event["weather_score"] = 50
-                processed_count += 1
+                # Date dropped out of the forecast - neutral score
+                weather_score = 50
+            
+            event["weather_score"] = weather_score
+            event["recommendation_score"] = calculate_recommendation_score(event)
+            rescored_count += 1
         
-        print(f"Processed weather matching for {processed_count} events")
-        return processed_count
+        print(f"Rescored {rescored_count} events")
+        if rescored_count:
+            state_store.bump_data_version()
+        return rescored_count
         
     except Exception as e:
-        print(f"Error matching events with weather: {str(e)}")
+        print(f"Error rescoring events: {str(e)}")
         raise
 
 
@@ -117,8 +135,33 @@ def calculate_time_of_day_bonus(start_time):
     Returns:
         int: Bonus points (0-30)
     """
+    hour = parse_bonus_hour(start_time)
+    if hour is None:
+        return 15  # Neutral bonus (no time, TBD or unparseable)
+    
+    # Score based on time
+    if 17 <= hour <= 21:  # 5 PM - 9 PM
+        return 30  # Peak outdoor evening time
+    elif 14 <= hour <= 17 or 21 <= hour <= 23:  # 2-5 PM or 9-11 PM
+        return 20  # Good time
+    elif 10 <= hour <= 14:  # 10 AM - 2 PM
+        return 15  # Daytime
+    else:
+        return 10  # Early morning or late night
+
+
+def parse_bonus_hour(start_time):
+    """
+    Parse the start hour used for the time-of-day bonus.
+    
+    Args:
+        start_time: Time string (e.g., "3:00 PM")
+        
+    Returns:
+        int: Hour in 24-hour format, or None if missing, TBD or unparseable
+    """
     if not start_time or start_time == "TBD":
-        return 15  # Neutral bonus
+        return None
     
     try:
         # Parse time
@@ -134,70 +177,29 @@ def calculate_time_of_day_bonus(start_time):
             if hour == 12:
                 hour = 0
         
-        # Score based on time
-        if 17 <= hour <= 21:  # 5 PM - 9 PM
-            return 30  # Peak outdoor evening time
-        elif 14 <= hour <= 17 or 21 <= hour <= 23:  # 2-5 PM or 9-11 PM
-            return 20  # Good time
-        elif 10 <= hour <= 14:  # 10 AM - 2 PM
-            return 15  # Daytime
-        else:
-            return 10  # Early morning or late night
+        return hour
         
     except:
-        return 15  # Default if parsing fails
-
-
-def update_all_recommendation_scores():
-    """
-    Calculate and update recommendation scores for all events.
-    
-    Returns:
-        int: Number of events updated
-    """
-    print("Calculating recommendation scores for all events...")
-    
-    updated_count = 0
-    
-    try:
-        events = app_tables.events.search()
-        
-        for event in events:
-            score = calculate_recommendation_score(event)
-            event["recommendation_score"] = score
-            updated_count += 1
-        
-        print(f"Updated recommendation scores for {updated_count} events")
-        return updated_count
-        
-    except Exception as e:
-        print(f"Error updating recommendation scores: {str(e)}")
-        raise
+        return None  # Default if parsing fails
 
 
-def get_weather_warning(event):
+def get_weather_warning(event, weather_data, band_table=None):
     """
     Generate weather warning message for outdoor events.
     Uses event-time specific hourly forecast when available.
+    Warning levels come from the same band table as the weather score
+    (thresholds in config.WARNING_THRESHOLDS).
     
     Args:
         event: Event row from database
+        weather_data: The event's weather, as resolved by the caller
+                      (e.g., WeatherIndex.get_event_weather), or None
+        band_table: Optional WeatherBandTable (fetched once by batch callers)
         
     Returns:
         str: Warning message or None if no warning needed
     """
-    if not event["is_outdoor"]:
-        return None
-    
-    weather_score = event["weather_score"] if event["weather_score"] is not None else 100
-    
-    # Get weather details (with hourly data if available)
-    weather_data = weather_service.get_weather_for_datetime(
-        event["date"],
-        event["start_time"]
-    )
-    
-    if not weather_data:
+    if not event["is_outdoor"] or not weather_data:
         return None
     
     warnings = []
@@ -211,26 +213,31 @@ def get_weather_warning(event):
     wind = weather_values["wind_speed"]
     is_hourly = weather_values["is_hourly"]
     
+    band_table = band_table or weather_service.get_band_table()
+    precip_band, temp_band, wind_band = band_table.bands(weather_values)
+    
     # Check precipitation
-    if precip > 70:
+    precip_warning = band_table.precip_warnings[precip_band]
+    if precip_warning == "high":
         warnings.append(f"High chance of rain ({int(precip)}%)")
-    elif precip > 40:
+    elif precip_warning == "possible":
         warnings.append(f"Possible rain ({int(precip)}%)")
     
     # Check temperature (using feels-like)
-    if feels_like < 40:
+    temp_warning = band_table.temp_warnings[temp_band]
+    if temp_warning == "cold":
         if is_hourly and feels_like != temp:
             warnings.append(f"Very cold (feels like {int(feels_like)}°F)")
         else:
             warnings.append(f"Very cold ({int(feels_like)}°F)")
-    elif feels_like > 95:
+    elif temp_warning == "hot":
         if is_hourly and feels_like != temp:
             warnings.append(f"Very hot (feels like {int(feels_like)}°F)")
         else:
             warnings.append(f"Very hot ({int(feels_like)}°F)")
     
     # Check wind
-    if wind > 20:
+    if band_table.wind_warnings[wind_band]:
         warnings.append(f"Windy conditions ({int(wind)} mph)")
     
     if warnings:
@@ -306,35 +313,52 @@ def get_filtered_events(filters=None):
 
 
 @anvil.server.callable
-def get_all_events(sort_by="recommendation"):
+def get_all_events(sort_by="recommendation", known_version=None):
     """Get all future events from database.
     
+    Served from the materialised feed built at the end of each refresh
+    (one app_state read, then only the "still in the future" cut); falls
+    back to reading and serializing the events table when there is no
+    feed for this sort order.
+    
+    Clients pass the version token of the copy they hold ("" for none).
+    Events only drop out of the list as they start while the data version
+    is unchanged, so the version plus the event count identifies the list.
+    
     Args:
         sort_by: Sort criteria ("recommendation", "time", "cost")
+        known_version: Optional version token from an earlier response
         
     Returns:
-        list: List of event dictionaries
+        list: List of event dictionaries, or with known_version a
+              state_store.versioned_response() with the list under "events"
     """
     try:
         from . import date_utils
         
-        # Use fetch_only for performance - only get needed columns
-        events = list(app_tables.events.search())
-        print(f"Found {len(events)} total events in database")
+        # Read the version first - a write after this makes the next call refetch
+        data_version = state_store.get_data_version() if known_version is not None else None
         
-        # Filter to only future events
-        events = date_utils.filter_future_events(events)
+        feed = state_store.get_state(EVENT_FEED_KEY)
+        if feed and sort_by in feed["orders"]:
+            events = read_event_feed(feed, sort_by)
+        else:
+            # Use fetch_only for performance - only get needed columns
+            events = list(app_tables.events.search())
+            print(f"Found {len(events)} total events in database")
+            
+            # Filter to only future events
+            events = date_utils.filter_future_events(events)
+            
+            sort_events(events, sort_by)
+            
+            events = serialize_events(events)
         
-        # Sort events
-        if sort_by == "recommendation":
-            events.sort(key=lambda e: e["recommendation_score"] or 0, reverse=True)
-        elif sort_by == "time":
-            events.sort(key=lambda e: (e["date"] or datetime.max.date(), e["start_time"] or "ZZZ"))
-        elif sort_by == "cost":
-            cost_order = {"Free": 0, "$": 1, "$$": 2, "$$$": 3, "$$$$": 4}
-            events.sort(key=lambda e: cost_order.get(e["cost_level"] or "$", 5))
+        if known_version is None:
+            return events
         
-        return serialize_events(events)
+        version = f"{sort_by}:{data_version}:{len(events)}"
+        return state_store.versioned_response(version, known_version, events=events)
     except Exception as e:
         print(f"Error in get_all_events: {e}")
         import traceback
@@ -342,38 +366,147 @@ def get_all_events(sort_by="recommendation"):
         raise
 
 
-def serialize_events(events):
+def sort_events(events, sort_by):
+    """
+    Sort events in place for a sort order.
+    
+    Args:
+        events: List of event rows (or dicts with the same keys)
+        sort_by: Sort criteria ("recommendation", "time", "cost"); others leave the order unchanged
+    """
+    if sort_by == "recommendation":
+        events.sort(key=lambda e: e["recommendation_score"] or 0, reverse=True)
+    elif sort_by == "time":
+        events.sort(key=lambda e: (e["date"] or datetime.max.date(), e["start_time"] or "ZZZ"))
+    elif sort_by == "cost":
+        cost_order = {"Free": 0, "$": 1, "$$": 2, "$$$": 3, "$$$$": 4}
+        events.sort(key=lambda e: cost_order.get(e["cost_level"] or "$", 5))
+
+
+def build_event_feed():
+    """
+    Materialise the event feed served by get_all_events.
+    
+    Serializes every future event once (weather fields and warnings
+    included) and records the event order for each of FEED_SORT_ORDERS,
+    all stored as one app_state document. Called at the end of each
+    refresh, after scores are final. A feed identical to the stored one
+    is not rewritten, so the data version only moves when visitors would
+    see a difference.
+    
+    Returns:
+        int: Number of events in the feed
+    """
+    from . import date_utils
+    
+    print("Building event feed...")
+    
+    weather_index = weather_service.load_weather_index()
+    
+    # Serialized one at a time so rows and dictionaries stay aligned
+    # (serialize_events skips events it can't serialize)
+    rows = []
+    serialized = []
+    for event in date_utils.filter_future_events(list(app_tables.events.search())):
+        for event_dict in serialize_events([event], weather_index):
+            rows.append(event)
+            serialized.append(event_dict)
+    
+    positions = {id(event): i for i, event in enumerate(rows)}
+    orders = {}
+    for sort_by in FEED_SORT_ORDERS:
+        ordered = list(rows)
+        sort_events(ordered, sort_by)
+        orders[sort_by] = [positions[id(event)] for event in ordered]
+    
+    feed = {
+        # Dates as ISO strings (SimpleObject holds JSON values only)
+        "events": [dict(event_dict, date=event_dict["date"].isoformat()) for event_dict in serialized],
+        "start_times": [event["start_time"] for event in rows],
+        "orders": orders
+    }
+    
+    stored = state_store.get_state(EVENT_FEED_KEY)
+    if stored and all(stored.get(key) == value for key, value in feed.items()):
+        print(f"Event feed unchanged ({len(rows)} events)")
+        return len(rows)
+    
+    state_store.set_state(EVENT_FEED_KEY, dict(feed, built_at=time.time()))
+    state_store.bump_data_version()
+    
+    print(f"Event feed ready ({len(rows)} events)")
+    return len(rows)
+
+
+def read_event_feed(feed, sort_by):
+    """
+    Read one sort order of the materialised feed, dropping events that
+    have started since it was built.
+    
+    Args:
+        feed: Feed document from build_event_feed()
+        sort_by: One of FEED_SORT_ORDERS
+        
+    Returns:
+        list: Event dictionaries, as from serialize_events
+    """
+    from . import date_utils
+    
+    events = feed["events"]
+    start_times = feed["start_times"]
+    
+    visible = []
+    for i in feed["orders"][sort_by]:
+        event_date = date.fromisoformat(events[i]["date"])
+        if date_utils.is_event_in_future(event_date, start_times[i]):
+            visible.append(dict(events[i], date=event_date))
+    
+    return visible
+
+
+def serialize_events(events, weather_index=None):
     """
     Convert event rows to dictionaries for client consumption.
     Includes event-time specific weather forecast data.
     
+    Each event's weather is looked up once and shared by the weather
+    fields and the warning text. It is the same window weather the event
+    is scored with (WeatherIndex.get_event_weather): temperature and
+    conditions of the start hour, rain chance and warnings from the worst
+    hour the event runs.
+    
     Args:
         events: List of event rows
+        weather_index: Optional WeatherIndex (loaded once here if not given)
         
     Returns:
         list: List of event dictionaries with weather info
     """
     serialized = []
     
+    # Load the forecast once instead of querying it for every event
+    weather_index = weather_index or weather_service.load_weather_index()
+    band_table = weather_service.get_band_table()
+    
     for event in events:
         try:
-            # Get event-time specific weather
-            event_weather = None
+            # Weather over the event's hours (daily forecast without a start time)
+            weather_data = None
             weather_temp = None
             weather_precip = None
             weather_conditions = None
+            weather_is_hourly = False
             
-            if event["date"] and event["start_time"]:
-                weather_data = weather_service.get_weather_for_datetime(
-                    event["date"],
-                    event["start_time"]
-                )
+            if event["date"]:
+                weather_data = weather_index.get_event_weather(event)
                 
-                if weather_data:
+                # Weather fields are shown for timed events only
+                if weather_data and event["start_time"]:
                     weather_values = weather_service.get_best_weather_values(weather_data)
                     weather_temp = int(weather_values["temp"])
                     weather_precip = int(weather_values["precipitation_chance"])
                     weather_conditions = weather_values["conditions"]
+                    weather_is_hourly = weather_values["is_hourly"]
             
             serialized.append({
                 "event_id": event["event_id"],
@@ -392,11 +525,12 @@ def serialize_events(events):
                 "categories": event["categories"] or [],
                 "weather_score": event["weather_score"] or 0,
                 "recommendation_score": event["recommendation_score"] or 0,
-                "weather_warning": get_weather_warning(event),
+                "weather_warning": get_weather_warning(event, weather_data, band_table),
                 # Event-time specific weather forecast
                 "weather_temp": weather_temp,
                 "weather_precip": weather_precip,
-                "weather_conditions": weather_conditions
+                "weather_conditions": weather_conditions,
+                "weather_is_hourly": weather_is_hourly
             })
         except Exception as e:
             print(f"Error serializing event {event.get_id()}: {e}")
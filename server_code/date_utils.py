@@ -32,6 +32,35 @@ def get_current_central_date():
     return get_current_central_time().date()
 
 
+def get_event_start_central(event_date, event_time_str):
+    """
+    Get an event's start as a timezone-aware Central Time datetime.
+    
+    Args:
+        event_date: date object or datetime object
+        event_time_str: Time string (e.g., "7:00 PM", "2:30 PM")
+        
+    Returns:
+        datetime: Localized start datetime, or None if the time can't be parsed
+    """
+    if not event_date or not event_time_str:
+        return None
+    
+    if isinstance(event_date, datetime):
+        event_date = event_date.date()
+    
+    for fmt in ["%I:%M %p", "%H:%M", "%I %p", "%I:%M%p"]:
+        try:
+            event_time = datetime.strptime(event_time_str.strip(), fmt).time()
+            break
+        except ValueError:
+            continue
+    else:
+        return None
+    
+    return CENTRAL_TZ.localize(datetime.combine(event_date, event_time))
+
+
 def is_event_in_future(event_date, event_time_str=None):
     """
     Check if an event is in the future (Central Time).
@@ -67,23 +96,12 @@ def is_event_in_future(event_date, event_time_str=None):
     
     # Parse the time string
     try:
-        # Try common formats
-        for fmt in ["%I:%M %p", "%H:%M", "%I %p", "%I:%M%p"]:
-            try:
-                event_time = datetime.strptime(event_time_str.strip(), fmt).time()
-                break
-            except ValueError:
-                continue
-        else:
+        event_datetime_central = get_event_start_central(event_date, event_time_str)
+        
+        if event_datetime_central is None:
             # Couldn't parse time, assume whole day
             return event_date >= now_central.date()
         
-        # Combine date and time
-        event_datetime = datetime.combine(event_date, event_time)
-        
-        # Make it timezone-aware (Central Time)
-        event_datetime_central = CENTRAL_TZ.localize(event_datetime)
-        
         # Compare with current Central time
         return event_datetime_central > now_central
         
@@ -0,0 +1,542 @@
+"""
+Local event classifier for This Weekend app.
+Predicts the AI analysis fields from event text so confident events can skip the LLM.
+
+Model:
+- TF-IDF over title, description, location and cost words (pure Python, sparse dicts)
+- One-vs-rest logistic regression per label, trained with SGD on the labels
+  accumulated in the event_labels table from earlier AI analyses
+
+Each prediction carries a confidence (the least certain of its fields).
+Only events at or above LOCAL_CLASSIFIER_MIN_CONFIDENCE bypass the LLM;
+a small audit sample of confident events still goes to the LLM so the
+agreement rate of bypassed predictions can be reported per run.
+
+The event_labels table doubles as a long-lived store of event signatures
+(normalized title + venue). A recurring event whose description is still
+similar to the one last labeled inherits that label without an LLM call
+(SignatureStore), even though last week's events row has been cleaned up.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+import math
+import random
+import re
+import threading
+
+from . import config
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9$]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+    "is", "it", "its", "of", "on", "or", "the", "this", "to", "with", "will",
+    "you", "your", "our", "we", "all", "more", "p", "m", "pm", "am"
+}
+
+BINARY_FIELDS = ["is_indoor", "is_outdoor"]
+COST_LEVELS = ["Free", "$", "$$", "$$$", "$$$$"]
+
+
+def normalize_signature(title, location):
+    """
+    Build a normalized title+venue signature for an event.
+
+    Args:
+        title: Event title
+        location: Event location/venue
+
+    Returns:
+        str: Signature like "trivia night|railgarten"
+    """
+    def clean(text):
+        words = TOKEN_PATTERN.findall((text or "").lower().replace("$", ""))
+        return " ".join(words)
+
+    return f"{clean(title)}|{clean(location)}"
+
+
+def tokenize(text):
+    """
+    Split text into lowercase word and bigram tokens.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        list: Tokens
+    """
+    words = [w for w in TOKEN_PATTERN.findall((text or "").lower()) if w not in STOPWORDS]
+    bigrams = [f"{a}_{b}" for a, b in zip(words, words[1:])]
+    return words + bigrams
+
+
+def event_tokens(event):
+    """
+    Tokenize the fields of an event used for classification.
+    Title and location tokens are prefixed so they carry their own weights.
+
+    Args:
+        event: Event dictionary with title, description, location, cost_raw
+
+    Returns:
+        list: Tokens
+    """
+    tokens = []
+    tokens += ["t:" + t for t in tokenize(event.get("title"))]
+    tokens += tokenize(event.get("description"))
+    tokens += ["l:" + t for t in tokenize(event.get("location"))]
+    tokens += ["c:" + t for t in tokenize(event.get("cost_raw"))]
+    return tokens
+
+
+def description_similarity(text_a, text_b):
+    """
+    Cosine similarity between the word/bigram counts of two descriptions.
+
+    Args:
+        text_a: First description
+        text_b: Second description
+
+    Returns:
+        float: 0 (nothing in common) to 1 (same words)
+    """
+    counts_a = Counter(tokenize(text_a))
+    counts_b = Counter(tokenize(text_b))
+    if not counts_a and not counts_b:
+        return 1.0
+    if not counts_a or not counts_b:
+        return 0.0
+
+    dot = sum(count * counts_b.get(token, 0) for token, count in counts_a.items())
+    norm_a = math.sqrt(sum(c * c for c in counts_a.values()))
+    norm_b = math.sqrt(sum(c * c for c in counts_b.values()))
+    return dot / (norm_a * norm_b)
+
+
+def _sigmoid(z):
+    """Numerically safe logistic function."""
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    ez = math.exp(z)
+    return ez / (1.0 + ez)
+
+
+class TfidfVectorizer:
+    """Minimal TF-IDF vectorizer producing L2-normalized sparse dicts."""
+
+    def __init__(self):
+        self.idf = {}
+
+
+    def fit(self, token_lists):
+        """Compute smoothed IDF weights from tokenized documents."""
+        doc_freq = {}
+        for tokens in token_lists:
+            for token in set(tokens):
+                doc_freq[token] = doc_freq.get(token, 0) + 1
+
+        n_docs = len(token_lists)
+        self.idf = {
+            token: math.log((1 + n_docs) / (1 + df)) + 1
+            for token, df in doc_freq.items()
+        }
+        return self
+
+
+    def transform(self, tokens):
+        """Convert one token list to a normalized TF-IDF vector (dict)."""
+        counts = {}
+        for token in tokens:
+            if token in self.idf:
+                counts[token] = counts.get(token, 0) + 1
+
+        vector = {token: count * self.idf[token] for token, count in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        if norm:
+            vector = {token: v / norm for token, v in vector.items()}
+        return vector
+
+
+class BinaryLogisticModel:
+    """L2-regularized logistic regression on sparse vectors, trained with SGD."""
+
+    def __init__(self):
+        self.weights = {}
+        self.bias = 0.0
+
+
+    def fit(self, vectors, targets, epochs, learning_rate, l2, rng):
+        """
+        Train on (vector, 0/1 target) pairs.
+
+        Args:
+            vectors: List of sparse vectors
+            targets: List of 0/1 targets
+            epochs: Passes over the data
+            learning_rate: Initial SGD step size
+            l2: L2 regularization strength
+            rng: random.Random used to shuffle
+        """
+        order = list(range(len(vectors)))
+        positive_rate = sum(targets) / len(targets) if targets else 0.5
+        positive_rate = min(max(positive_rate, 0.01), 0.99)
+        self.bias = math.log(positive_rate / (1 - positive_rate))
+
+        for epoch in range(epochs):
+            rng.shuffle(order)
+            rate = learning_rate / (1 + epoch)
+            for i in order:
+                vector = vectors[i]
+                error = targets[i] - self.predict_proba(vector)
+                self.bias += rate * error
+                for token, value in vector.items():
+                    w = self.weights.get(token, 0.0)
+                    self.weights[token] = w + rate * (error * value - l2 * w)
+        return self
+
+
+    def predict_proba(self, vector):
+        """Probability of the positive class."""
+        z = self.bias
+        for token, value in vector.items():
+            z += self.weights.get(token, 0.0) * value
+        return _sigmoid(z)
+
+
+class EventClassifier:
+    """
+    Predicts is_indoor, is_outdoor, audience_type, categories and cost_level.
+
+    Also keeps per-run statistics: how many events bypassed the LLM and how
+    often local predictions agreed with the LLM where both are known.
+    """
+
+    def __init__(self):
+        self.vectorizer = TfidfVectorizer()
+        self.binary_models = {}
+        self.audience_models = {}
+        self.cost_models = {}
+        self.category_models = {}
+        self.training_size = 0
+        self._rng = random.Random(42)
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+
+    def train(self, labeled_events):
+        """
+        Train all label models.
+
+        Args:
+            labeled_events: List of dicts with the event text fields and
+                            the AI analysis fields
+
+        Returns:
+            EventClassifier: self
+        """
+        token_lists = [event_tokens(e) for e in labeled_events]
+        self.vectorizer.fit(token_lists)
+        vectors = [self.vectorizer.transform(tokens) for tokens in token_lists]
+        self.training_size = len(labeled_events)
+
+        def fit(targets):
+            return BinaryLogisticModel().fit(
+                vectors, targets,
+                epochs=config.LOCAL_CLASSIFIER_EPOCHS,
+                learning_rate=config.LOCAL_CLASSIFIER_LEARNING_RATE,
+                l2=config.LOCAL_CLASSIFIER_L2,
+                rng=self._rng
+            )
+
+        for field in BINARY_FIELDS:
+            self.binary_models[field] = fit([1 if e.get(field) else 0 for e in labeled_events])
+
+        for audience in config.AUDIENCE_TYPES:
+            self.audience_models[audience] = fit(
+                [1 if e.get("audience_type") == audience else 0 for e in labeled_events]
+            )
+
+        for cost_level in COST_LEVELS:
+            self.cost_models[cost_level] = fit(
+                [1 if e.get("cost_level") == cost_level else 0 for e in labeled_events]
+            )
+
+        for category in config.CATEGORIES:
+            self.category_models[category] = fit(
+                [1 if category in (e.get("categories") or []) else 0 for e in labeled_events]
+            )
+
+        return self
+
+
+    def predict(self, event):
+        """
+        Predict the analysis fields for one event.
+
+        Args:
+            event: Event dictionary with title, description, location, cost_raw
+
+        Returns:
+            tuple: (analysis dict, confidence 0-1)
+        """
+        vector = self.vectorizer.transform(event_tokens(event))
+        analysis = {}
+        confidences = []
+
+        for field, model in self.binary_models.items():
+            p = model.predict_proba(vector)
+            analysis[field] = p >= 0.5
+            confidences.append(max(p, 1 - p))
+
+        for field, models in [("audience_type", self.audience_models), ("cost_level", self.cost_models)]:
+            scores = {label: model.predict_proba(vector) for label, model in models.items()}
+            total = sum(scores.values()) or 1.0
+            best = max(scores, key=scores.get)
+            analysis[field] = best
+            confidences.append(scores[best] / total)
+
+        category_probs = {c: m.predict_proba(vector) for c, m in self.category_models.items()}
+        ranked = sorted(category_probs, key=category_probs.get, reverse=True)
+        chosen = [c for c in ranked[:3] if category_probs[c] >= 0.5] or ranked[:1]
+        analysis["categories"] = chosen
+        confidences.append(min(max(p, 1 - p) for p in category_probs.values()))
+
+        return analysis, min(confidences)
+
+
+    def reset_stats(self):
+        """Clear the per-run statistics."""
+        self.stats = {
+            "predicted": 0,
+            "bypassed": 0,
+            "compared": 0,
+            "agreed": 0,
+            "audited": 0,
+            "audit_agreed": 0
+        }
+
+
+    def should_bypass(self, confidence):
+        """
+        Decide whether a prediction is confident enough to skip the LLM.
+        A random audit sample of confident predictions is still sent to the
+        LLM to measure how often bypassed predictions would have agreed.
+
+        Args:
+            confidence: Prediction confidence (0-1)
+
+        Returns:
+            tuple: (bypass, audit) booleans
+        """
+        with self._stats_lock:
+            self.stats["predicted"] += 1
+            if confidence < config.LOCAL_CLASSIFIER_MIN_CONFIDENCE:
+                return False, False
+
+            if self._rng.random() < config.LOCAL_CLASSIFIER_AUDIT_RATE:
+                return False, True
+
+            self.stats["bypassed"] += 1
+            return True, False
+
+
+    def record_comparison(self, local_analysis, ai_analysis, audited=False):
+        """
+        Record whether a local prediction agreed with the LLM.
+        Agreement requires indoor/outdoor, audience and cost to match and
+        the primary category to be among the LLM's categories.
+
+        Args:
+            local_analysis: Local prediction
+            ai_analysis: Validated LLM analysis
+            audited: True if this was a confident prediction sent for audit
+        """
+        agreed = (
+            all(local_analysis[f] == ai_analysis.get(f) for f in BINARY_FIELDS) and
+            local_analysis["audience_type"] == ai_analysis.get("audience_type") and
+            local_analysis["cost_level"] == ai_analysis.get("cost_level") and
+            local_analysis["categories"][0] in (ai_analysis.get("categories") or [])
+        )
+
+        with self._stats_lock:
+            self.stats["compared"] += 1
+            self.stats["agreed"] += int(agreed)
+            if audited:
+                self.stats["audited"] += 1
+                self.stats["audit_agreed"] += int(agreed)
+
+
+    def get_stats_summary(self):
+        """
+        Summarize the per-run statistics.
+
+        Returns:
+            dict: predicted, bypassed, bypass_rate, agreement (all compared
+                  predictions) and audit_agreement (confident predictions only)
+        """
+        stats = dict(self.stats)
+        stats["training_size"] = self.training_size
+        stats["bypass_rate"] = stats["bypassed"] / stats["predicted"] if stats["predicted"] else 0.0
+        stats["agreement"] = stats["agreed"] / stats["compared"] if stats["compared"] else None
+        stats["audit_agreement"] = stats["audit_agreed"] / stats["audited"] if stats["audited"] else None
+        return stats
+
+
+class SignatureStore:
+    """
+    Last AI classification of each known event signature.
+
+    Recurring events (weekly markets, trivia, brunches) are recognized by
+    their normalized title + venue. If the stored label is recent enough and
+    the description hasn't drifted below RECURRING_EVENT_MIN_SIMILARITY,
+    the label is reused instead of calling the LLM.
+    """
+
+    def __init__(self, labeled_events):
+        self._labels = {e["signature"]: e for e in labeled_events if e.get("signature")}
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+
+    def __len__(self):
+        return len(self._labels)
+
+
+    def lookup(self, event):
+        """
+        Find a reusable label for an event.
+
+        Args:
+            event: Event dictionary with title, description, location
+
+        Returns:
+            tuple: (analysis or None, outcome) where outcome is "reused",
+                   "new" (unknown signature), "expired" (label too old) or
+                   "drifted" (description changed too much)
+        """
+        label = self._labels.get(normalize_signature(event["title"], event["location"]))
+        max_age = timedelta(days=config.RECURRING_EVENT_MAX_AGE_DAYS)
+        analysis = None
+
+        # labeled_at comes back from the datetime column timezone-aware
+        labeled_at = label.get("labeled_at") if label else None
+        if labeled_at:
+            labeled_at = labeled_at.replace(tzinfo=None)
+
+        if label is None:
+            outcome = "new"
+        elif labeled_at and datetime.now() - labeled_at > max_age:
+            outcome = "expired"
+        else:
+            similarity = description_similarity(event["description"], label["description"])
+            if similarity < config.RECURRING_EVENT_MIN_SIMILARITY:
+                outcome = "drifted"
+            else:
+                outcome = "reused"
+                analysis = {
+                    "is_indoor": label["is_indoor"],
+                    "is_outdoor": label["is_outdoor"],
+                    "audience_type": label["audience_type"],
+                    "categories": list(label["categories"]),
+                    "cost_level": label["cost_level"],
+                    "source": "reused",
+                    "confidence": round((label.get("confidence") or 1.0) * similarity, 3)
+                }
+
+        with self._lock:
+            self.stats[outcome] += 1
+        return analysis, outcome
+
+
+    def reset_stats(self):
+        """Clear the per-run statistics."""
+        self.stats = {"reused": 0, "new": 0, "expired": 0, "drifted": 0}
+
+
+def load_labeled_events():
+    """
+    Load accumulated AI labels from the event_labels table.
+
+    Returns:
+        list: Labeled event dictionaries
+    """
+    from anvil.tables import app_tables
+
+    return [
+        {
+            "title": row["title"],
+            "description": row["description"],
+            "location": row["location"],
+            "cost_raw": row["cost_raw"],
+            "is_indoor": row["is_indoor"],
+            "is_outdoor": row["is_outdoor"],
+            "audience_type": row["audience_type"],
+            "categories": row["categories"] or [],
+            "cost_level": row["cost_level"],
+            "signature": row["signature"],
+            "confidence": row["confidence"],
+            "labeled_at": row["labeled_at"]
+        }
+        for row in app_tables.event_labels.search()
+    ]
+
+
+def load_trained_classifier(labeled=None):
+    """
+    Train a classifier on the stored labels.
+
+    Args:
+        labeled: Labels already loaded with load_labeled_events() (optional)
+
+    Returns:
+        EventClassifier: Trained classifier, or None if there are fewer than
+                         LOCAL_CLASSIFIER_MIN_TRAINING labels (or it's disabled)
+    """
+    if not config.LOCAL_CLASSIFIER_ENABLED:
+        return None
+
+    if labeled is None:
+        labeled = load_labeled_events()
+    if len(labeled) < config.LOCAL_CLASSIFIER_MIN_TRAINING:
+        print(f"  Local classifier: {len(labeled)} labels (need {config.LOCAL_CLASSIFIER_MIN_TRAINING}) - using LLM only")
+        return None
+
+    classifier = EventClassifier().train(labeled)
+    print(f"  Local classifier trained on {len(labeled)} labels")
+    return classifier
+
+
+def record_label(event, analysis):
+    """
+    Store an LLM analysis as a training label (upsert by title+venue signature).
+    This is also the label later recurrences of the event can reuse.
+
+    Args:
+        event: Event row
+        analysis: Validated LLM analysis
+    """
+    from anvil.tables import app_tables
+
+    signature = normalize_signature(event["title"], event["location"])
+    values = {
+        "title": event["title"],
+        "description": event["description"],
+        "location": event["location"],
+        "cost_raw": event["cost_raw"],
+        "is_indoor": analysis["is_indoor"],
+        "is_outdoor": analysis["is_outdoor"],
+        "audience_type": analysis["audience_type"],
+        "categories": analysis["categories"],
+        "cost_level": analysis["cost_level"],
+        "confidence": analysis.get("confidence") or 1.0,
+        "labeled_at": datetime.now()
+    }
+
+    row = app_tables.event_labels.get(signature=signature)
+    if row:
+        row.update(**values)
+    else:
+        app_tables.event_labels.add_row(signature=signature, **values)
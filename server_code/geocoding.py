@@ -0,0 +1,249 @@
+"""
+Venue geocoding for This Weekend app.
+Maps event locations to coordinates and coarse weather grid cells.
+
+Venues run from West Memphis to Collierville, so events are matched to the
+forecast of the grid cell they fall in rather than to one city-wide point
+(see weather_service.fetch_cell_weather). Cells are config.WEATHER_GRID_DEGREES
+wide, so the number of forecasts fetched is bounded by occupied cells, not
+by events.
+
+Geocodes are cached in the venue_geocodes table by normalized location, so a
+venue is geocoded once however many weeks its events recur. The geocoder is
+pluggable (config.GEOCODER names an entry in GEOCODERS); the default is an
+offline gazetteer of Memphis-area venues and neighborhoods that needs no API.
+"""
+
+import anvil.tables.query as q
+from anvil.tables import app_tables
+from collections import Counter
+from datetime import datetime, timedelta
+import math
+import re
+
+from . import config
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Offline gazetteer: normalized place name -> (lat, lon)
+# The longest name found in a location wins, so specific venues take
+# precedence over the neighborhood or suburb they are in.
+GAZETTEER = {
+    # Downtown
+    "fedexforum": (35.1382, -90.0506),
+    "beale street": (35.1392, -90.0526),
+    "orpheum": (35.1385, -90.0545),
+    "autozone park": (35.1430, -90.0490),
+    "tom lee park": (35.1391, -90.0594),
+    "mud island": (35.1535, -90.0535),
+    "big river crossing": (35.1290, -90.0660),
+    "pyramid": (35.1557, -90.0515),
+    "national civil rights museum": (35.1344, -90.0578),
+    "south main": (35.1330, -90.0570),
+    "harbor town": (35.1650, -90.0500),
+    "sun studio": (35.1393, -90.0375),
+    "downtown": (35.1460, -90.0520),
+    # Midtown
+    "crosstown concourse": (35.1520, -90.0149),
+    "overton park": (35.1440, -89.9930),
+    "levitt shell": (35.1432, -89.9937),
+    "memphis zoo": (35.1497, -89.9949),
+    "brooks museum": (35.1446, -89.9920),
+    "overton square": (35.1494, -89.9908),
+    "cooper young": (35.1191, -89.9906),
+    "midtown": (35.1400, -89.9950),
+    "stax": (35.1150, -90.0317),
+    # East Memphis
+    "liberty park": (35.1210, -89.9770),
+    "liberty stadium": (35.1212, -89.9777),
+    "university of memphis": (35.1187, -89.9375),
+    "memphis botanic garden": (35.1137, -89.9166),
+    "dixon gallery": (35.1097, -89.9130),
+    "east memphis": (35.1100, -89.8900),
+    "shelby farms": (35.1638, -89.8621),
+    "agricenter": (35.1271, -89.8056),
+    # Suburbs and across the river
+    "germantown": (35.0868, -89.8101),
+    "collierville": (35.0420, -89.6645),
+    "bartlett": (35.2045, -89.8740),
+    "cordova": (35.1556, -89.7762),
+    "millington": (35.3415, -89.8973),
+    "whitehaven": (35.0290, -90.0240),
+    "graceland": (35.0477, -90.0260),
+    "southaven": (34.9889, -90.0126),
+    "olive branch": (34.9618, -89.8295),
+    "west memphis": (35.1465, -90.1845),
+    "southland casino": (35.1587, -90.1364)
+}
+
+# Gazetteer names, longest first
+_GAZETTEER_NAMES = sorted(GAZETTEER, key=len, reverse=True)
+
+
+def normalize_location(location):
+    """
+    Normalize a scraped location for cache keys and gazetteer matching.
+
+    Args:
+        location: Event location string (or None)
+
+    Returns:
+        str: Lowercase words joined by single spaces (e.g., "levitt shell overton park")
+    """
+    text = (location or "").lower().replace("&", " and ").replace("-", " ")
+    return " ".join(TOKEN_PATTERN.findall(text))
+
+
+def gazetteer_geocode(location_key):
+    """
+    Geocode a normalized location with the offline gazetteer.
+
+    Args:
+        location_key: Location from normalize_location()
+
+    Returns:
+        tuple: (lat, lon), or None if no gazetteer name appears in the location
+    """
+    padded = f" {location_key} "
+    for name in _GAZETTEER_NAMES:
+        if f" {name} " in padded:
+            return GAZETTEER[name]
+    return None
+
+
+# Available geocoders: name -> function(location_key) returning (lat, lon) or None
+GEOCODERS = {
+    "gazetteer": gazetteer_geocode
+}
+
+
+def get_grid_cell(lat, lon):
+    """
+    Snap coordinates to their weather grid cell.
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+
+    Returns:
+        str: Cell key - the cell's center as "lat,lon" (e.g., "35.150,-90.050")
+    """
+    size = config.WEATHER_GRID_DEGREES
+    lat_center = (math.floor(lat / size) + 0.5) * size
+    lon_center = (math.floor(lon / size) + 0.5) * size
+    return f"{lat_center:.3f},{lon_center:.3f}"
+
+
+def get_cell_center(grid_cell):
+    """
+    Get the coordinates a grid cell's forecast is fetched for.
+
+    Args:
+        grid_cell: Cell key from get_grid_cell()
+
+    Returns:
+        tuple: (lat, lon) of the cell center
+    """
+    lat, lon = grid_cell.split(",")
+    return float(lat), float(lon)
+
+
+def get_default_cell():
+    """
+    Get the grid cell of the city-wide forecast (config.MEMPHIS_LAT/LON).
+
+    Returns:
+        str: Cell key
+    """
+    return get_grid_cell(config.MEMPHIS_LAT, config.MEMPHIS_LON)
+
+
+def geocode_locations(locations):
+    """
+    Resolve locations to grid cells, geocoding only those not yet cached.
+
+    Locations the geocoder can't place are cached too (without a cell) and
+    retried after config.GEOCODE_MISS_RETRY_DAYS.
+
+    Args:
+        locations: Iterable of event location strings
+
+    Returns:
+        dict: location_key -> grid cell key (None when the location couldn't be placed)
+    """
+    keys = {normalize_location(location) for location in locations}
+    keys.discard("")
+    if not keys:
+        return {}
+
+    cached = {row["location_key"]: row for row in app_tables.venue_geocodes.search(location_key=q.any_of(*keys))}
+    geocode = GEOCODERS[config.GEOCODER]
+    retry_before = datetime.now() - timedelta(days=config.GEOCODE_MISS_RETRY_DAYS)
+
+    cells = {}
+    new_rows = []
+    for location_key in keys:
+        row = cached.get(location_key)
+        if row:
+            geocoded_at = row["geocoded_at"].replace(tzinfo=None) if row["geocoded_at"] else None
+            if row["grid_cell"] or (geocoded_at and geocoded_at > retry_before):
+                cells[location_key] = row["grid_cell"]
+                continue
+
+        coordinates = geocode(location_key)
+        values = {
+            "lat": coordinates[0] if coordinates else None,
+            "lon": coordinates[1] if coordinates else None,
+            "grid_cell": get_grid_cell(*coordinates) if coordinates else None,
+            "source": config.GEOCODER if coordinates else None,
+            "geocoded_at": datetime.now()
+        }
+        if row:
+            row.update(**values)
+        else:
+            new_rows.append(dict(values, location_key=location_key))
+        cells[location_key] = values["grid_cell"]
+
+    if new_rows:
+        app_tables.venue_geocodes.add_rows(new_rows)
+
+    placed = sum(1 for cell in cells.values() if cell)
+    print(f"Geocoded {len(cells)} venues ({placed} placed, {len(new_rows)} new)")
+    return cells
+
+
+def get_occupied_cells():
+    """
+    Find the grid cells (other than the city-wide one) that have events.
+
+    Returns:
+        list: Cell keys with the most events first, at most config.WEATHER_MAX_GRID_CELLS
+    """
+    locations = Counter(
+        event["location"] for event in app_tables.events.search(q.fetch_only("location"))
+        if event["location"]
+    )
+    location_cells = geocode_locations(locations)
+
+    default_cell = get_default_cell()
+    cell_counts = Counter()
+    for location, count in locations.items():
+        cell = location_cells.get(normalize_location(location))
+        if cell and cell != default_cell:
+            cell_counts[cell] += count
+
+    return [cell for cell, _ in cell_counts.most_common(config.WEATHER_MAX_GRID_CELLS)]
+
+
+def load_location_cells():
+    """
+    Load the cached location -> grid cell mapping for placed venues.
+
+    Returns:
+        dict: location_key -> grid cell key
+    """
+    rows = app_tables.venue_geocodes.search(
+        q.fetch_only("location_key", "grid_cell"), grid_cell=q.not_(None)
+    )
+    return {row["location_key"]: row["grid_cell"] for row in rows}
@@ -0,0 +1,353 @@
+"""
+Resilience module for This Weekend app.
+Circuit breakers and bulkheads for the external providers (OpenAI, Firecrawl, OpenWeather).
+
+- Circuit breaker (closed → open → half-open): once the failure rate over the
+  last calls crosses the configured threshold, calls fail fast with
+  CircuitOpenError instead of waiting on a dead dependency. After a cool-down
+  a few trial calls are let through; success closes the circuit again.
+- Bulkhead: caps concurrent calls to each provider so one slow dependency
+  can't tie up every worker.
+
+Breaker state is per server process. State changes are also published to
+app_state so run_quick_health_check can show them. Publishing happens
+outside the breaker lock: changes are queued and written after the call
+(or, on threads marked with defer_publishing(), by publish_status_changes()
+on the thread that owns them).
+"""
+
+from collections import deque
+from contextlib import contextmanager
+import threading
+import time
+
+from . import config
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the provider's circuit is open."""
+
+
+class BulkheadFullError(Exception):
+    """Raised when a provider's concurrent-call limit stays full past the wait timeout."""
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker over a sliding window of recent calls."""
+
+    def __init__(self, name, failure_rate=0.5, window=10, min_calls=4,
+                 open_seconds=60, half_open_max_calls=1):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = None
+        self._half_open_calls = 0
+        self._rejected = 0
+        self._changed_at = time.time()
+
+
+    @property
+    def state(self):
+        """Current state, moving open → half-open once the cool-down has passed."""
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+
+    def allow_request(self):
+        """
+        Check whether a call may proceed (and count it if half-open).
+
+        Returns:
+            bool: True if the call may go ahead
+        """
+        with self._lock:
+            self._refresh_state()
+
+            if self._state == CLOSED:
+                return True
+
+            if self._state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+
+            self._rejected += 1
+            return False
+
+
+    def record_success(self):
+        """Record a successful call."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._outcomes.clear()
+                self._transition(CLOSED)
+            self._outcomes.append(True)
+
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit if the failure rate is too high."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(OPEN)
+                return
+
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if (self._state == CLOSED and len(self._outcomes) >= self.min_calls and
+                    failures / len(self._outcomes) >= self.failure_rate):
+                self._transition(OPEN)
+
+
+    def get_status(self):
+        """
+        Get a snapshot of the breaker.
+
+        Returns:
+            dict: state, recent failure rate, rejected call count, seconds until retry
+        """
+        with self._lock:
+            self._refresh_state()
+            calls = len(self._outcomes)
+            failures = self._outcomes.count(False)
+            retry_in = None
+            if self._state == OPEN:
+                retry_in = max(0, round(self._opened_at + self.open_seconds - time.time()))
+
+            return {
+                "state": self._state,
+                "recent_calls": calls,
+                "failure_rate": round(failures / calls, 2) if calls else 0.0,
+                "rejected": self._rejected,
+                "retry_in_seconds": retry_in,
+                "changed_at": self._changed_at
+            }
+
+
+    def _refresh_state(self):
+        """Move from open to half-open once the cool-down has elapsed (lock held)."""
+        if self._state == OPEN and time.time() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+
+
+    def _transition(self, new_state):
+        """Change state and queue it for publishing (lock held)."""
+        if new_state == self._state:
+            return
+
+        print(f"  ⚡ Circuit '{self.name}': {self._state} → {new_state}")
+        self._state = new_state
+        self._changed_at = time.time()
+        self._half_open_calls = 0
+        if new_state == OPEN:
+            self._opened_at = time.time()
+
+        with _pending_lock:
+            _pending_status[self.name] = {
+                "state": new_state,
+                "changed_at": self._changed_at,
+                "retry_in_seconds": self.open_seconds if new_state == OPEN else None
+            }
+
+
+class Bulkhead:
+    """Caps the number of concurrent calls to one provider."""
+
+    def __init__(self, name, max_concurrent, wait_timeout):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.wait_timeout = wait_timeout
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+
+
+    def acquire(self):
+        """
+        Take a slot, waiting up to wait_timeout seconds.
+
+        Raises:
+            BulkheadFullError: If no slot frees up in time
+        """
+        if not self._semaphore.acquire(timeout=self.wait_timeout):
+            raise BulkheadFullError(f"Too many concurrent '{self.name}' calls")
+
+
+    def release(self):
+        """Give a slot back."""
+        self._semaphore.release()
+
+
+_breakers = {}
+_bulkheads = {}
+_registry_lock = threading.Lock()
+
+# State changes not yet written to app_state: provider name -> status
+_pending_status = {}
+_pending_lock = threading.Lock()
+_thread_settings = threading.local()
+
+
+def get_breaker(name):
+    """
+    Get the circuit breaker for a provider, creating it from config on first use.
+
+    Args:
+        name: Provider name (key in config.CIRCUIT_BREAKERS)
+
+    Returns:
+        CircuitBreaker
+    """
+    with _registry_lock:
+        if name not in _breakers:
+            settings = config.CIRCUIT_BREAKERS[name]
+            _breakers[name] = CircuitBreaker(
+                name,
+                failure_rate=settings["failure_rate"],
+                window=settings["window"],
+                min_calls=settings["min_calls"],
+                open_seconds=settings["open_seconds"]
+            )
+        return _breakers[name]
+
+
+def get_bulkhead(name):
+    """
+    Get the bulkhead for a provider, creating it from config on first use.
+
+    Args:
+        name: Provider name (key in config.CIRCUIT_BREAKERS)
+
+    Returns:
+        Bulkhead
+    """
+    with _registry_lock:
+        if name not in _bulkheads:
+            settings = config.CIRCUIT_BREAKERS[name]
+            _bulkheads[name] = Bulkhead(name, settings["max_concurrent"], settings["bulkhead_wait"])
+        return _bulkheads[name]
+
+
+def is_available(name):
+    """
+    Check whether calls to a provider would currently be let through.
+    Does not consume a half-open trial call.
+
+    Args:
+        name: Provider name
+
+    Returns:
+        bool: False while the circuit is open
+    """
+    return get_breaker(name).state != OPEN
+
+
+@contextmanager
+def protect(name):
+    """
+    Run a provider call under its circuit breaker and bulkhead.
+
+    Usage:
+        with resilience.protect("openai"):
+            response = client.chat.completions.create(...)
+
+    Args:
+        name: Provider name
+
+    Raises:
+        CircuitOpenError: If the circuit is open (the call is not attempted)
+        BulkheadFullError: If the concurrency limit stays full
+    """
+    breaker = get_breaker(name)
+    if not breaker.allow_request():
+        raise CircuitOpenError(f"Circuit for '{name}' is open - failing fast")
+
+    bulkhead = get_bulkhead(name)
+    bulkhead.acquire()
+    try:
+        yield
+    except Exception:
+        breaker.record_failure()
+        raise
+    else:
+        breaker.record_success()
+    finally:
+        bulkhead.release()
+        if not getattr(_thread_settings, "defer_publishing", False):
+            publish_status_changes()
+
+
+def defer_publishing():
+    """
+    Mark the current thread as one that only makes provider calls: breaker
+    state changes it causes are left for publish_status_changes() on
+    another thread instead of being written to app_state here.
+    """
+    _thread_settings.defer_publishing = True
+
+
+def publish_status_changes():
+    """Write queued breaker state changes to app_state (best effort)."""
+    with _pending_lock:
+        changes = dict(_pending_status)
+        _pending_status.clear()
+    for name, status in changes.items():
+        _publish_status(name, status)
+
+
+def reset_all():
+    """Discard all breakers and bulkheads so they are rebuilt from config (benchmarks)."""
+    with _registry_lock:
+        _breakers.clear()
+        _bulkheads.clear()
+    with _pending_lock:
+        _pending_status.clear()
+
+
+def get_all_status():
+    """
+    Get breaker status for every configured provider.
+    Combines this process's breakers with the latest state published by
+    other processes (e.g. a background task that opened a circuit).
+
+    Returns:
+        dict: Provider name to status dict
+    """
+    from . import state_store
+
+    publish_status_changes()
+    statuses = {}
+    for name in config.CIRCUIT_BREAKERS:
+        status = get_breaker(name).get_status()
+        try:
+            published = state_store.get_state(f"circuit:{name}")
+        except Exception:
+            published = None
+
+        if published and published.get("changed_at", 0) > status["changed_at"]:
+            status = dict(status, state=published["state"], changed_at=published["changed_at"],
+                          source="published")
+            if published["state"] == OPEN and published.get("retry_in_seconds") is not None:
+                remaining = published["changed_at"] + published["retry_in_seconds"] - time.time()
+                if remaining <= 0:
+                    status["state"] = HALF_OPEN
+                status["retry_in_seconds"] = max(0, round(remaining))
+        statuses[name] = status
+    return statuses
+
+
+def _publish_status(name, status):
+    """Store a breaker state change in app_state (best effort)."""
+    try:
+        from . import state_store
+        state_store.set_state(f"circuit:{name}", status)
+    except Exception as e:
+        print(f"  Could not publish circuit state for '{name}': {str(e)}")
@@ -0,0 +1,234 @@
+"""
+Batch scoring engine for This Weekend app.
+Computes weather and recommendation scores for all events at once with NumPy.
+
+The per-event functions (weather_service.calculate_weather_score,
+data_processor.calculate_recommendation_score) remain the reference
+implementation; this module applies the same config thresholds and weights
+as vectorized masks and must give exactly the same scores.
+
+Only feature extraction is per event: each event is reduced to its
+indoor/outdoor flags, start hour and the worst weather values over its
+time window (looked up once per distinct grid cell, date, start and end hour).
+"""
+
+import numpy as np
+from anvil.tables import app_tables
+
+from . import config
+from . import weather_service
+from . import data_processor
+from . import state_store
+
+
+def extract_features(events, weather_index):
+    """
+    Load scoring inputs for a list of events into arrays.
+
+    Args:
+        events: Event rows (or dicts with the same keys)
+        weather_index: WeatherIndex to match events against
+
+    Returns:
+        dict: Arrays keyed by is_outdoor, is_indoor, has_weather,
+              precipitation_chance, feels_like, wind_speed, start_hour
+              (start_hour is -1 when the time-of-day bonus is neutral)
+    """
+    count = len(events)
+    is_outdoor = np.zeros(count, dtype=bool)
+    is_indoor = np.zeros(count, dtype=bool)
+    has_weather = np.zeros(count, dtype=bool)
+    precip = np.zeros(count, dtype=float)
+    feels_like = np.zeros(count, dtype=float)
+    wind = np.zeros(count, dtype=float)
+    start_hour = np.full(count, -1, dtype=np.int64)
+
+    slot_values = {}
+    bonus_hours = {}
+
+    for i, event in enumerate(events):
+        start_time = event["start_time"]
+        is_outdoor[i] = bool(event["is_outdoor"])
+        is_indoor[i] = event["is_indoor"] if event["is_indoor"] is not None else True
+
+        # Weather values, looked up once per (date, start hour, end hour) window
+        event_hour = None
+        if start_time and start_time != "TBD":
+            event_hour = weather_index.event_hour(start_time)
+        end_hour = weather_index.event_end_hour(event_hour, event["end_time"], event["categories"])
+        event_index = weather_index.for_location(event["location"])
+        slot = (event_index.grid_cell, event["date"], event_hour, end_hour)
+        if slot not in slot_values:
+            weather_data = event_index.get_weather_for_window(event["date"], event_hour, end_hour)
+            if weather_data:
+                values = weather_service.get_best_weather_values(weather_data)
+                slot_values[slot] = (values["precipitation_chance"], values["feels_like"], values["wind_speed"])
+            else:
+                slot_values[slot] = None
+
+        values = slot_values[slot]
+        if values:
+            has_weather[i] = True
+            precip[i], feels_like[i], wind[i] = values
+
+        # Time-of-day bonus hour, parsed once per distinct time string
+        time_key = start_time or ""
+        if time_key not in bonus_hours:
+            hour = data_processor.parse_bonus_hour(time_key)
+            bonus_hours[time_key] = -1 if hour is None else hour
+        start_hour[i] = bonus_hours[time_key]
+
+    return {
+        "is_outdoor": is_outdoor,
+        "is_indoor": is_indoor,
+        "has_weather": has_weather,
+        "precipitation_chance": precip,
+        "feels_like": feels_like,
+        "wind_speed": wind,
+        "start_hour": start_hour
+    }
+
+
+def compute_weather_scores(features):
+    """
+    Vectorized calculate_weather_score.
+
+    Args:
+        features: Arrays from extract_features()
+
+    Returns:
+        numpy.ndarray: Weather scores (0-100, int)
+    """
+    precip = features["precipitation_chance"]
+    temp = features["feels_like"]
+    wind = features["wind_speed"]
+
+    precip_penalty = np.select(
+        [precip > config.PRECIP_THRESHOLDS["high"],
+         precip > config.PRECIP_THRESHOLDS["medium"],
+         precip > config.PRECIP_THRESHOLDS["low"]],
+        [config.PRECIP_PENALTIES["high"], config.PRECIP_PENALTIES["medium"], config.PRECIP_PENALTIES["low"]],
+        default=0
+    )
+    temp_penalty = np.select(
+        [temp < config.TEMP_THRESHOLDS["too_cold"],
+         temp < config.TEMP_THRESHOLDS["cold"],
+         temp > config.TEMP_THRESHOLDS["too_hot"],
+         temp > config.TEMP_THRESHOLDS["hot"]],
+        [config.TEMP_PENALTIES["too_cold"], config.TEMP_PENALTIES["cold"],
+         config.TEMP_PENALTIES["too_hot"], config.TEMP_PENALTIES["hot"]],
+        default=0
+    )
+    wind_penalty = np.select(
+        [wind > config.WIND_THRESHOLDS["windy"],
+         wind > config.WIND_THRESHOLDS["breezy"]],
+        [config.WIND_PENALTIES["windy"], config.WIND_PENALTIES["breezy"]], default=0
+    )
+
+    outdoor_score = np.clip(100 - precip_penalty - temp_penalty - wind_penalty, 0, 100)
+
+    return np.select(
+        [~features["has_weather"], ~features["is_outdoor"]],
+        [50, 90], default=outdoor_score
+    ).astype(np.int64)
+
+
+def compute_time_of_day_bonus(start_hour):
+    """
+    Vectorized calculate_time_of_day_bonus.
+
+    Args:
+        start_hour: Array of hours (-1 for a neutral bonus)
+
+    Returns:
+        numpy.ndarray: Bonus points (0-30)
+    """
+    return np.select(
+        [start_hour == -1,
+         (17 <= start_hour) & (start_hour <= 21),
+         ((14 <= start_hour) & (start_hour <= 17)) | ((21 <= start_hour) & (start_hour <= 23)),
+         (10 <= start_hour) & (start_hour <= 14)],
+        [15, 30, 20, 15], default=10
+    )
+
+
+def compute_recommendation_scores(features, weather_scores):
+    """
+    Vectorized calculate_recommendation_score.
+
+    Args:
+        features: Arrays from extract_features()
+        weather_scores: Weather scores for the same events
+
+    Returns:
+        numpy.ndarray: Recommendation scores (0-100, int)
+    """
+    weights = config.WEATHER_WEIGHTS
+    is_outdoor = features["is_outdoor"]
+    is_indoor = features["is_indoor"]
+    weather_scores = weather_scores.astype(float)
+
+    time_bonus = compute_time_of_day_bonus(features["start_hour"])
+    outdoor = weather_scores * weights["outdoor_weather_score"] + time_bonus * weights["outdoor_time_of_day"]
+    indoor = weights["indoor_baseline"] + np.where(weather_scores < 50, weights["bad_weather_indoor_boost"], 0)
+    mixed = (weather_scores * 0.4) + (weights["indoor_baseline"] * 0.6)
+
+    scores = np.select(
+        [is_outdoor & ~is_indoor, is_indoor & ~is_outdoor],
+        [outdoor, indoor], default=mixed
+    )
+
+    # int() truncates toward zero, as in the scalar version
+    return np.trunc(np.clip(scores, 0, 100)).astype(np.int64)
+
+
+def score_events(events, weather_index):
+    """
+    Compute weather and recommendation scores for a list of events.
+
+    Args:
+        events: Event rows (or dicts)
+        weather_index: WeatherIndex to match events against
+
+    Returns:
+        tuple: (weather_scores, recommendation_scores) arrays in event order
+    """
+    features = extract_features(events, weather_index)
+    weather_scores = compute_weather_scores(features)
+    return weather_scores, compute_recommendation_scores(features, weather_scores)
+
+
+def score_all_events(weather_index=None):
+    """
+    Score every event in the database in one batch and write back the
+    scores that changed.
+
+    Args:
+        weather_index: Optional WeatherIndex (loaded once here if not given)
+
+    Returns:
+        int: Number of events scored
+    """
+    print("Scoring all events (weather + recommendation)...")
+
+    try:
+        weather_index = weather_index or weather_service.load_weather_index()
+        events = list(app_tables.events.search())
+
+        weather_scores, recommendation_scores = score_events(events, weather_index)
+
+        written = 0
+        for event, weather_score, recommendation_score in zip(
+                events, weather_scores.tolist(), recommendation_scores.tolist()):
+            if event["weather_score"] != weather_score or event["recommendation_score"] != recommendation_score:
+                event.update(weather_score=weather_score, recommendation_score=recommendation_score)
+                written += 1
+
+        print(f"Scored {len(events)} events ({written} changed)")
+        if written:
+            state_store.bump_data_version()
+        return len(events)
+
+    except Exception as e:
+        print(f"Error scoring events: {str(e)}")
+        raise
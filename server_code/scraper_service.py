@@ -9,6 +9,8 @@ import re
 
 from . import config
 from . import api_helpers
+from . import resilience
+from . import state_store
 
 # Import Firecrawl SDK (required dependency)
 from firecrawl import Firecrawl
@@ -31,10 +33,11 @@ def scrape_weekend_events():
     
     # Initialize Firecrawl client and scrape
     firecrawl = Firecrawl(api_key=api_key)
-    result = firecrawl.scrape(
-        url=config.TARGET_WEBSITE_URL,
-        formats=['markdown', 'html']
-    )
+    with resilience.protect("firecrawl"):
+        result = firecrawl.scrape(
+            url=config.TARGET_WEBSITE_URL,
+            formats=['markdown', 'html']
+        )
     
     # SDK returns a Document object with markdown, html, metadata properties
     if hasattr(result, 'markdown') and result.markdown:
@@ -52,7 +55,7 @@ def scrape_weekend_events():
         raise Exception("SDK returned no markdown content")
 
 
-def parse_events_from_markdown(markdown_content):
+def parse_events_from_markdown(markdown_content, on_event=None):
     """
     Parse event data from markdown content from ilovememphisblog.com/weekend.
     
@@ -61,6 +64,9 @@ def parse_events_from_markdown(markdown_content):
     
     Args:
         markdown_content: Raw markdown from Firecrawl
+        on_event: Optional callback called with each event as soon as it is
+                  parsed and enriched (lets AI analysis start while the
+                  remaining event pages are still being scraped)
         
     Returns:
         list: List of event dictionaries
@@ -163,6 +169,8 @@ def parse_events_from_markdown(markdown_content):
             
             if event:
                 events.append(event)
+                if on_event:
+                    on_event(event)
             else:
                 links_skipped += 1
                 skip_reasons["parse_failed"] = skip_reasons.get("parse_failed", 0) + 1
@@ -195,6 +203,7 @@ def scrape_event_details_from_url(event_url, api_key):
     
     If scraping fails (login required, 404, etc.), returns None so the caller
     can fall back to using only the information from the primary site.
+    The same happens without a request while the Firecrawl circuit is open.
     
     Args:
         event_url: URL to the specific event page
@@ -203,12 +212,17 @@ def scrape_event_details_from_url(event_url, api_key):
     Returns:
         dict: Detailed event information, {'event_has_passed': True}, or None if scraping fails
     """
+    # Circuit open: use link-text data without waiting on Firecrawl
+    if not resilience.is_available("firecrawl"):
+        return None
+    
     try:
         firecrawl = Firecrawl(api_key=api_key)
-        result = firecrawl.scrape(
-            url=event_url,
-            formats=['markdown']
-        )
+        with resilience.protect("firecrawl"):
+            result = firecrawl.scrape(
+                url=event_url,
+                formats=['markdown']
+            )
         
         # Check if the event has passed (redirects to event-has-passed page)
         if hasattr(result, 'metadata') and result.metadata:
@@ -607,6 +621,9 @@ def save_events_to_db(events):
             
             saved_count += 1
         
+        if saved_count:
+            state_store.bump_data_version()
+        
         # Summary message
         if skipped_count > 0:
             print(f"  ✓ Saved {saved_count} events ({skipped_count} skipped - missing title/date)")
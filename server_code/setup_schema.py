@@ -37,7 +37,9 @@ SCHEMA_DEFINITIONS = {
         'weather_score': ('number', 75),
         'recommendation_score': ('number', 80),
         'scraped_at': ('datetime', datetime.now()),
-        'analyzed_at': ('datetime', datetime.now())
+        'analyzed_at': ('datetime', datetime.now()),
+        'analysis_source': ('text', 'ai'),
+        'analysis_confidence': ('number', 0.9)
     },
     'weather_forecast': {
         'forecast_date': ('date', date.today()),
@@ -47,21 +49,12 @@ SCHEMA_DEFINITIONS = {
         'conditions': ('text', 'Partly Cloudy'),
         'precipitation_chance': ('number', 20),
         'wind_speed': ('number', 10),
-        'hourly_data': ('simpleobject', [{'time': '12:00 PM', 'temp': 70}]),
-        'fetched_at': ('datetime', datetime.now())
-    },
-    'hourly_weather': {
-        'timestamp': ('datetime', datetime.now()),
-        'hour_time': ('text', '3:00 PM'),
-        'date': ('date', date.today()),
-        'temp': ('number', 72),
-        'feels_like': ('number', 70),
-        'conditions': ('text', 'Partly Cloudy'),
-        'precipitation_chance': ('number', 20),
-        'wind_speed': ('number', 10),
-        'humidity': ('number', 60),
-        'uvi': ('number', 5),
-        'fetched_at': ('datetime', datetime.now())
+        'hourly_packed': ('simpleobject', {'hour': [12], 'epoch': [1761325200], 'temp': [70],
+                                           'conditions': [0], 'condition_names': ['clear sky']}),
+        'periods': ('simpleobject', {'morning': None, 'afternoon': None, 'evening': None}),
+        'fetched_at': ('datetime', datetime.now()),
+        'generation': ('text', 'wx_sample_123'),
+        'grid_cell': ('text', '35.150,-90.050')
     },
     'scrape_log': {
         'log_id': ('text', 'log_sample_123'),
@@ -70,7 +63,42 @@ SCHEMA_DEFINITIONS = {
         'events_found': ('number', 0),
         'events_analyzed': ('number', 0),
         'error_message': ('text', ''),
-        'duration_seconds': ('number', 0)
+        'duration_seconds': ('number', 0),
+        'ai_calls': ('number', 0),
+        'prompt_tokens': ('number', 0),
+        'completion_tokens': ('number', 0),
+        'ai_latency_seconds': ('number', 0),
+        'ai_cost_usd': ('number', 0),
+        'local_classified': ('number', 0),
+        'local_agreement': ('number', 0),
+        'signature_reused': ('number', 0)
+    },
+    'event_labels': {
+        'signature': ('text', 'sample event|sample location'),
+        'title': ('text', 'Sample Event'),
+        'description': ('text', 'Sample event description'),
+        'location': ('text', 'Sample Location'),
+        'cost_raw': ('text', '$20'),
+        'is_indoor': ('bool', True),
+        'is_outdoor': ('bool', False),
+        'audience_type': ('text', 'all-ages'),
+        'categories': ('simpleobject', ['Sample Category']),
+        'cost_level': ('text', '$$'),
+        'confidence': ('number', 1.0),
+        'labeled_at': ('datetime', datetime.now())
+    },
+    'venue_geocodes': {
+        'location_key': ('text', 'levitt shell overton park'),
+        'lat': ('number', 35.1432),
+        'lon': ('number', -89.9937),
+        'grid_cell': ('text', '35.150,-89.950'),
+        'source': ('text', 'gazetteer'),
+        'geocoded_at': ('datetime', datetime.now())
+    },
+    'app_state': {
+        'key': ('text', 'sample_key'),
+        'value': ('simpleobject', {'sample': True}),
+        'updated_at': ('datetime', datetime.now())
     }
 }
 
@@ -0,0 +1,117 @@
+"""
+Application state store for This Weekend app.
+Keeps small named documents (caches, pointers, counters) in the app_state Data Table.
+
+Each key maps to one row holding a SimpleObject value, so reading a
+cached document is a single indexed lookup.
+"""
+
+import anvil.tables as tables
+from anvil.tables import app_tables
+from datetime import datetime
+
+
+# Key of the data version counter (see bump_data_version)
+DATA_VERSION_KEY = "data_version"
+
+
+def get_state_row(key, create=False):
+    """
+    Get the app_state row for a key.
+
+    Args:
+        key: State key
+        create: If True, create an empty row when none exists
+
+    Returns:
+        Row or None
+    """
+    row = app_tables.app_state.get(key=key)
+    if row is None and create:
+        row = app_tables.app_state.add_row(key=key, value=None, updated_at=datetime.now())
+    return row
+
+
+def get_state(key, default=None):
+    """
+    Read a stored value.
+
+    Args:
+        key: State key
+        default: Value returned when the key is missing or empty
+
+    Returns:
+        Stored SimpleObject value, or default
+    """
+    row = get_state_row(key)
+    if row is None or row["value"] is None:
+        return default
+    return row["value"]
+
+
+def set_state(key, value):
+    """
+    Write a value, creating the row if needed.
+
+    Args:
+        key: State key
+        value: JSON-compatible value (stored as SimpleObject)
+    """
+    row = get_state_row(key, create=True)
+    row.update(value=value, updated_at=datetime.now())
+
+
+def delete_state(key):
+    """
+    Remove a stored value.
+
+    Args:
+        key: State key
+    """
+    row = get_state_row(key)
+    if row is not None:
+        row.delete()
+
+
+def get_data_version():
+    """
+    Read the data version visitors' copies are compared against.
+
+    Returns:
+        int: Current data version (0 before the first bump)
+    """
+    return get_state(DATA_VERSION_KEY, 0)
+
+
+@tables.in_transaction
+def bump_data_version():
+    """
+    Advance the data version after a write visitors can see (events,
+    scores, weather, the event feed or suggestions), so clients holding
+    an older version download the data again.
+
+    Returns:
+        int: New data version
+    """
+    row = get_state_row(DATA_VERSION_KEY, create=True)
+    version = (row["value"] or 0) + 1
+    row.update(value=version, updated_at=datetime.now())
+    return version
+
+
+def versioned_response(version, known_version, **data):
+    """
+    Build a response for a client that may already hold this data.
+
+    Args:
+        version: Version token of the current data (built from get_data_version())
+        known_version: Token the client got with its copy (or None)
+        **data: Response fields, sent only when the client's copy is out of date
+
+    Returns:
+        dict: {"version", "not_modified": True} if the client's copy is current,
+              otherwise {"version", **data}
+    """
+    if known_version is not None and known_version == version:
+        return {"version": version, "not_modified": True}
+    return dict(data, version=version)
@@ -264,13 +264,12 @@ def create_test_events():
         print(f"Created {created_count} test events")
         
         # Now calculate weather scores and recommendations
+        from . import scoring_engine
         from . import data_processor
         
-        print("Calculating weather scores...")
-        data_processor.match_events_with_weather()
-        
-        print("Calculating recommendation scores...")
-        data_processor.update_all_recommendation_scores()
+        print("Calculating weather and recommendation scores...")
+        scoring_engine.score_all_events()
+        data_processor.build_event_feed()
         
         print(f"✅ Test data ready! {created_count} events with scores calculated")
         
@@ -297,5 +296,9 @@ def clear_test_events():
             deleted += 1
     
     print(f"Deleted {deleted} test events")
+    
+    from . import data_processor
+    data_processor.build_event_feed()
+    
     return deleted
 
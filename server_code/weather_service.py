@@ -8,73 +8,222 @@ import anvil.http
 import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
-from datetime import datetime, timedelta
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timedelta, timezone
 import json
+import time
 
 from . import config
 from . import api_helpers
+from . import geocoding
+from . import resilience
+from . import state_store
 
 
-def fetch_weekend_weather():
+# app_state key of the active forecast generation pointer
+WEATHER_GENERATION_KEY = "weather_generation"
+
+# Time periods shown on the weather cards: (name, start hour, end hour)
+TIME_PERIODS = (
+    ("morning", 6, 12),     # 6 AM - 12 PM
+    ("afternoon", 12, 18),  # 12 PM - 6 PM
+    ("evening", 18, 24)     # 6 PM - 12 AM
+)
+
+
+def fetch_weekend_weather(force=False, lat=None, lon=None):
     """
     Fetch weather forecast for the upcoming weekend (Friday, Saturday, Sunday).
     Uses OpenWeather One Call API 3.0.
     
+    The raw API response is cached in app_state (keyed by coordinates and
+    units) and reused for config.OPENWEATHER_CACHE_TTL seconds, so frequent
+    score refreshes don't spend API quota. If a fetch fails, an older cached
+    response is still used (up to config.OPENWEATHER_MAX_STALE_AGE) rather
+    than failing the refresh. Each day carries the time its response was
+    fetched, so a reused response is saved with its original fetch time.
+    
+    Args:
+        force: If True, always call the API (bypasses the cache)
+        lat: Latitude (defaults to config.MEMPHIS_LAT)
+        lon: Longitude (defaults to config.MEMPHIS_LON)
+    
     Returns:
         dict: Weather data for Friday, Saturday, Sunday
         
     Raises:
-        Exception: If API call fails
+        Exception: If API call fails (and no cached response is recent enough)
+        resilience.CircuitOpenError: If the OpenWeather circuit is open
     """
-    print("Fetching weekend weather from OpenWeather API...")
+    lat = config.MEMPHIS_LAT if lat is None else lat
+    lon = config.MEMPHIS_LON if lon is None else lon
+    units = "imperial"  # Fahrenheit
+    cache_key = get_weather_cache_key(lat, lon, units)
+    cached = get_cached_weather_response(cache_key)
     
-    # Get API key
-    api_key = api_helpers.get_api_key("OPENWEATHER_API_KEY")
-    
-    # Build API request
-    url = config.OPENWEATHER_BASE_URL
-    params = {
-        "lat": config.MEMPHIS_LAT,
-        "lon": config.MEMPHIS_LON,
-        "appid": api_key,
-        "units": "imperial",  # Fahrenheit
-        "exclude": "current,minutely,alerts"  # We only need daily and hourly
-    }
+    if cached and not force:
+        age = time.time() - cached["fetched_at"]
+        if age < config.OPENWEATHER_CACHE_TTL:
+            print(f"Using cached OpenWeather response ({int(age)}s old)")
+            return extract_weekend_forecasts(cached["payload"], cached["fetched_at"])
+    
+    print("Fetching weekend weather from OpenWeather API...")
     
     try:
+        # Get API key
+        api_key = api_helpers.get_api_key("OPENWEATHER_API_KEY")
+        
+        # Build API request
+        url = config.OPENWEATHER_BASE_URL
+        params = {
+            "lat": lat,
+            "lon": lon,
+            "appid": api_key,
+            "units": units,
+            "exclude": "current,minutely,alerts"  # We only need daily and hourly
+        }
+        
         # In Anvil, http.request returns a StreamingMedia object
         # We need to convert it to bytes/string first
-        response = anvil.http.request(
-            url,
-            method="GET",
-            data=params,
-            timeout=30
-        )
-        
-        # Convert StreamingMedia to string
-        response_text = response.get_bytes().decode('utf-8')
+        with resilience.protect("openweather"):
+            response = anvil.http.request(
+                url,
+                method="GET",
+                data=params,
+                timeout=30
+            )
+            
+            # Convert StreamingMedia to string
+            response_text = response.get_bytes().decode('utf-8')
         
         # Parse response
         weather_data = json.loads(response_text)
         
-        # Extract weekend forecasts
-        weekend_data = extract_weekend_forecasts(weather_data)
-        
-        print(f"Successfully fetched weather for {len(weekend_data)} days")
-        return weekend_data
-        
     except Exception as e:
         print(f"Error fetching weather: {str(e)}")
+        if cached and not force:
+            age = time.time() - cached["fetched_at"]
+            if age < config.OPENWEATHER_MAX_STALE_AGE:
+                print(f"  ⚠️ Using stale cached OpenWeather response ({int(age / 60)} min old)")
+                return extract_weekend_forecasts(cached["payload"], cached["fetched_at"])
+            print(f"  Cached OpenWeather response is too old to use ({int(age / 3600)} h old)")
         raise
+    
+    fetched_at = time.time()
+    store_weather_response(cache_key, weather_data, fetched_at)
+    
+    # Extract weekend forecasts
+    weekend_data = extract_weekend_forecasts(weather_data, fetched_at)
+    
+    print(f"Successfully fetched weather for {len(weekend_data)} days")
+    return weekend_data
 
 
-def extract_weekend_forecasts(weather_data):
+def fetch_cell_weather(grid_cells=None, force=False):
+    """
+    Fetch the weekend forecast for each venue grid cell.
+    
+    One forecast per cell (at the cell center), so the number of API calls
+    is bounded by occupied cells rather than events. A cell whose fetch
+    fails is skipped - its events fall back to the city-wide forecast.
+    
+    Args:
+        grid_cells: Cell keys (defaults to geocoding.get_occupied_cells())
+        force: If True, bypass the response cache
+        
+    Returns:
+        dict: grid cell key -> weather data (as from fetch_weekend_weather)
+    """
+    cell_weather = {}
+    
+    if grid_cells is None:
+        try:
+            grid_cells = geocoding.get_occupied_cells()
+        except Exception as e:
+            print(f"  ⚠️ Could not geocode venues (using city-wide forecast only): {str(e)}")
+            return cell_weather
+    
+    for grid_cell in grid_cells:
+        lat, lon = geocoding.get_cell_center(grid_cell)
+        try:
+            cell_weather[grid_cell] = fetch_weekend_weather(force=force, lat=lat, lon=lon)
+        except Exception as e:
+            print(f"  ⚠️ No forecast for grid cell {grid_cell} (using city-wide forecast): {str(e)}")
+    
+    return cell_weather
+
+
+def get_weather_cache_key(lat, lon, units):
+    """
+    Build the app_state key for a cached One Call response.
+    
+    Args:
+        lat: Latitude
+        lon: Longitude
+        units: OpenWeather units ("imperial", "metric", ...)
+        
+    Returns:
+        str: Cache key
+    """
+    return f"openweather:{lat:.4f},{lon:.4f}:{units}"
+
+
+def get_cached_weather_response(cache_key):
+    """
+    Read a cached One Call response (best effort).
+    
+    Args:
+        cache_key: Key from get_weather_cache_key()
+        
+    Returns:
+        dict: {"fetched_at": unix time, "payload": raw API response}, or None
+    """
+    try:
+        cached = state_store.get_state(cache_key)
+    except Exception as e:
+        print(f"  Could not read cached weather: {str(e)}")
+        return None
+    
+    if not cached or not cached.get("payload"):
+        return None
+    return cached
+
+
+def store_weather_response(cache_key, weather_data, fetched_at):
+    """
+    Cache a raw One Call response in app_state (best effort).
+    
+    Args:
+        cache_key: Key from get_weather_cache_key()
+        weather_data: Parsed API response
+        fetched_at: Unix time the response was fetched
+    """
+    try:
+        state_store.set_state(cache_key, {
+            "fetched_at": fetched_at,
+            "payload": weather_data
+        })
+    except Exception as e:
+        print(f"  Could not cache weather response: {str(e)}")
+
+
+def extract_weekend_forecasts(weather_data, fetched_at=None):
     """
     Extract Friday, Saturday, Sunday forecasts from API response.
     Includes all 48 hours of hourly forecasts available.
     
+    Daily and hourly entries are bucketed by their Memphis-local date in a
+    single pass over each list. Local time comes from the payload's
+    timezone_offset, so the result doesn't depend on the server's timezone.
+    
+    Hourly entries carry the integer hour of day and the epoch timestamp
+    ("hour", "epoch"); display strings are derived with format_hour() when
+    rendering, so lookups never parse time strings.
+    
     Args:
         weather_data: Raw API response
+        fetched_at: Optional Unix time the response was fetched (kept on each day)
         
     Returns:
         dict: Processed weather data for weekend days
@@ -84,35 +233,35 @@ def extract_weekend_forecasts(weather_data):
     
     daily_forecasts = weather_data.get("daily", [])
     hourly_forecasts = weather_data.get("hourly", [])  # 48 hours available
+    timezone_offset = weather_data.get("timezone_offset")
+    
+    # Bucket daily and hourly forecasts by local date (one pass each)
+    daily_by_date = {}
+    for forecast in daily_forecasts:
+        forecast_date = to_local_datetime(forecast["dt"], timezone_offset).date()
+        daily_by_date.setdefault(forecast_date, forecast)
     
-    # Processing forecasts (logging reduced for brevity)
+    hourly_by_date = {target_date: [] for target_date in weekend_dates.values()}
+    for hour_forecast in hourly_forecasts:
+        hour_when = to_local_datetime(hour_forecast["dt"], timezone_offset)
+        bucket = hourly_by_date.get(hour_when.date())
+        if bucket is not None:
+            bucket.append({
+                "hour": hour_when.hour,
+                "epoch": hour_forecast["dt"],
+                "temp": round(hour_forecast["temp"]),
+                "feels_like": round(hour_forecast.get("feels_like", hour_forecast["temp"])),
+                "precipitation_chance": round(hour_forecast.get("pop", 0) * 100),
+                "conditions": hour_forecast["weather"][0]["description"],
+                "wind_speed": round(hour_forecast.get("wind_speed", 0)),
+                "humidity": hour_forecast.get("humidity", 0),
+                "uvi": round(hour_forecast.get("uvi", 0), 1)
+            })
     
     for day_name, target_date in weekend_dates.items():
-        # Find matching daily forecast
-        daily_data = None
-        for forecast in daily_forecasts:
-            forecast_date = datetime.fromtimestamp(forecast["dt"]).date()
-            if forecast_date == target_date:
-                daily_data = forecast
-                break
+        daily_data = daily_by_date.get(target_date)
         
         if daily_data:
-            # Extract hourly data for this day
-            hourly_data = []
-            for hour_forecast in hourly_forecasts:
-                hour_date = datetime.fromtimestamp(hour_forecast["dt"]).date()
-                if hour_date == target_date:
-                    hourly_data.append({
-                        "time": datetime.fromtimestamp(hour_forecast["dt"]).strftime("%I:%M %p"),
-                        "temp": round(hour_forecast["temp"]),
-                        "feels_like": round(hour_forecast.get("feels_like", hour_forecast["temp"])),
-                        "precipitation_chance": round(hour_forecast.get("pop", 0) * 100),
-                        "conditions": hour_forecast["weather"][0]["description"],
-                        "wind_speed": round(hour_forecast.get("wind_speed", 0)),
-                        "humidity": hour_forecast.get("humidity", 0),
-                        "uvi": round(hour_forecast.get("uvi", 0), 1)
-                    })
-            
             weekend_forecasts[day_name] = {
                 "date": target_date,
                 "day_name": day_name.capitalize(),
@@ -122,87 +271,277 @@ def extract_weekend_forecasts(weather_data):
                 "precipitation_chance": round(daily_data.get("pop", 0) * 100),
                 "wind_speed": round(daily_data.get("wind_speed", 0)),
                 "humidity": daily_data.get("humidity", 0),
-                "hourly_data": hourly_data
+                "hourly_data": hourly_by_date[target_date],
+                "fetched_at": datetime.fromtimestamp(fetched_at, timezone.utc) if fetched_at else None
             }
     
     return weekend_forecasts
 
 
-def save_weather_to_db(weather_data):
+def to_local_datetime(epoch, timezone_offset=None):
+    """
+    Convert a Unix timestamp to Memphis wall-clock time.
+    
+    Args:
+        epoch: Unix timestamp (UTC)
+        timezone_offset: Seconds east of UTC from the API payload; if missing,
+                         config.MEMPHIS_TIMEZONE is used
+        
+    Returns:
+        datetime: Naive local datetime
+    """
+    if timezone_offset is None:
+        from . import date_utils
+        return datetime.fromtimestamp(epoch, date_utils.CENTRAL_TZ).replace(tzinfo=None)
+    return datetime.fromtimestamp(epoch + timezone_offset, timezone.utc).replace(tzinfo=None)
+
+
+def save_weather_to_db(weather_data, cell_weather=None):
     """
     Save weather forecasts to the weather_forecast Data Table.
-    Also saves 48-hour hourly forecasts to hourly_weather table.
-    Clears old data first.
+    Each day's hourly forecasts are stored with it in packed form
+    (see pack_hourly), so a save writes one row per day and grid cell.
+    The city-wide forecast is stored with grid_cell None; venue grid cell
+    forecasts carry their cell key.
+    
+    The new forecast is written in bulk under a fresh generation ID, then
+    the active-generation pointer in app_state is flipped in one write.
+    Readers filter on the active generation, so they see either the old
+    forecast or the new one - never a partly cleared table. The previous
+    generation is kept for readers still using it; older ones are deleted.
+    
+    Each row keeps the fetch time of the API response it came from (see
+    fetch_weekend_weather). If every forecast comes from a response that
+    is already stored, nothing is written and the data version is not
+    bumped, so re-reading a cached response doesn't look like new weather.
     
     Args:
-        weather_data: Dictionary of weather forecasts
+        weather_data: Dictionary of city-wide weather forecasts
+        cell_weather: Optional {grid cell key: weather forecasts} for venue cells
+    
+    Returns:
+        bool: True if a new generation was saved, False if the stored one is current
     """
     print("Saving weather data to database...")
     
+    # Fetch time for forecasts that don't carry their own
+    now = datetime.now()
+    generation = api_helpers.generate_unique_id("wx")
+    
     try:
-        # Clear old weather data
-        for row in app_tables.weather_forecast.search():
-            row.delete()
+        forecasts = [(None, forecast) for forecast in weather_data.values()]
+        for grid_cell, cell_data in (cell_weather or {}).items():
+            forecasts.extend((grid_cell, forecast) for forecast in cell_data.values())
         
-        # Clear old hourly data if table exists
-        try:
-            for row in app_tables.hourly_weather.search():
-                row.delete()
-        except AttributeError:
-            # hourly_weather table doesn't exist yet
-            print("  Note: hourly_weather table not found (will be created if needed)")
-            pass
-        
-        # Insert new daily forecasts
-        for day_name, forecast in weather_data.items():
-            app_tables.weather_forecast.add_row(
-                forecast_date=forecast["date"],
-                day_name=forecast["day_name"],
-                temp_high=forecast["temp_high"],
-                temp_low=forecast["temp_low"],
-                conditions=forecast["conditions"],
-                precipitation_chance=forecast["precipitation_chance"],
-                wind_speed=forecast["wind_speed"],
-                hourly_data=forecast["hourly_data"],  # Store as SimpleObject
-                fetched_at=datetime.now()
-            )
-            
-            # Save detailed hourly data to separate table
-            try:
-                for hour_data in forecast["hourly_data"]:
-                    # Parse the time to create a full datetime
-                    hour_str = hour_data["time"]
-                    try:
-                        hour_time = datetime.strptime(hour_str, "%I:%M %p").time()
-                        full_datetime = datetime.combine(forecast["date"], hour_time)
-                    except:
-                        # If time parsing fails, use a default
-                        full_datetime = datetime.combine(forecast["date"], datetime.min.time())
-                    
-                    app_tables.hourly_weather.add_row(
-                        timestamp=full_datetime,
-                        hour_time=hour_data["time"],
-                        date=forecast["date"],
-                        temp=hour_data["temp"],
-                        feels_like=hour_data["feels_like"],
-                        conditions=hour_data["conditions"],
-                        precipitation_chance=hour_data["precipitation_chance"],
-                        wind_speed=hour_data["wind_speed"],
-                        humidity=hour_data.get("humidity", 0),
-                        uvi=hour_data.get("uvi", 0),
-                        fetched_at=datetime.now()
-                    )
-            except AttributeError:
-                # hourly_weather table doesn't exist, skip saving hourly data
-                pass
+        if forecasts and is_stored_forecast(forecasts):
+            print("Weather unchanged (same OpenWeather responses) - keeping the stored forecast")
+            return False
+        
+        forecast_rows = []
+        for grid_cell, forecast in forecasts:
+            forecast_rows.append({
+                "forecast_date": forecast["date"],
+                "day_name": forecast["day_name"],
+                "temp_high": forecast["temp_high"],
+                "temp_low": forecast["temp_low"],
+                "conditions": forecast["conditions"],
+                "precipitation_chance": forecast["precipitation_chance"],
+                "wind_speed": forecast["wind_speed"],
+                "hourly_packed": pack_hourly(forecast["hourly_data"]),  # Store as SimpleObject
+                "periods": compute_period_forecasts(forecast["hourly_data"]),
+                "fetched_at": forecast.get("fetched_at") or now,
+                "generation": generation,
+                "grid_cell": grid_cell
+            })
+        
+        # Write the new generation (not visible to readers yet)
+        add_rows_in_batches(app_tables.weather_forecast, forecast_rows)
+        
+        # Flip the pointer - readers switch to the new forecast here
+        previous = get_active_generation()
+        state_store.set_state(WEATHER_GENERATION_KEY, {
+            "generation": generation,
+            "previous": previous
+        })
+        state_store.bump_data_version()
         
-        print(f"Saved {len(weather_data)} weather forecasts to database")
+        # Bulk-delete everything older than the previous generation
+        delete_stale_generations(generation, previous)
+        
+        print(f"Saved {len(forecast_rows)} weather forecasts to database "
+              f"({len(cell_weather or {})} venue grid cells, generation {generation})")
+        return True
         
     except Exception as e:
         print(f"Error saving weather to database: {str(e)}")
         raise
 
 
+def is_stored_forecast(forecasts):
+    """
+    Check whether the active generation holds exactly these forecasts:
+    the same days and grid cells, from the same API responses.
+    
+    Args:
+        forecasts: List of (grid cell, forecast) pairs about to be saved
+        
+    Returns:
+        bool: True if saving them would rewrite the active generation unchanged
+    """
+    if any(not forecast.get("fetched_at") for _, forecast in forecasts):
+        return False
+    
+    generation = get_active_generation()
+    if not generation:
+        return False
+    
+    # Whole seconds - stored datetimes come back timezone-aware
+    new_keys = {
+        (grid_cell, forecast["date"], round(forecast["fetched_at"].timestamp()))
+        for grid_cell, forecast in forecasts
+    }
+    stored = app_tables.weather_forecast.search(
+        q.fetch_only("grid_cell", "forecast_date", "fetched_at"), generation=generation
+    )
+    stored_keys = {
+        (row["grid_cell"], row["forecast_date"], round(row["fetched_at"].timestamp()) if row["fetched_at"] else None)
+        for row in stored
+    }
+    return new_keys == stored_keys
+
+
+def add_rows_in_batches(table, rows):
+    """
+    Insert rows with one add_rows call per batch.
+    
+    Args:
+        table: Data Table (e.g., app_tables.weather_forecast)
+        rows: List of column dictionaries
+    """
+    batch_size = config.WEATHER_WRITE_BATCH_SIZE
+    for start in range(0, len(rows), batch_size):
+        table.add_rows(rows[start:start + batch_size])
+
+
+def delete_stale_generations(generation, previous=None):
+    """
+    Delete forecast rows that belong to neither the active nor the previous generation.
+    
+    Args:
+        generation: Active generation ID
+        previous: Previous generation ID (kept for in-flight readers), or None
+    """
+    keep = [g for g in (generation, previous) if g]
+    app_tables.weather_forecast.search(generation=q.none_of(*keep)).delete_all_rows()
+
+
+# Numeric per-hour fields stored as parallel arrays by pack_hourly
+PACKED_HOURLY_FIELDS = (
+    "hour", "epoch", "temp", "feels_like", "precipitation_chance",
+    "wind_speed", "humidity", "uvi"
+)
+
+
+def pack_hourly(hourly_data):
+    """
+    Pack a day's hourly forecasts into parallel arrays for storage.
+    
+    Each numeric field becomes one list (index i = i-th hour); conditions
+    are stored as codes into a per-day dictionary of description strings,
+    instead of repeating keys and descriptions for every hour.
+    
+    Args:
+        hourly_data: List of hourly forecast dictionaries for one day
+        
+    Returns:
+        dict: Field name to list, plus "conditions" (codes) and "condition_names"
+    """
+    packed = {field: [] for field in PACKED_HOURLY_FIELDS}
+    condition_codes = {}
+    packed["conditions"] = []
+    
+    for hour_data in hourly_data:
+        for field in PACKED_HOURLY_FIELDS:
+            packed[field].append(hour_data.get(field, 0))
+        conditions = hour_data.get("conditions", "unknown")
+        packed["conditions"].append(condition_codes.setdefault(conditions, len(condition_codes)))
+    
+    packed["condition_names"] = list(condition_codes)
+    return packed
+
+
+def get_packed_hour(packed, index):
+    """
+    Get one hour of a packed day as an hourly forecast dictionary.
+    
+    Args:
+        packed: Packed day from pack_hourly()
+        index: Position of the hour in the arrays
+        
+    Returns:
+        dict: Hourly forecast (same keys as extract_weekend_forecasts produces)
+    """
+    hour_data = {field: packed[field][index] for field in PACKED_HOURLY_FIELDS}
+    hour_data["conditions"] = packed["condition_names"][packed["conditions"][index]]
+    return hour_data
+
+
+def unpack_hourly(packed):
+    """
+    Expand a packed day back into a list of hourly forecast dictionaries.
+    
+    Args:
+        packed: Packed day from pack_hourly(), or None
+        
+    Returns:
+        list: Hourly forecast dictionaries (empty if nothing is stored)
+    """
+    if not packed:
+        return []
+    return [get_packed_hour(packed, i) for i in range(len(packed["hour"]))]
+
+
+def get_active_generation():
+    """
+    Get the generation ID of the forecast readers should use.
+    
+    Returns:
+        str: Active generation ID, or None before the first generation swap
+    """
+    pointer = state_store.get_state(WEATHER_GENERATION_KEY)
+    return pointer["generation"] if pointer else None
+
+
+def active_generation_filter(generation=None):
+    """
+    Build search keyword filters limiting a weather table to the active generation.
+    
+    Args:
+        generation: Generation ID to use (looked up if not given)
+        
+    Returns:
+        dict: {"generation": ...}, or {} before the first generation swap
+    """
+    generation = generation or get_active_generation()
+    return {"generation": generation} if generation else {}
+
+
+def get_latest_fetch_time():
+    """
+    Get when the stored weather forecast was fetched.
+    
+    Returns:
+        datetime: Most recent fetched_at, or None if no forecast is stored
+    """
+    latest = app_tables.weather_forecast.search(
+        tables.order_by("fetched_at", ascending=False),
+        **active_generation_filter()
+    )
+    for row in latest:
+        return row["fetched_at"]
+    return None
+
+
 def parse_time_to_hour(time_str):
     """
     Parse a time string and return the hour (0-23).
@@ -245,105 +584,417 @@ def parse_time_to_hour(time_str):
         return None
 
 
-def find_closest_hourly_forecast(event_time, hourly_data_list):
+def format_hour(hour):
     """
-    Find the hourly forecast closest to the event time.
+    Format an hour of day for display (e.g., 19 -> "07:00 PM").
     
     Args:
-        event_time: Time string (e.g., "7:30 PM")
-        hourly_data_list: List of hourly forecast dictionaries
+        hour: Hour in 24-hour format (0-23)
         
     Returns:
-        dict: Closest hourly forecast, or None if not found
+        str: Display time, or "" if hour is None
+    """
+    if hour is None:
+        return ""
+    return f"{hour % 12 or 12:02d}:00 {'PM' if hour >= 12 else 'AM'}"
+
+
+def with_display_times(hourly_data):
     """
-    event_hour = parse_time_to_hour(event_time)
+    Add a "time" display string to each hourly forecast entry (for rendering).
+    
+    Args:
+        hourly_data: List of hourly forecast dictionaries
+        
+    Returns:
+        list: Copies of the entries with "time" set
+    """
+    return [dict(hour_data, time=format_hour(hour_data["hour"]))
+            for hour_data in hourly_data or []]
+
+
+FORECAST_COLUMNS = (
+    "forecast_date", "day_name", "temp_high", "temp_low", "conditions",
+    "precipitation_chance", "wind_speed", "hourly_packed", "fetched_at", "grid_cell"
+)
+
+
+class WeatherIndex:
+    """
+    Request-scoped, in-memory view of the stored forecast.
+    
+    Loads weather_forecast once (only the needed columns) into a dict keyed
+    by date, so matching or serializing any number of events costs one
+    query instead of lookups per event. Build one per request or task with
+    load_weather_index() and pass it to the weather lookups.
+    
+    Each date also gets a 24-slot array where slot h holds the forecast
+    for hour h, or the nearest available hour (see build_hour_slots), so
+    an event-time lookup is one index operation with no string parsing.
+    Range tables over those slots (see build_window_tables) give the worst
+    conditions over any [start, end) hour window in one lookup.
+    
+    The index itself holds the city-wide forecast; forecasts of venue grid
+    cells are indexed in self.cells, and for_location() picks the one for
+    an event's venue.
+    """
+    
+    def __init__(self, forecast_rows, location_cells=None, grid_cell=None):
+        """
+        Args:
+            forecast_rows: Iterable of weather_forecast rows (or dicts)
+            location_cells: Optional {location_key: grid cell key} of geocoded venues
+            grid_cell: Cell whose rows this index holds (None = city-wide)
+        """
+        self.grid_cell = grid_cell
+        self.location_cells = location_cells or {}
+        self.forecasts = {}
+        cell_rows = {}
+        for row in forecast_rows:
+            if row["grid_cell"] == grid_cell:
+                self.forecasts[row["forecast_date"]] = {col: row[col] for col in FORECAST_COLUMNS}
+            elif grid_cell is None:
+                cell_rows.setdefault(row["grid_cell"], []).append(row)
+        
+        # One index per venue grid cell (only on the city-wide index)
+        self.cells = {cell: WeatherIndex(rows, grid_cell=cell) for cell, rows in cell_rows.items()}
+        
+        # Nearest-hour slots per date, read straight from the packed arrays
+        self.hour_slots = {}
+        self.window_tables = {}
+        for forecast_date, forecast in self.forecasts.items():
+            self.hour_slots[forecast_date] = build_hour_slots(forecast["hourly_packed"])
+            self.window_tables[forecast_date] = build_window_tables(self.hour_slots[forecast_date])
+        
+        self._event_hours = {}
+        self._end_hours = {}
+        self._location_indexes = {}
     
-    if event_hour is None or not hourly_data_list:
-        return None
     
-    closest_forecast = None
-    min_diff = float('inf')
+    def for_cell(self, grid_cell):
+        """
+        Get the index for a grid cell's forecast.
+        
+        Args:
+            grid_cell: Cell key, or None for the city-wide forecast
+            
+        Returns:
+            WeatherIndex: The cell's index, or this (city-wide) index if the
+                          cell has no forecast of its own
+        """
+        return self.cells.get(grid_cell, self)
+    
     
-    for hour_data in hourly_data_list:
-        forecast_hour = parse_time_to_hour(hour_data.get("time", ""))
+    def for_location(self, location):
+        """
+        Get the index to look up weather for a venue, memoized per location.
         
-        if forecast_hour is not None:
-            # Calculate hour difference (accounting for day wrap)
-            diff = abs(forecast_hour - event_hour)
+        Args:
+            location: Event location string (or None)
             
-            if diff < min_diff:
-                min_diff = diff
-                closest_forecast = hour_data
+        Returns:
+            WeatherIndex: Index of the venue's grid cell (city-wide if not placed)
+        """
+        if location not in self._location_indexes:
+            grid_cell = self.location_cells.get(geocoding.normalize_location(location))
+            self._location_indexes[location] = self.for_cell(grid_cell)
+        return self._location_indexes[location]
     
-    return closest_forecast
+    
+    def event_hour(self, event_time):
+        """
+        Parse an event time to its hour, memoized per distinct time string.
+        
+        Args:
+            event_time: Time string (e.g., "7:30 PM")
+            
+        Returns:
+            int: Hour (0-23) or None
+        """
+        if event_time not in self._event_hours:
+            self._event_hours[event_time] = parse_time_to_hour(event_time)
+        return self._event_hours[event_time]
+    
+    
+    def event_end_hour(self, start_hour, end_time, categories):
+        """
+        Get an event's exclusive end hour, memoized (see get_event_end_hour).
+        
+        Args:
+            start_hour: Start hour (0-23) or None
+            end_time: End time string or None
+            categories: List of category names (or None)
+            
+        Returns:
+            int: End hour (start_hour + 1 to 24), or None without a start hour
+        """
+        key = (start_hour, end_time, tuple(categories or ()))
+        if key not in self._end_hours:
+            self._end_hours[key] = get_event_end_hour(start_hour, end_time, categories)
+        return self._end_hours[key]
+    
+    
+    def get_event_weather(self, event):
+        """
+        Get the weather to score an event with: the worst conditions over
+        the hours it runs (see get_weather_for_window), from the forecast of
+        the event's venue grid cell.
+        
+        Args:
+            event: Event row or dict with date, start_time, end_time, categories, location
+            
+        Returns:
+            dict: Weather data, or None if the date has no forecast
+        """
+        start_time = event["start_time"]
+        start_hour = None
+        if start_time and start_time != "TBD":
+            start_hour = self.event_hour(start_time)
+        end_hour = self.event_end_hour(start_hour, event["end_time"], event["categories"])
+        return self.for_location(event["location"]).get_weather_for_window(event["date"], start_hour, end_hour)
+    
+    
+    def get_weather_for_window(self, event_date, start_hour, end_hour=None):
+        """
+        Get weather for the hours [start_hour, end_hour) of a date.
+        
+        The "hourly" values are those of the start hour, except that
+        precipitation and wind are the window's maximum and feels-like is
+        whichever of the window's minimum or maximum is further out of the
+        comfortable range, so scoring sees the worst hour of the event.
+        
+        Args:
+            event_date: datetime.date object
+            start_hour: Start hour (0-23), or None for the daily forecast only
+            end_hour: Exclusive end hour (defaults to start_hour + 1)
+            
+        Returns:
+            dict: Weather data (with "window" when more than one hour is covered), or None
+        """
+        weather_info = self.get_weather_for_hour(event_date, start_hour)
+        
+        if not weather_info or "hourly" not in weather_info:
+            return weather_info
+        if end_hour is None or end_hour <= start_hour + 1:
+            return weather_info
+        
+        tables = self.window_tables[event_date]
+        feels_min = tables["feels_like_min"][start_hour][end_hour]
+        feels_max = tables["feels_like_max"][start_hour][end_hour]
+        
+        hourly = weather_info["hourly"]
+        hourly["precipitation_chance"] = tables["precipitation_max"][start_hour][end_hour]
+        hourly["wind_speed"] = tables["wind_max"][start_hour][end_hour]
+        hourly["feels_like"] = feels_min if temperature_penalty(feels_min) >= temperature_penalty(feels_max) else feels_max
+        weather_info["window"] = [start_hour, end_hour]
+        
+        return weather_info
+    
+    
+    def get_weather_for_datetime(self, event_date, event_time=None):
+        """
+        Get weather forecast for a specific date and time (no database access).
+        See weather_service.get_weather_for_datetime.
+        
+        Args:
+            event_date: datetime.date object
+            event_time: Optional time string (e.g., "3:00 PM", "7:30 PM")
+            
+        Returns:
+            dict: Weather data for that date/time, or None if not found
+        """
+        # If specific time is provided, use the forecast for (or nearest to) that hour
+        event_hour = None
+        if event_time and event_time != "TBD":
+            event_hour = self.event_hour(event_time)
+        
+        weather_info = self.get_weather_for_hour(event_date, event_hour)
+        
+        if weather_info and "hourly" in weather_info and weather_info["hourly"]["hour"] != event_hour:
+            # Event time doesn't match exactly - using nearest hour
+            print(f"  Using {format_hour(weather_info['hourly']['hour'])} forecast for {event_time} event")
+        
+        return weather_info
+    
+    
+    def get_weather_for_hour(self, event_date, event_hour=None):
+        """
+        Get weather forecast for a date and hour of day.
+        
+        Args:
+            event_date: datetime.date object
+            event_hour: Hour (0-23), or None for the daily forecast only
+            
+        Returns:
+            dict: Weather data (with "hourly" when an hourly forecast exists), or None
+        """
+        forecast = self.forecasts.get(event_date)
+        
+        if not forecast:
+            return None
+        
+        weather_info = {
+            "day_name": forecast["day_name"],
+            "temp_high": forecast["temp_high"],
+            "temp_low": forecast["temp_low"],
+            "conditions": forecast["conditions"],
+            "precipitation_chance": forecast["precipitation_chance"],
+            "wind_speed": forecast["wind_speed"]
+        }
+        
+        slots = self.hour_slots.get(event_date)
+        slot = slots[event_hour] if slots and event_hour is not None else None
+        
+        if slot:
+            forecast_hour, hourly = slot
+            weather_info["hourly"] = dict(hourly, hour=forecast_hour)
+        
+        return weather_info
 
 
-def get_weather_for_datetime(event_date, event_time=None):
+def build_hour_slots(packed):
     """
-    Get weather forecast for a specific date and time.
-    Uses hourly_weather table for precise forecasts when available.
-    Finds the NEAREST hour if exact match not found.
+    Build a 24-slot nearest-hour table from a packed day of hourly forecasts.
+    Slot h holds (forecast_hour, forecast) for the forecast closest to hour h;
+    ties go to the earlier entry.
+    Only the hours that end up in a slot are expanded into dictionaries.
     
     Args:
-        event_date: datetime.date object
-        event_time: Optional time string (e.g., "3:00 PM", "7:30 PM")
+        packed: Packed day from pack_hourly(), or None
         
     Returns:
-        dict: Weather data for that date/time, or None if not found
+        list: 24 entries of (forecast_hour, forecast); all None if the day has no hours
+    """
+    hours = packed["hour"] if packed else []
+    
+    if not hours:
+        return [None] * 24
+    
+    entries = {}
+    slots = []
+    for hour in range(24):
+        best = min(range(len(hours)), key=lambda i: (abs(hours[i] - hour), i))
+        if best not in entries:
+            entries[best] = get_packed_hour(packed, best)
+        slots.append((hours[best], entries[best]))
+    return slots
+
+
+def build_window_tables(slots):
     """
-    # Query weather forecast table for the date
-    forecast = app_tables.weather_forecast.get(forecast_date=event_date)
+    Precompute window extremes over a day's 24 hour slots.
+    tables[name][start][end] is the extreme over hours [start, end), so any
+    event window is answered in O(1).
     
-    if not forecast:
+    Args:
+        slots: 24-slot list from build_hour_slots()
+        
+    Returns:
+        dict: precipitation_max, feels_like_min, feels_like_max, wind_max tables,
+              or None if the day has no hourly forecasts
+    """
+    if slots[0] is None:
         return None
     
-    weather_info = {
-        "day_name": forecast["day_name"],
-        "temp_high": forecast["temp_high"],
-        "temp_low": forecast["temp_low"],
-        "conditions": forecast["conditions"],
-        "precipitation_chance": forecast["precipitation_chance"],
-        "wind_speed": forecast["wind_speed"]
-    }
+    precip = [forecast.get("precipitation_chance", 0) for _, forecast in slots]
+    feels_like = [forecast.get("feels_like", forecast.get("temp", 70)) for _, forecast in slots]
+    wind = [forecast.get("wind_speed", 0) for _, forecast in slots]
     
-    # If specific time is provided, try to get precise hourly data
-    if event_time and event_time != "TBD":
-        # First try exact match in hourly_weather table
-        try:
-            hourly_row = app_tables.hourly_weather.get(
-                date=event_date,
-                hour_time=event_time
-            )
-            if hourly_row:
-                weather_info["hourly"] = {
-                    "time": hourly_row["hour_time"],
-                    "temp": hourly_row["temp"],
-                    "feels_like": hourly_row["feels_like"],
-                    "conditions": hourly_row["conditions"],
-                    "precipitation_chance": hourly_row["precipitation_chance"],
-                    "wind_speed": hourly_row["wind_speed"],
-                    "humidity": hourly_row["humidity"],
-                    "uvi": hourly_row["uvi"]
-                }
-                return weather_info
-        except (AttributeError, KeyError):
-            # hourly_weather table doesn't exist or no exact match found
-            pass
-        
-        # Fallback: Find CLOSEST hourly forecast from hourly_data
-        if forecast["hourly_data"]:
-            closest_hour = find_closest_hourly_forecast(event_time, forecast["hourly_data"])
-            
-            if closest_hour:
-                weather_info["hourly"] = closest_hour
-                # Log the match for debugging
-                event_hour = parse_time_to_hour(event_time)
-                forecast_hour = parse_time_to_hour(closest_hour.get("time", ""))
-                if event_hour != forecast_hour:
-                    # Event time doesn't match exactly - using nearest hour
-                    print(f"  Using {closest_hour.get('time')} forecast for {event_time} event")
+    tables = {"precipitation_max": [], "feels_like_min": [], "feels_like_max": [], "wind_max": []}
+    for start in range(24):
+        rows = {name: [None] * 25 for name in tables}
+        for end in range(start + 1, 25):
+            hour = end - 1
+            if end == start + 1:
+                rows["precipitation_max"][end] = precip[hour]
+                rows["feels_like_min"][end] = feels_like[hour]
+                rows["feels_like_max"][end] = feels_like[hour]
+                rows["wind_max"][end] = wind[hour]
+            else:
+                rows["precipitation_max"][end] = max(rows["precipitation_max"][end - 1], precip[hour])
+                rows["feels_like_min"][end] = min(rows["feels_like_min"][end - 1], feels_like[hour])
+                rows["feels_like_max"][end] = max(rows["feels_like_max"][end - 1], feels_like[hour])
+                rows["wind_max"][end] = max(rows["wind_max"][end - 1], wind[hour])
+        for name in tables:
+            tables[name].append(rows[name])
+    return tables
+
+
+def get_event_end_hour(start_hour, end_time, categories=None):
+    """
+    Work out the exclusive end hour of an event's weather window.
+    
+    Uses end_time when it can be parsed (rounding a partial hour up and
+    running to midnight for events that end after it); otherwise the
+    longest default duration of the event's categories.
+    
+    Args:
+        start_hour: Start hour (0-23) or None
+        end_time: End time string (e.g., "10:30 PM") or None
+        categories: List of category names (or None)
+        
+    Returns:
+        int: End hour (start_hour + 1 to 24), or None without a start hour
+    """
+    if start_hour is None:
+        return None
+    
+    end_hour = parse_time_to_hour(end_time) if end_time and end_time != "TBD" else None
+    
+    if end_hour is not None:
+        minutes = end_time.split(":")[1][:2] if ":" in end_time else "00"
+        if minutes.isdigit() and int(minutes) > 0:
+            end_hour += 1
+        if end_hour < start_hour:
+            end_hour = 24  # Ends after midnight
+    else:
+        durations = [config.EVENT_DURATION_HOURS.get(category, config.DEFAULT_EVENT_DURATION_HOURS)
+                     for category in categories or []]
+        end_hour = start_hour + max(durations or [config.DEFAULT_EVENT_DURATION_HOURS])
+    
+    return min(max(end_hour, start_hour + 1), 24)
+
+
+def load_weather_index():
+    """
+    Load the active forecast generation into a WeatherIndex.
+    
+    One query for the forecasts, plus one for the venue geocodes when the
+    generation has venue grid cell forecasts.
+    
+    Returns:
+        WeatherIndex: In-memory forecast index
+    """
+    forecast_rows = list(app_tables.weather_forecast.search(
+        q.fetch_only(*FORECAST_COLUMNS), **active_generation_filter()
+    ))
+    
+    location_cells = None
+    if any(row["grid_cell"] for row in forecast_rows):
+        location_cells = geocoding.load_location_cells()
+    
+    return WeatherIndex(forecast_rows, location_cells)
+
+
+def get_weather_for_datetime(event_date, event_time=None, weather_index=None):
+    """
+    Get weather forecast for a specific date and time.
+    Uses the stored hourly forecasts for precise forecasts when available.
+    Finds the NEAREST hour if exact match not found.
+    
+    For more than one lookup, load a WeatherIndex once and pass it in;
+    without one, the forecast is loaded for this call.
     
-    return weather_info
+    Args:
+        event_date: datetime.date object
+        event_time: Optional time string (e.g., "3:00 PM", "7:30 PM")
+        weather_index: Optional WeatherIndex from load_weather_index()
+        
+    Returns:
+        dict: Weather data for that date/time, or None if not found
+    """
+    weather_index = weather_index or load_weather_index()
+    return weather_index.get_weather_for_datetime(event_date, event_time)
 
 
 def get_best_weather_values(weather_data):
@@ -390,14 +1041,19 @@ def get_best_weather_values(weather_data):
         }
 
 
-def calculate_weather_score(event_data, weather_data):
+def calculate_weather_score(event_data, weather_data, band_table=None):
     """
     Calculate weather suitability score for an event (0-100).
     Uses event-specific hourly forecast when available for maximum accuracy.
     
+    The score only depends on which threshold band each value falls in, so
+    it is read from the precomputed WeatherBandTable (three band lookups and
+    one table read).
+    
     Args:
         event_data: Event dictionary with is_outdoor, date, time info
         weather_data: Weather forecast dictionary (may include hourly data)
+        band_table: Optional WeatherBandTable (fetched once by batch callers)
         
     Returns:
         int: Weather score (0-100)
@@ -409,42 +1065,265 @@ def calculate_weather_score(event_data, weather_data):
     if not event_data.get("is_outdoor", False):
         return 90  # Indoor events mostly unaffected by weather
     
-    # For outdoor events, calculate based on conditions
-    score = 100
-    
-    # Get best available weather values (hourly if available, daily otherwise)
+    # For outdoor events, look up the score for the conditions' bands
+    # (hourly values if available, daily otherwise)
+    band_table = band_table or get_band_table()
     weather_values = get_best_weather_values(weather_data)
-    
-    precip_chance = weather_values["precipitation_chance"]
-    effective_temp = weather_values["feels_like"]  # Use feels_like for comfort
-    wind_speed = weather_values["wind_speed"]
-    
-    # Check precipitation
+    return band_table.score(band_table.bands(weather_values))
+
+
+def precipitation_penalty(precip_chance):
+    """Score penalty for a precipitation chance (reference branches for the band table)."""
     if precip_chance > config.PRECIP_THRESHOLDS["high"]:
-        score -= 40  # Major penalty for high rain chance
+        return config.PRECIP_PENALTIES["high"]  # Major penalty for high rain chance
     elif precip_chance > config.PRECIP_THRESHOLDS["medium"]:
-        score -= 20  # Moderate penalty
+        return config.PRECIP_PENALTIES["medium"]  # Moderate penalty
     elif precip_chance > config.PRECIP_THRESHOLDS["low"]:
-        score -= 10  # Small penalty
-    
-    # Check temperature (using feels-like)
+        return config.PRECIP_PENALTIES["low"]  # Small penalty
+    return 0
+
+
+def temperature_penalty(effective_temp):
+    """Score penalty for a feels-like temperature (reference branches for the band table)."""
     if effective_temp < config.TEMP_THRESHOLDS["too_cold"]:
-        score -= 30  # Too cold
+        return config.TEMP_PENALTIES["too_cold"]
     elif effective_temp < config.TEMP_THRESHOLDS["cold"]:
-        score -= 15  # Cold
+        return config.TEMP_PENALTIES["cold"]
     elif effective_temp > config.TEMP_THRESHOLDS["too_hot"]:
-        score -= 30  # Too hot
+        return config.TEMP_PENALTIES["too_hot"]
     elif effective_temp > config.TEMP_THRESHOLDS["hot"]:
-        score -= 15  # Hot
-    
-    # Check wind
+        return config.TEMP_PENALTIES["hot"]
+    return 0
+
+
+def wind_penalty(wind_speed):
+    """Score penalty for a wind speed (reference branches for the band table)."""
     if wind_speed > config.WIND_THRESHOLDS["windy"]:
-        score -= 15  # Windy conditions
+        return config.WIND_PENALTIES["windy"]
     elif wind_speed > config.WIND_THRESHOLDS["breezy"]:
-        score -= 5   # Breezy
+        return config.WIND_PENALTIES["breezy"]
+    return 0
+
+
+def precipitation_warning(precip_chance):
+    """Warning level for a precipitation chance: "high", "possible" or None."""
+    if precip_chance > config.WARNING_THRESHOLDS["rain_high"]:
+        return "high"
+    elif precip_chance > config.WARNING_THRESHOLDS["rain_possible"]:
+        return "possible"
+    return None
+
+
+def temperature_warning(feels_like):
+    """Warning level for a feels-like temperature: "cold", "hot" or None."""
+    if feels_like < config.WARNING_THRESHOLDS["very_cold"]:
+        return "cold"
+    elif feels_like > config.WARNING_THRESHOLDS["very_hot"]:
+        return "hot"
+    return None
+
+
+def wind_warning(wind_speed):
+    """Whether a wind speed warrants a warning."""
+    return wind_speed > config.WARNING_THRESHOLDS["windy"]
+
+
+class WeatherBandTable:
+    """
+    Precomputed weather score and warning lookups for one set of thresholds.
+    
+    Each metric's value range is cut at every scoring and warning threshold
+    into bands (between two thresholds, or exactly on one). Within a band
+    every threshold comparison has the same outcome, so penalties and
+    warning levels are computed once per band from the reference functions
+    above, and the score for every (precipitation, temperature, wind) band
+    combination is stored in one table.
+    """
+    
+    def __init__(self):
+        warnings = config.WARNING_THRESHOLDS
+        self.precip_cuts = sorted(set(config.PRECIP_THRESHOLDS.values()) |
+                                  {warnings["rain_high"], warnings["rain_possible"]})
+        self.temp_cuts = sorted(set(config.TEMP_THRESHOLDS.values()) |
+                                {warnings["very_cold"], warnings["very_hot"]})
+        self.wind_cuts = sorted(set(config.WIND_THRESHOLDS.values()) | {warnings["windy"]})
+        
+        precip_values = band_representatives(self.precip_cuts)
+        temp_values = band_representatives(self.temp_cuts)
+        wind_values = band_representatives(self.wind_cuts)
+        
+        self.precip_penalties = [precipitation_penalty(v) for v in precip_values]
+        self.temp_penalties = [temperature_penalty(v) for v in temp_values]
+        self.wind_penalties = [wind_penalty(v) for v in wind_values]
+        
+        self.precip_warnings = [precipitation_warning(v) for v in precip_values]
+        self.temp_warnings = [temperature_warning(v) for v in temp_values]
+        self.wind_warnings = [wind_warning(v) for v in wind_values]
+        
+        self.scores = [
+            [
+                [max(0, min(100, 100 - precip - temp - wind)) for wind in self.wind_penalties]
+                for temp in self.temp_penalties
+            ]
+            for precip in self.precip_penalties
+        ]
+    
+    
+    def bands(self, weather_values):
+        """
+        Find the band of each scoring value.
+        
+        Args:
+            weather_values: Values from get_best_weather_values()
+            
+        Returns:
+            tuple: (precipitation band, temperature band, wind band) indexes
+        """
+        return (
+            band_index(self.precip_cuts, weather_values["precipitation_chance"]),
+            band_index(self.temp_cuts, weather_values["feels_like"]),
+            band_index(self.wind_cuts, weather_values["wind_speed"])
+        )
+    
+    
+    def score(self, bands):
+        """
+        Get the outdoor weather score for a band combination.
+        
+        Args:
+            bands: Tuple from bands()
+            
+        Returns:
+            int: Weather score (0-100)
+        """
+        precip_band, temp_band, wind_band = bands
+        return self.scores[precip_band][temp_band][wind_band]
+
+
+def band_index(cuts, value):
+    """
+    Find a value's band among sorted cut points.
+    Band 2i lies strictly below cuts[i] (and above cuts[i-1]); band 2i+1 is exactly cuts[i].
+    
+    Args:
+        cuts: Sorted threshold values
+        value: Value to classify
+        
+    Returns:
+        int: Band index (0 to 2 * len(cuts))
+    """
+    i = bisect_left(cuts, value)
+    if i < len(cuts) and cuts[i] == value:
+        return 2 * i + 1
+    return 2 * i
+
+
+def band_representatives(cuts):
+    """
+    Pick one value inside each band (see band_index).
+    
+    Args:
+        cuts: Sorted threshold values
+        
+    Returns:
+        list: Representative value per band
+    """
+    if not cuts:
+        return [0]
+    
+    values = [cuts[0] - 1]
+    for i, cut in enumerate(cuts):
+        values.append(cut)
+        values.append((cut + cuts[i + 1]) / 2 if i + 1 < len(cuts) else cut + 1)
+    return values
+
+
+_band_table = None
+_band_table_thresholds = None
+
+
+def get_band_table():
+    """
+    Get the band table for the current config thresholds and penalties.
+    Built on first use and rebuilt whenever a threshold or penalty value
+    changes (the values it was built from are kept as copies and compared).
+    
+    Returns:
+        WeatherBandTable
+    """
+    global _band_table, _band_table_thresholds
+    
+    thresholds = (config.PRECIP_THRESHOLDS, config.TEMP_THRESHOLDS,
+                  config.WIND_THRESHOLDS, config.WARNING_THRESHOLDS,
+                  config.PRECIP_PENALTIES, config.TEMP_PENALTIES, config.WIND_PENALTIES)
+    if _band_table is None or thresholds != _band_table_thresholds:
+        _band_table = WeatherBandTable()
+        _band_table_thresholds = tuple(dict(t) for t in thresholds)
+    return _band_table
+
+
+def get_weather_bands(weather_values, band_table=None):
+    """
+    Get the score-relevant weather bands of a set of values.
+    Two forecasts with the same bands give an outdoor event the same score.
+    
+    Args:
+        weather_values: Values from get_best_weather_values()
+        band_table: Optional WeatherBandTable
+        
+    Returns:
+        tuple: (precipitation, temperature, wind penalties, is_hourly)
+    """
+    band_table = band_table or get_band_table()
+    precip_band, temp_band, wind_band = band_table.bands(weather_values)
+    return (
+        band_table.precip_penalties[precip_band],
+        band_table.temp_penalties[temp_band],
+        band_table.wind_penalties[wind_band],
+        weather_values["is_hourly"]
+    )
+
+
+def find_changed_weather_slots(old_index, new_index):
+    """
+    Diff two forecasts and find the (date, hour) slots whose scoring bands changed.
+    
+    A slot changes when its precipitation, feels-like or wind value crossed
+    a threshold in config, or when it gained or lost a forecast. Hour None
+    stands for the daily forecast (used by events without a start time).
+    Venue grid cells are diffed too (a cell missing on one side is compared
+    with that side's city-wide forecast); a slot changed in any cell is
+    reported, so events may be rescored without need but are never missed.
+    
+    Args:
+        old_index: WeatherIndex of the previous forecast
+        new_index: WeatherIndex of the new forecast
+        
+    Returns:
+        set: (date, hour) tuples whose weather score may have changed
+    """
+    changed = set()
+    band_table = get_band_table()
     
-    # Ensure score stays in valid range
-    return max(0, min(100, score))
+    for grid_cell in {None} | set(old_index.cells) | set(new_index.cells):
+        old_cell = old_index.for_cell(grid_cell)
+        new_cell = new_index.for_cell(grid_cell)
+        
+        for forecast_date in set(old_cell.forecasts) | set(new_cell.forecasts):
+            for hour in [None] + list(range(24)):
+                if (forecast_date, hour) in changed:
+                    continue
+                
+                old_weather = old_cell.get_weather_for_hour(forecast_date, hour)
+                new_weather = new_cell.get_weather_for_hour(forecast_date, hour)
+                
+                old_bands = get_weather_bands(get_best_weather_values(old_weather), band_table) if old_weather else None
+                new_bands = get_weather_bands(get_best_weather_values(new_weather), band_table) if new_weather else None
+                
+                if old_bands != new_bands:
+                    changed.add((forecast_date, hour))
+    
+    return changed
 
 
 def get_time_period_forecast(hourly_data, start_hour, end_hour):
@@ -465,8 +1344,7 @@ def get_time_period_forecast(hourly_data, start_hour, end_hour):
     # Filter hourly data for the time period
     period_forecasts = []
     for hour in hourly_data:
-        hour_num = parse_time_to_hour(hour.get("time", ""))
-        if hour_num is not None and start_hour <= hour_num < end_hour:
+        if start_hour <= hour["hour"] < end_hour:
             period_forecasts.append(hour)
     
     if not period_forecasts:
@@ -479,7 +1357,7 @@ def get_time_period_forecast(hourly_data, start_hour, end_hour):
     
     # Get most common conditions
     conditions_list = [h.get("conditions", "") for h in period_forecasts]
-    most_common_conditions = max(set(conditions_list), key=conditions_list.count) if conditions_list else "unknown"
+    most_common_conditions = most_common(conditions_list, "unknown")
     
     return {
         "temp_avg": round(sum(temps) / len(temps)) if temps else 0,
@@ -492,15 +1370,56 @@ def get_time_period_forecast(hourly_data, start_hour, end_hour):
     }
 
 
+def compute_period_forecasts(hourly_data):
+    """
+    Aggregate a day's hourly forecasts into the TIME_PERIODS (done once at save).
+    
+    Args:
+        hourly_data: List of hourly forecast dictionaries for one day
+        
+    Returns:
+        dict: Period name to aggregate from get_time_period_forecast (or None)
+    """
+    return {
+        name: get_time_period_forecast(hourly_data, start_hour, end_hour)
+        for name, start_hour, end_hour in TIME_PERIODS
+    }
+
+
+def most_common(values, default=None):
+    """
+    Get the most frequent value in linear time (ties go to the first seen).
+    
+    Args:
+        values: List of hashable values
+        default: Returned when values is empty
+        
+    Returns:
+        Most common value, or default
+    """
+    if not values:
+        return default
+    return Counter(values).most_common(1)[0][0]
+
+
 @anvil.server.callable
-def get_weather_data():
+def get_weather_data(known_version=None):
     """
     Get all weather forecasts from the database.
     Only returns FUTURE time periods - filters out past periods.
     Callable from client-side code.
     
+    Clients pass the version token of the copy they hold ("" for none).
+    The token covers the data version and the date and time period the
+    past periods were cut at, so a current copy costs no forecast query.
+    
+    Args:
+        known_version: Optional version token from an earlier response
+    
     Returns:
-        list: List of weather forecast dictionaries with future-only data
+        list: List of weather forecast dictionaries with future-only data, or
+              with known_version a state_store.versioned_response() with the
+              list under "forecasts"
     """
     import pytz
     
@@ -512,14 +1431,22 @@ def get_weather_data():
     current_hour = now_central.hour
     today = now_central.date()
     
-    for row in app_tables.weather_forecast.search():
-        hourly_data = row["hourly_data"]
+    if known_version is not None:
+        period = 2 if current_hour >= 18 else 1 if current_hour >= 12 else 0
+        version = f"{state_store.get_data_version()}:{today.isoformat()}:{period}"
+        if version == known_version:
+            return state_store.versioned_response(version, known_version)
+    
+    # City-wide forecast only (venue grid cells are used for event scoring)
+    for row in app_tables.weather_forecast.search(grid_cell=None, **active_generation_filter()):
+        hourly_data = unpack_hourly(row["hourly_packed"])
         forecast_date = row["forecast_date"]
         
-        # Extract time period forecasts from hourly data
-        morning = get_time_period_forecast(hourly_data, 6, 12)    # 6 AM - 12 PM
-        afternoon = get_time_period_forecast(hourly_data, 12, 18)  # 12 PM - 6 PM
-        evening = get_time_period_forecast(hourly_data, 18, 24)    # 6 PM - 12 AM
+        # Time period forecasts were aggregated at save time
+        periods = row["periods"]
+        morning = periods.get("morning")
+        afternoon = periods.get("afternoon")
+        evening = periods.get("evening")
         
         # Determine which periods are in the future
         is_today = (forecast_date == today)
@@ -554,7 +1481,7 @@ def get_weather_data():
             
             # Get most common future conditions
             future_conditions = [p.get("conditions", "") for p in future_periods]
-            most_common_condition = max(set(future_conditions), key=future_conditions.count) if future_conditions else row["conditions"]
+            most_common_condition = most_common(future_conditions, row["conditions"])
         else:
             # No future periods (day has passed)
             actual_precip_chance = 0
@@ -568,7 +1495,7 @@ def get_weather_data():
             "conditions": most_common_condition,  # Future conditions
             "precipitation_chance": actual_precip_chance,  # Future precipitation only!
             "wind_speed": row["wind_speed"],
-            "hourly_data": hourly_data,
+            "hourly_data": with_display_times(hourly_data),
             "fetched_at": row["fetched_at"],
             # Time period breakdowns (filtered to future only)
             "morning": morning,
@@ -579,5 +1506,7 @@ def get_weather_data():
             "has_future_periods": len(future_periods) > 0
         })
     
-    return forecasts
+    if known_version is None:
+        return forecasts
+    return state_store.versioned_response(version, known_version, forecasts=forecasts)
 
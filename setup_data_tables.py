@@ -63,7 +63,7 @@ def setup_weather_forecast_table():
         'conditions': 'Text',
         'precipitation_chance': 'Number',
         'wind_speed': 'Number',
-        'hourly_data': 'SimpleObject',
+        'hourly_packed': 'SimpleObject',
         'fetched_at': 'DateTime'
     }
     